@@ -0,0 +1,28 @@
+"""evaluation_input_hash
+
+Revision ID: 3f6c2a9d41b7
+Revises: 1515b123a43a
+Create Date: 2026-10-17 09:12:31.482190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c2a9d41b7'
+down_revision: Union[str, None] = '1515b123a43a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('evaluations', sa.Column('input_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_evaluations_profile_input_hash', 'evaluations', ['tax_profile_id', 'input_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_evaluations_profile_input_hash', table_name='evaluations')
+    op.drop_column('evaluations', 'input_hash')
@@ -0,0 +1,159 @@
+"""partition_evaluations_by_fiscal_year
+
+Revision ID: 5d93b0e7a1c8
+Revises: e2a8f3c61d04
+Create Date: 2026-10-17 16:02:44.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d93b0e7a1c8'
+down_revision: Union[str, None] = 'e2a8f3c61d04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EVALUATION_COLUMNS = [
+    'id', 'user_id', 'tenant_id', 'tax_profile_id', 'rule_set_id', 'fiscal_year_id', 'status',
+    'evaluated_at', 'profile_snapshot', 'input_hash', 'total_obligations_evaluated',
+    'applies_count', 'does_not_apply_count', 'conditional_count', 'needs_more_info_count',
+    'created_at',
+]
+RESULT_COLUMNS = [
+    'id', 'evaluation_id', 'obligation_type_id', 'result', 'triggered_rule_id',
+    'conditions_evaluated', 'condition_trace', 'explanation_es', 'explanation_en',
+    'legal_references', 'periodicity', 'responsible_entity',
+]
+
+
+def _evaluation_columns() -> list:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('tax_profile_id', sa.UUID(), nullable=False),
+        sa.Column('rule_set_id', sa.UUID(), nullable=False),
+        sa.Column('fiscal_year_id', sa.UUID(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('evaluated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('profile_snapshot', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('input_hash', sa.String(length=64), nullable=True),
+        sa.Column('total_obligations_evaluated', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('applies_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('does_not_apply_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('conditional_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('needs_more_info_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['fiscal_year_id'], ['fiscal_years.id'], ),
+        sa.ForeignKeyConstraint(['rule_set_id'], ['rule_sets.id'], ),
+        sa.ForeignKeyConstraint(['tax_profile_id'], ['tax_profiles.id'], ),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    ]
+
+
+def _result_columns() -> list:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('evaluation_id', sa.UUID(), nullable=False),
+        sa.Column('obligation_type_id', sa.UUID(), nullable=False),
+        sa.Column('result', sa.String(length=30), nullable=False),
+        sa.Column('triggered_rule_id', sa.UUID(), nullable=True),
+        sa.Column('conditions_evaluated', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('condition_trace', sa.LargeBinary(), nullable=True),
+        sa.Column('explanation_es', sa.Text(), nullable=False),
+        sa.Column('explanation_en', sa.Text(), nullable=True),
+        sa.Column('legal_references', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('periodicity', sa.String(length=30), nullable=True),
+        sa.Column('responsible_entity', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['obligation_type_id'], ['obligation_types.id'], ),
+        sa.ForeignKeyConstraint(['triggered_rule_id'], ['rules.id'], ),
+    ]
+
+
+def _rename_aside() -> None:
+    """Move the current tables (and their index names) out of the way."""
+    for table in ('evaluations', 'evaluation_results'):
+        op.rename_table(table, f'{table}_old')
+        op.execute(f'ALTER INDEX {table}_pkey RENAME TO {table}_old_pkey')
+
+
+def upgrade() -> None:
+    op.drop_constraint('calendar_entries_evaluation_id_fkey', 'calendar_entries', type_='foreignkey')
+    op.drop_index('ix_evaluations_profile_input_hash', table_name='evaluations')
+    op.drop_index('ix_evaluations_user_history', table_name='evaluations')
+    op.drop_index('ix_evaluation_results_evaluation', table_name='evaluation_results')
+    _rename_aside()
+
+    op.create_table('evaluations',
+    *_evaluation_columns(),
+    sa.PrimaryKeyConstraint('id', 'fiscal_year_id'),
+    postgresql_partition_by='LIST (fiscal_year_id)'
+    )
+    op.create_table('evaluation_results',
+    *_result_columns(),
+    sa.Column('fiscal_year_id', sa.UUID(), nullable=False),
+    sa.ForeignKeyConstraint(['fiscal_year_id'], ['fiscal_years.id'], ),
+    sa.ForeignKeyConstraint(['evaluation_id', 'fiscal_year_id'], ['evaluations.id', 'evaluations.fiscal_year_id'], name='evaluation_results_evaluation_fkey'),
+    sa.PrimaryKeyConstraint('id', 'fiscal_year_id'),
+    postgresql_partition_by='LIST (fiscal_year_id)'
+    )
+    op.create_index('ix_evaluations_profile_input_hash', 'evaluations', ['tax_profile_id', 'input_hash'], unique=False)
+    op.create_index('ix_evaluations_tenant_user_created', 'evaluations', ['tenant_id', 'user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_evaluation_results_evaluation', 'evaluation_results', ['evaluation_id'], unique=False)
+
+    # One partition per existing fiscal year, plus a catch-all for new ones
+    # until `python -m app.infrastructure.database.partitions ensure` runs.
+    fiscal_years = op.get_bind().execute(sa.text('SELECT id, year FROM fiscal_years')).all()
+    for table in ('evaluations', 'evaluation_results'):
+        for fiscal_year_id, year in fiscal_years:
+            op.execute(f"CREATE TABLE {table}_fy{year} PARTITION OF {table} FOR VALUES IN ('{fiscal_year_id}')")
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    evaluation_columns = ', '.join(EVALUATION_COLUMNS)
+    op.execute(f'INSERT INTO evaluations ({evaluation_columns}) SELECT {evaluation_columns} FROM evaluations_old')
+    result_columns = ', '.join(RESULT_COLUMNS)
+    op.execute(f"""
+        INSERT INTO evaluation_results ({result_columns}, fiscal_year_id)
+        SELECT {', '.join(f'r.{c}' for c in RESULT_COLUMNS)}, e.fiscal_year_id
+        FROM evaluation_results_old AS r
+        JOIN evaluations_old AS e ON e.id = r.evaluation_id
+    """)
+    op.drop_table('evaluation_results_old')
+    op.drop_table('evaluations_old')
+
+
+def downgrade() -> None:
+    # Partitions detached by the maintenance command are left as they are and
+    # their rows are not copied back; reattach them first to keep them.
+    op.drop_index('ix_evaluation_results_evaluation', table_name='evaluation_results')
+    op.drop_index('ix_evaluations_tenant_user_created', table_name='evaluations')
+    op.drop_index('ix_evaluations_profile_input_hash', table_name='evaluations')
+    _rename_aside()
+
+    op.create_table('evaluations',
+    *_evaluation_columns(),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('evaluation_results',
+    *_result_columns(),
+    sa.ForeignKeyConstraint(['evaluation_id'], ['evaluations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    evaluation_columns = ', '.join(EVALUATION_COLUMNS)
+    op.execute(f'INSERT INTO evaluations ({evaluation_columns}) SELECT {evaluation_columns} FROM evaluations_old')
+    result_columns = ', '.join(RESULT_COLUMNS)
+    op.execute(f'INSERT INTO evaluation_results ({result_columns}) SELECT {result_columns} FROM evaluation_results_old')
+    op.drop_table('evaluation_results_old')
+    op.drop_table('evaluations_old')
+
+    op.create_index('ix_evaluations_profile_input_hash', 'evaluations', ['tax_profile_id', 'input_hash'], unique=False)
+    op.create_index('ix_evaluations_user_history', 'evaluations', ['user_id', 'tenant_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_evaluation_results_evaluation', 'evaluation_results', ['evaluation_id'], unique=False)
+    op.create_foreign_key('calendar_entries_evaluation_id_fkey', 'calendar_entries', 'evaluations', ['evaluation_id'], ['id'])
@@ -0,0 +1,35 @@
+"""calendar_entry_dedupe_index
+
+Revision ID: 71c3e5a9d2f4
+Revises: a6c1f48e9b37
+Create Date: 2026-10-17 18:04:12.337105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71c3e5a9d2f4'
+down_revision: Union[str, None] = 'a6c1f48e9b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep one entry per evaluation, obligation and due date
+    op.execute("""
+        DELETE FROM calendar_entries AS c
+        USING calendar_entries AS d
+        WHERE c.evaluation_id = d.evaluation_id
+          AND c.obligation_type_id = d.obligation_type_id
+          AND c.due_date = d.due_date
+          AND c.id > d.id
+    """)
+    op.create_index('uq_calendar_evaluation_obligation_due', 'calendar_entries', ['evaluation_id', 'obligation_type_id', 'due_date'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_calendar_evaluation_obligation_due', table_name='calendar_entries')
@@ -0,0 +1,27 @@
+"""evaluation_history_indexes
+
+Revision ID: 8b1e4d7c2a90
+Revises: 3f6c2a9d41b7
+Create Date: 2026-10-17 11:40:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4d7c2a90'
+down_revision: Union[str, None] = '3f6c2a9d41b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_evaluations_user_history', 'evaluations', ['user_id', 'tenant_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_evaluation_results_evaluation', 'evaluation_results', ['evaluation_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_evaluation_results_evaluation', table_name='evaluation_results')
+    op.drop_index('ix_evaluations_user_history', table_name='evaluations')
@@ -0,0 +1,26 @@
+"""calendar_pending_index
+
+Revision ID: b82f4d6e1a37
+Revises: 71c3e5a9d2f4
+Create Date: 2026-10-17 18:41:53.902614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b82f4d6e1a37'
+down_revision: Union[str, None] = '71c3e5a9d2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_calendar_user_pending_due', 'calendar_entries', ['user_id', 'due_date', 'id'], unique=False, postgresql_where=sa.text('NOT is_completed'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_calendar_user_pending_due', table_name='calendar_entries', postgresql_where=sa.text('NOT is_completed'))
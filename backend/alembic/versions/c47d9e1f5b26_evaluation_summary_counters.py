@@ -0,0 +1,57 @@
+"""evaluation_summary_counters
+
+Revision ID: c47d9e1f5b26
+Revises: 8b1e4d7c2a90
+Create Date: 2026-10-17 13:05:44.620917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d9e1f5b26'
+down_revision: Union[str, None] = '8b1e4d7c2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = [
+    'total_obligations_evaluated',
+    'applies_count',
+    'does_not_apply_count',
+    'conditional_count',
+    'needs_more_info_count',
+]
+
+
+def upgrade() -> None:
+    for column in COUNTERS:
+        op.add_column('evaluations', sa.Column(column, sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the stored results
+    op.execute("""
+        UPDATE evaluations AS e
+        SET total_obligations_evaluated = c.total,
+            applies_count = c.applies,
+            does_not_apply_count = c.does_not_apply,
+            conditional_count = c.conditional,
+            needs_more_info_count = c.needs_more_info
+        FROM (
+            SELECT evaluation_id,
+                   count(*) AS total,
+                   count(*) FILTER (WHERE result = 'applies') AS applies,
+                   count(*) FILTER (WHERE result = 'does_not_apply') AS does_not_apply,
+                   count(*) FILTER (WHERE result = 'conditional') AS conditional,
+                   count(*) FILTER (WHERE result = 'needs_more_info') AS needs_more_info
+            FROM evaluation_results
+            GROUP BY evaluation_id
+        ) AS c
+        WHERE c.evaluation_id = e.id
+    """)
+
+
+def downgrade() -> None:
+    for column in reversed(COUNTERS):
+        op.drop_column('evaluations', column)
@@ -0,0 +1,32 @@
+"""calendar_versions
+
+Revision ID: d5a7c3e91f20
+Revises: b82f4d6e1a37
+Create Date: 2026-10-17 19:20:37.165480
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a7c3e91f20'
+down_revision: Union[str, None] = 'b82f4d6e1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('calendar_versions',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('calendar_versions')
@@ -0,0 +1,30 @@
+"""packed_condition_trace
+
+Revision ID: e2a8f3c61d04
+Revises: c47d9e1f5b26
+Create Date: 2026-10-17 14:21:09.305871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a8f3c61d04'
+down_revision: Union[str, None] = 'c47d9e1f5b26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('evaluation_results', sa.Column('condition_trace', sa.LargeBinary(), nullable=True))
+    op.alter_column('evaluation_results', 'conditions_evaluated', nullable=True)
+
+
+def downgrade() -> None:
+    # Packed traces cannot be expanded in SQL; those results lose their trace.
+    op.execute("UPDATE evaluation_results SET conditions_evaluated = '[]'::jsonb WHERE conditions_evaluated IS NULL")
+    op.alter_column('evaluation_results', 'conditions_evaluated', nullable=False)
+    op.drop_column('evaluation_results', 'condition_trace')
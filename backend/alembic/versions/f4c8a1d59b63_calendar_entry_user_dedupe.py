@@ -0,0 +1,42 @@
+"""calendar_entry_user_dedupe
+
+Revision ID: f4c8a1d59b63
+Revises: d5a7c3e91f20
+Create Date: 2026-10-17 23:41:09.518226
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8a1d59b63'
+down_revision: Union[str, None] = 'd5a7c3e91f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep one entry per user, obligation and due date; completed entries win
+    op.execute("""
+        DELETE FROM calendar_entries
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY user_id, obligation_type_id, due_date
+                    ORDER BY is_completed IS TRUE DESC, completed_at, id
+                ) AS position
+                FROM calendar_entries
+            ) AS ranked
+            WHERE position > 1
+        )
+    """)
+    op.drop_index('uq_calendar_evaluation_obligation_due', table_name='calendar_entries')
+    op.create_index('uq_calendar_user_obligation_due', 'calendar_entries', ['user_id', 'obligation_type_id', 'due_date'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_calendar_user_obligation_due', table_name='calendar_entries')
+    op.create_index('uq_calendar_evaluation_obligation_due', 'calendar_entries', ['evaluation_id', 'obligation_type_id', 'due_date'], unique=True)
@@ -0,0 +1,62 @@
+"""Opaque keyset cursors and streamed JSON list responses."""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import AsyncIterator, Iterable
+from datetime import date, datetime
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_key: date, row_id: UUID) -> str:
+    """Cursor for the row after (`sort_key`, `row_id`); `sort_key` is a date or datetime."""
+    raw = f"{sort_key.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Inverse of `encode_cursor`; raises ValueError for malformed cursors.
+    Date keys come back as a datetime at midnight.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sort_key, row_id = raw.split("|")
+        return datetime.fromisoformat(sort_key), UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def _json_array(items: Iterable[BaseModel], chunk_size: int) -> AsyncIterator[bytes]:
+    chunk: list[str] = []
+    separator = ""
+    yield b"["
+    for item in items:
+        chunk.append(separator + item.model_dump_json())
+        separator = ","
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode()
+    yield b"]"
+
+
+def stream_json_list(
+    items: Iterable[BaseModel],
+    next_cursor: str | None = None,
+    chunk_size: int = 100,
+) -> StreamingResponse:
+    """
+    Respond with a JSON array encoded item by item, so long lists are never
+    held as one serialized document. `next_cursor` goes in NEXT_CURSOR_HEADER.
+    """
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return StreamingResponse(
+        _json_array(items, chunk_size), media_type="application/json", headers=headers
+    )
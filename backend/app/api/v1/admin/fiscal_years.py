@@ -3,14 +3,18 @@ from __future__ import annotations
 from decimal import Decimal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import CurrentUser, require_admin
 from app.application.admin_service import AdminService
+from app.application.simulation_service import ProposedThreshold, SimulationService
 from app.infrastructure.database.session import get_db
+from app.infrastructure.repositories.pg_evaluation_context_loader import PgEvaluationContextLoader
+from app.infrastructure.repositories.pg_profile_repo import PgProfileRepository
 from app.infrastructure.repositories.pg_rule_repo import PgRuleRepository
+from app.infrastructure.repositories.pg_threshold_repo import PgThresholdRepository
 
 router = APIRouter(prefix="/admin/fiscal-years", tags=["admin"])
 
@@ -30,6 +34,18 @@ class ThresholdCreateRequest(BaseModel):
     legal_reference: str | None = None
 
 
+class ProposedThresholdRequest(BaseModel):
+    code: str
+    value_uvt: Decimal | None = None
+    value_cop: Decimal | None = None
+
+
+class SimulationRequest(BaseModel):
+    thresholds: list[ProposedThresholdRequest] = Field(default_factory=list)
+    rule_set_id: UUID | None = None
+    uvt_value: Decimal | None = None
+
+
 @router.get("")
 async def list_fiscal_years(
     db: AsyncSession = Depends(get_db),
@@ -80,3 +96,30 @@ async def create_threshold(
         description=request.description,
         legal_reference=request.legal_reference,
     )
+
+
+@router.post("/{fiscal_year_id}/simulations")
+async def simulate_thresholds(
+    fiscal_year_id: str,
+    request: SimulationRequest,
+    db: AsyncSession = Depends(get_db),
+    admin: CurrentUser = Depends(require_admin),
+):
+    """How many of the tenant's profiles would change outcome, per obligation. Nothing is saved."""
+    service = SimulationService(
+        PgProfileRepository(db),
+        PgRuleRepository(db),
+        PgThresholdRepository(db),
+        PgEvaluationContextLoader(db),
+    )
+    try:
+        report = await service.simulate(
+            fiscal_year_id=UUID(fiscal_year_id),
+            tenant_id=admin.tenant_id,
+            thresholds=[ProposedThreshold(**t.model_dump()) for t in request.thresholds],
+            rule_set_id=request.rule_set_id,
+            uvt_value=request.uvt_value,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return report.to_dict()
@@ -1,39 +1,179 @@
 from __future__ import annotations
 
+from datetime import date, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import CurrentUser, get_current_user
-from app.api.v1.schemas.calendar import CalendarEntryResponse, CalendarMarkCompleteRequest
+from app.api.pagination import decode_cursor, encode_cursor, stream_json_list
+from app.api.v1.schemas.calendar import (
+    CalendarBulkCompleteRequest,
+    CalendarEntryResponse,
+    CalendarFeedTokenResponse,
+    CalendarMarkCompleteRequest,
+)
 from app.application.calendar_service import CalendarService
+from app.application.deadline_service import DeadlineService
+from app.config import settings
+from app.domain.entities.calendar_entry import CalendarEntryEntity, CalendarVersionEntity
+from app.infrastructure.auth.jwt_provider import create_calendar_feed_token, decode_token
 from app.infrastructure.database.session import get_db
 from app.infrastructure.repositories.pg_calendar_repo import PgCalendarRepository
+from app.infrastructure.repositories.pg_deadline_repo import PgDeadlineRepository
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
 
+def _build_service(db: AsyncSession) -> CalendarService:
+    return CalendarService(PgCalendarRepository(db), DeadlineService(PgDeadlineRepository(db)))
+
+
+def _to_response(entry: CalendarEntryEntity) -> CalendarEntryResponse:
+    return CalendarEntryResponse(
+        id=str(entry.id),
+        obligation_type_id=str(entry.obligation_type_id),
+        title=entry.title,
+        description=entry.description,
+        due_date=entry.due_date.isoformat(),
+        periodicity=entry.periodicity,
+        is_completed=entry.is_completed,
+        completed_at=entry.completed_at.isoformat() if entry.completed_at else None,
+    )
+
+
 @router.get("", response_model=list[CalendarEntryResponse])
 async def list_calendar(
+    due_from: date | None = None,
+    due_to: date | None = None,
+    completed: bool | None = None,
+    obligation_type_id: list[UUID] | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=settings.CALENDAR_MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(get_current_user),
 ):
-    service = CalendarService(PgCalendarRepository(db))
-    entries = await service.list_calendar(user.user_id, user.tenant_id)
-    return [
-        CalendarEntryResponse(
-            id=str(e.id),
-            obligation_type_id=str(e.obligation_type_id),
-            title=e.title,
-            description=e.description,
-            due_date=e.due_date.isoformat(),
-            periodicity=e.periodicity,
-            is_completed=e.is_completed,
-            completed_at=e.completed_at.isoformat() if e.completed_at else None,
+    """
+    Calendar entries by due date, optionally limited to a due-date window,
+    a completion status and some obligation types. Without `limit` every
+    matching entry is returned; with it, the `X-Next-Cursor` response header
+    carries the `cursor` for the next page while there is one.
+    """
+    try:
+        after = None
+        if cursor:
+            due_date, entry_id = decode_cursor(cursor)
+            after = (due_date.date(), entry_id)
+        entries = await _build_service(db).list_calendar(
+            user.user_id,
+            user.tenant_id,
+            due_from=due_from,
+            due_to=due_to,
+            completed=completed,
+            obligation_type_ids=obligation_type_id,
+            limit=limit + 1 if limit else None,
+            after=after,
         )
-        for e in entries
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    next_cursor = None
+    if limit and len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(entries[-1].due_date, entries[-1].id)
+    return stream_json_list((_to_response(e) for e in entries), next_cursor=next_cursor)
+
+
+@router.get("/upcoming", response_model=list[CalendarEntryResponse])
+async def upcoming_deadlines(
+    limit: int = Query(5, ge=1, le=settings.CALENDAR_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """The next pending deadlines, from today on; for dashboard widgets."""
+    entries = await _build_service(db).upcoming_deadlines(user.user_id, user.tenant_id, limit)
+    return [_to_response(e) for e in entries]
+
+
+def _not_modified(request: Request, etag: str, version: CalendarVersionEntity) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and version.updated_at:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return version.updated_at.replace(microsecond=0) <= since
+    return False
+
+
+@router.post("/feed-token", response_model=CalendarFeedTokenResponse)
+async def create_feed_token(user: CurrentUser = Depends(get_current_user)):
+    """A subscription URL for Google Calendar, Outlook and other calendar apps."""
+    token = create_calendar_feed_token(user.user_id, user.tenant_id)
+    return CalendarFeedTokenResponse(
+        token=token,
+        url=f"{settings.API_V1_PREFIX}{router.prefix}/feed.ics?token={token}",
+    )
+
+
+@router.get("/feed.ics", response_class=StreamingResponse)
+async def calendar_feed(
+    token: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The user's calendar as an iCalendar feed, authenticated by the token in
+    the URL. Conditional requests are answered from the user's calendar
+    version alone, without reading entries; rendered feeds are cached until
+    the entries change.
+    """
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "calendar_feed":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+    user_id, tenant_id = UUID(payload["sub"]), UUID(payload["tenant_id"])
+
+    service = _build_service(db)
+    version = await service.get_version(user_id)
+    etag = f'"{version.version}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if version.updated_at:
+        headers["Last-Modified"] = format_datetime(
+            version.updated_at.astimezone(timezone.utc), usegmt=True
+        )
+    if _not_modified(request, etag, version):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    feed = await service.render_feed(user_id, tenant_id, version)
+    return StreamingResponse(
+        iter(feed), media_type="text/calendar; charset=utf-8", headers=headers
+    )
+
+
+@router.patch("", response_model=list[CalendarEntryResponse])
+async def set_completed(
+    request: CalendarBulkCompleteRequest,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Complete (or, with `is_completed: false`, reopen) several entries at
+    once. Returns the entries that were updated; unknown ids are ignored.
+    """
+    entries = await _build_service(db).set_completed(
+        request.entry_ids, user.tenant_id, request.is_completed
+    )
+    return [_to_response(e) for e in entries]
 
 
 @router.patch("/{entry_id}", response_model=CalendarEntryResponse)
@@ -43,20 +183,11 @@ async def mark_completed(
     db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(get_current_user),
 ):
-    service = CalendarService(PgCalendarRepository(db))
+    service = _build_service(db)
     entry = await service.mark_completed(UUID(entry_id), user.tenant_id)
     if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Calendar entry not found",
         )
-    return CalendarEntryResponse(
-        id=str(entry.id),
-        obligation_type_id=str(entry.obligation_type_id),
-        title=entry.title,
-        description=entry.description,
-        due_date=entry.due_date.isoformat(),
-        periodicity=entry.periodicity,
-        is_completed=entry.is_completed,
-        completed_at=entry.completed_at.isoformat() if entry.completed_at else None,
-    )
+    return _to_response(entry)
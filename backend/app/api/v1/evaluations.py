@@ -1,27 +1,41 @@
 from __future__ import annotations
 
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import CurrentUser, get_current_user
+from app.api.pagination import decode_cursor, encode_cursor, stream_json_list
 from app.api.v1.schemas.evaluations import (
+    BatchEvaluationCreateRequest,
+    BatchEvaluationErrorResponse,
+    BatchEvaluationResponse,
     DisclaimerResponse,
     EvaluationCreateRequest,
+    EvaluationJobResponse,
     EvaluationListItemResponse,
     EvaluationResponse,
     EvaluationResultResponse,
     EvaluationSummaryResponse,
     ObligationResponse,
 )
+from app.application.calendar_service import CalendarService
+from app.application.deadline_service import DeadlineService
+from app.application.evaluation_job_service import EvaluationJobService
 from app.application.evaluation_service import EvaluationService
+from app.config import settings
 from app.domain.entities.evaluation import EvaluationEntity
+from app.domain.entities.evaluation_job import EvaluationJobEntity
+from app.domain.value_objects.evaluation_detail import EvaluationDetail
 from app.infrastructure.database.session import get_db
+from app.infrastructure.repositories.pg_calendar_repo import PgCalendarRepository
+from app.infrastructure.repositories.pg_deadline_repo import PgDeadlineRepository
+from app.infrastructure.repositories.pg_evaluation_job_repo import PgEvaluationJobRepository
 from app.infrastructure.repositories.pg_evaluation_repo import PgEvaluationRepository
 from app.infrastructure.repositories.pg_profile_repo import PgProfileRepository
-from app.infrastructure.repositories.pg_rule_repo import PgRuleRepository
-from app.infrastructure.repositories.pg_threshold_repo import PgThresholdRepository
 
 router = APIRouter(prefix="/evaluations", tags=["evaluations"])
 
@@ -37,13 +51,40 @@ def _build_service(db: AsyncSession) -> EvaluationService:
     return EvaluationService(
         db=db,
         profile_repo=PgProfileRepository(db),
-        rule_repo=PgRuleRepository(db),
         evaluation_repo=PgEvaluationRepository(db),
-        threshold_repo=PgThresholdRepository(db),
+        calendar_service=CalendarService(
+            PgCalendarRepository(db), DeadlineService(PgDeadlineRepository(db))
+        ),
+    )
+
+
+def _build_job_service(db: AsyncSession) -> EvaluationJobService:
+    return EvaluationJobService(
+        profile_repo=PgProfileRepository(db),
+        job_repo=PgEvaluationJobRepository(db),
     )
 
 
-def _to_response(evaluation: EvaluationEntity) -> EvaluationResponse:
+def _job_url(job_id: UUID) -> str:
+    return f"{settings.API_V1_PREFIX}{router.prefix}/jobs/{job_id}"
+
+
+def _to_job_response(job: EvaluationJobEntity) -> EvaluationJobResponse:
+    return EvaluationJobResponse(
+        id=str(job.id),
+        status=job.status,
+        tax_profile_id=str(job.tax_profile_id),
+        evaluation_id=str(job.evaluation_id) if job.evaluation_id else None,
+        error=job.error,
+        attempts=job.attempts,
+        created_at=job.created_at.isoformat() if job.created_at else None,
+        finished_at=job.finished_at.isoformat() if job.finished_at else None,
+    )
+
+
+def _to_response(
+    evaluation: EvaluationEntity, detail: EvaluationDetail = EvaluationDetail.FULL
+) -> EvaluationResponse:
     results = []
     for r in evaluation.results:
         results.append(
@@ -57,7 +98,7 @@ def _to_response(evaluation: EvaluationEntity) -> EvaluationResponse:
                 periodicity=r.periodicity,
                 explanation=r.explanation_es,
                 legal_references=r.legal_references,
-                conditions_evaluated=r.conditions_evaluated,
+                conditions_evaluated=list(r.conditions_evaluated),
             )
         )
 
@@ -65,6 +106,7 @@ def _to_response(evaluation: EvaluationEntity) -> EvaluationResponse:
 
     return EvaluationResponse(
         id=str(evaluation.id),
+        detail=detail.value,
         evaluated_at=evaluation.evaluated_at.isoformat(),
         profile_summary=evaluation.profile_snapshot,
         results=results,
@@ -77,12 +119,38 @@ def _to_response(evaluation: EvaluationEntity) -> EvaluationResponse:
     )
 
 
-@router.post("", response_model=EvaluationResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=EvaluationResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": EvaluationJobResponse}},
+)
 async def create_evaluation(
     request: EvaluationCreateRequest,
+    mode: Literal["sync", "async"] = "sync",
     db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(get_current_user),
 ):
+    """
+    With `mode=async` the evaluation is queued for the worker pool and a 202
+    with the job is returned; poll the `Location` URL until the job has
+    finished, then read the evaluation by its `evaluation_id`.
+    """
+    if mode == "async":
+        try:
+            job = await _build_job_service(db).enqueue(
+                tax_profile_id=UUID(request.tax_profile_id),
+                user_id=user.user_id,
+                tenant_id=user.tenant_id,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=_to_job_response(job).model_dump(),
+            headers={"Location": _job_url(job.id)},
+        )
+
     service = _build_service(db)
     try:
         evaluation = await service.evaluate(
@@ -95,33 +163,105 @@ async def create_evaluation(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.post(
+    "/batch", response_model=BatchEvaluationResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_evaluations_batch(
+    request: BatchEvaluationCreateRequest,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    service = _build_service(db)
+    try:
+        profile_ids = [UUID(pid) for pid in request.tax_profile_ids]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    outcome = await service.evaluate_many(
+        tax_profile_ids=profile_ids,
+        user_id=user.user_id,
+        tenant_id=user.tenant_id,
+        allow_tenant_profiles=user.is_admin(),
+    )
+    return BatchEvaluationResponse(
+        evaluations=[_to_response(e) for e in outcome.evaluations],
+        errors=[
+            BatchEvaluationErrorResponse(tax_profile_id=str(pid), detail=detail)
+            for pid, detail in outcome.errors.items()
+        ],
+    )
+
+
 @router.get("", response_model=list[EvaluationListItemResponse])
 async def list_evaluations(
+    limit: int | None = Query(None, ge=1, le=settings.EVALUATION_HISTORY_MAX_PAGE_SIZE),
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(get_current_user),
 ):
+    """
+    Evaluation history, newest first. Without `limit` the whole history is
+    returned; with it, the `X-Next-Cursor` response header carries the
+    `cursor` for the next page while there is one.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     service = _build_service(db)
-    evaluations = await service.list_evaluations(user.user_id, user.tenant_id)
-    return [
-        EvaluationListItemResponse(
-            id=str(e.id),
-            fiscal_year_id=str(e.fiscal_year_id),
-            status=e.status,
-            evaluated_at=e.evaluated_at.isoformat(),
-            summary=EvaluationSummaryResponse(**e.summary()),
-        )
-        for e in evaluations
-    ]
+    evaluations = await service.list_evaluations(
+        user.user_id, user.tenant_id, limit=limit + 1 if limit else None, after=after
+    )
+    next_cursor = None
+    if limit and len(evaluations) > limit:
+        evaluations = evaluations[:limit]
+        next_cursor = encode_cursor(evaluations[-1].created_at, evaluations[-1].id)
+
+    return stream_json_list(
+        (
+            EvaluationListItemResponse(
+                id=str(e.id),
+                fiscal_year_id=str(e.fiscal_year_id),
+                status=e.status,
+                evaluated_at=e.evaluated_at.isoformat(),
+                summary=EvaluationSummaryResponse(**e.summary()),
+            )
+            for e in evaluations
+        ),
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=EvaluationJobResponse)
+async def get_evaluation_job(
+    job_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user: CurrentUser = Depends(get_current_user),
+):
+    job = await _build_job_service(db).get_job(job_id, user.user_id, user.tenant_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if not job.is_finished():
+        response.headers["Retry-After"] = "1"
+    return _to_job_response(job)
 
 
 @router.get("/{evaluation_id}", response_model=EvaluationResponse)
 async def get_evaluation(
     evaluation_id: str,
+    detail: EvaluationDetail = EvaluationDetail.FULL,
     db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(get_current_user),
 ):
+    """
+    `detail=summary` returns only the result counters, `detail=results` adds
+    the profile snapshot and per-obligation results without their condition
+    trace, and `detail=full` (the default) includes the trace.
+    """
     service = _build_service(db)
-    evaluation = await service.get_evaluation(UUID(evaluation_id), user.tenant_id)
+    evaluation = await service.get_evaluation(UUID(evaluation_id), user.tenant_id, detail)
     if not evaluation:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Evaluation not found")
-    return _to_response(evaluation)
+    return _to_response(evaluation, detail)
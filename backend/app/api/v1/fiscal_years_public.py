@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.application.deadline_service import DeadlineService
+from app.config import settings
 from app.infrastructure.database.models.fiscal_year import FiscalYear
 from app.infrastructure.database.session import get_db
+from app.infrastructure.repositories.pg_deadline_repo import PgDeadlineRepository
 
 router = APIRouter(prefix="/fiscal-years", tags=["fiscal-years"])
 
@@ -30,3 +35,36 @@ async def list_active_fiscal_years(
         }
         for fy in result.scalars().all()
     ]
+
+
+@router.get("/{fiscal_year_id}/deadlines")
+async def list_deadlines(
+    fiscal_year_id: UUID,
+    response: Response,
+    nit_digit: int | None = Query(None, ge=0, le=9),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Public endpoint: national due dates of the fiscal year for a NIT last
+    digit, by due date. Without `nit_digit` each period gets its earliest date.
+    Served from the in-memory deadline table of the fiscal year.
+    """
+    deadlines = await DeadlineService(PgDeadlineRepository(db)).list_deadlines(
+        fiscal_year_id, nit_digit
+    )
+    if deadlines is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Fiscal year not found",
+        )
+    response.headers["Cache-Control"] = f"public, max-age={settings.DEADLINE_CACHE_TTL_SECONDS}"
+    return [
+        {
+            "obligation_type_id": str(d.obligation_type_id),
+            "obligation_code": d.obligation_code,
+            "frequency": d.frequency,
+            "period": d.period,
+            "due_date": d.due_date.isoformat(),
+        }
+        for d in deadlines
+    ]
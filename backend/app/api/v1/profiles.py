@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import CurrentUser, get_current_user
@@ -11,12 +11,32 @@ from app.api.v1.schemas.profiles import (
     ProfileResponse,
     ProfileUpdateRequest,
 )
+from app.application.calendar_service import CalendarService
+from app.application.deadline_service import DeadlineService
+from app.application.evaluation_service import EvaluationService
 from app.application.profile_service import ProfileService
+from app.config import settings
 from app.infrastructure.database.session import get_db
+from app.infrastructure.repositories.pg_calendar_repo import PgCalendarRepository
+from app.infrastructure.repositories.pg_deadline_repo import PgDeadlineRepository
+from app.infrastructure.repositories.pg_evaluation_repo import PgEvaluationRepository
 from app.infrastructure.repositories.pg_profile_repo import PgProfileRepository
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
 
+EVALUATION_ID_HEADER = "X-Evaluation-Id"
+
+
+def _build_evaluation_service(db: AsyncSession) -> EvaluationService:
+    return EvaluationService(
+        db=db,
+        profile_repo=PgProfileRepository(db),
+        evaluation_repo=PgEvaluationRepository(db),
+        calendar_service=CalendarService(
+            PgCalendarRepository(db), DeadlineService(PgDeadlineRepository(db))
+        ),
+    )
+
 
 def _to_response(entity) -> ProfileResponse:
     return ProfileResponse(
@@ -84,17 +104,38 @@ async def get_profile(
 async def update_profile(
     profile_id: str,
     request: ProfileUpdateRequest,
+    response: Response,
+    evaluate: bool | None = Query(None),
     db: AsyncSession = Depends(get_db),
     user: CurrentUser = Depends(get_current_user),
 ):
-    service = ProfileService(PgProfileRepository(db))
+    """
+    With `evaluate` (default PROFILE_AUTO_EVALUATE) the updated profile is
+    evaluated in the same request, recomputing only the obligations whose
+    rules read a changed field. The evaluation id is returned in the
+    `X-Evaluation-Id` header.
+    """
+    data = request.model_dump(exclude_none=True)
+    if evaluate is None:
+        evaluate = settings.PROFILE_AUTO_EVALUATE
+    if not evaluate:
+        service = ProfileService(PgProfileRepository(db))
+        try:
+            profile = await service.update_profile(UUID(profile_id), user.tenant_id, data)
+            return _to_response(profile)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    service = ProfileService(PgProfileRepository(db), _build_evaluation_service(db))
     try:
-        profile = await service.update_profile(
-            UUID(profile_id), user.tenant_id, request.model_dump(exclude_none=True)
-        )
-        return _to_response(profile)
+        updated = await service.update_and_evaluate(UUID(profile_id), user.tenant_id, data)
     except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if updated is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    profile, evaluation = updated
+    response.headers[EVALUATION_ID_HEADER] = str(evaluation.id)
+    return _to_response(profile)
 
 
 @router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
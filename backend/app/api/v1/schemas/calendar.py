@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.config import settings
 
 
 class CalendarEntryResponse(BaseModel):
@@ -16,3 +20,13 @@ class CalendarEntryResponse(BaseModel):
 
 class CalendarMarkCompleteRequest(BaseModel):
     is_completed: bool = True
+
+
+class CalendarBulkCompleteRequest(BaseModel):
+    entry_ids: list[UUID] = Field(min_length=1, max_length=settings.CALENDAR_MAX_PAGE_SIZE)
+    is_completed: bool = True
+
+
+class CalendarFeedTokenResponse(BaseModel):
+    token: str
+    url: str
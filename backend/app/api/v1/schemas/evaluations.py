@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.config import settings
 
 
 class EvaluationCreateRequest(BaseModel):
     tax_profile_id: str
 
 
+class BatchEvaluationCreateRequest(BaseModel):
+    tax_profile_ids: list[str] = Field(
+        min_length=1, max_length=settings.EVALUATION_BATCH_MAX_PROFILES
+    )
+
+
 class ConditionEvaluatedResponse(BaseModel):
     field: str
     operator: str
@@ -56,6 +64,7 @@ class DisclaimerResponse(BaseModel):
 
 class EvaluationResponse(BaseModel):
     id: str
+    detail: str = "full"
     fiscal_year: int | None = None
     rule_set_version: int | None = None
     evaluated_at: str
@@ -71,3 +80,24 @@ class EvaluationListItemResponse(BaseModel):
     status: str
     evaluated_at: str
     summary: EvaluationSummaryResponse | None = None
+
+
+class BatchEvaluationErrorResponse(BaseModel):
+    tax_profile_id: str
+    detail: str
+
+
+class BatchEvaluationResponse(BaseModel):
+    evaluations: list[EvaluationResponse] = []
+    errors: list[BatchEvaluationErrorResponse] = []
+
+
+class EvaluationJobResponse(BaseModel):
+    id: str
+    status: str
+    tax_profile_id: str
+    evaluation_id: str | None = None
+    error: str | None = None
+    attempts: int = 0
+    created_at: str | None = None
+    finished_at: str | None = None
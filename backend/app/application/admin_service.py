@@ -10,8 +10,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.entities.rule import RuleSetEntity
 from app.domain.interfaces.rule_repository import RuleRepository
+from app.infrastructure.cache.reference_cache import invalidate_evaluation_context
 from app.infrastructure.database.models.fiscal_year import FiscalYear
 from app.infrastructure.database.models.threshold import Threshold
+from app.infrastructure.database.partitions import create_fiscal_year_partitions
 
 
 class AdminService:
@@ -46,6 +48,7 @@ class AdminService:
         )
         self._db.add(fy)
         await self._db.flush()
+        await create_fiscal_year_partitions(self._db, fy.id, fy.year)
         return {
             "id": str(fy.id),
             "year": fy.year,
@@ -112,6 +115,7 @@ class AdminService:
             self._db.add(t)
             await self._db.flush()
 
+        invalidate_evaluation_context(self._db, fiscal_year_id)
         return {
             "id": str(t.id),
             "code": t.code,
@@ -0,0 +1,83 @@
+"""iCalendar (RFC 5545) rendering of calendar entries, for subscription feeds."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+
+from app.domain.entities.calendar_entry import CalendarEntryEntity
+
+PRODUCT_ID = "-//Tax Support Platform//Calendario tributario//ES"
+
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Split content lines longer than 75 octets, as the RFC requires."""
+    data = line.encode()
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts: list[str] = []
+    start, limit = 0, 75
+    while start < len(data):
+        end = min(start + limit, len(data))
+        # Never split inside a multi-byte character
+        while end < len(data) and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(data[start:end].decode())
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _event(entry: CalendarEntryEntity, stamp: str) -> str:
+    summary = f"[Completada] {entry.title}" if entry.is_completed else entry.title
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{entry.id}@tax-support-platform",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{entry.due_date.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(entry.due_date + timedelta(days=1)).strftime('%Y%m%d')}",
+        f"SUMMARY:{_escape(summary)}",
+        "TRANSP:TRANSPARENT",
+    ]
+    if entry.description:
+        lines.append(f"DESCRIPTION:{_escape(entry.description)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def render_ics(
+    entries: Iterable[CalendarEntryEntity],
+    updated_at: datetime | None = None,
+    chunk_size: int = 100,
+) -> Iterator[bytes]:
+    """The feed as encoded chunks of `chunk_size` events each."""
+    stamp = (updated_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    stamp_text = stamp.strftime("%Y%m%dT%H%M%SZ")
+    yield "".join(
+        _fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{PRODUCT_ID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            "X-WR-CALNAME:Calendario tributario",
+        )
+    ).encode()
+    chunk: list[str] = []
+    for entry in entries:
+        chunk.append(_event(entry, stamp_text))
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk).encode()
+            chunk = []
+    if chunk:
+        yield "".join(chunk).encode()
+    yield b"END:VCALENDAR\r\n"
@@ -5,54 +5,123 @@ import uuid
 from datetime import date
 from uuid import UUID
 
-from app.domain.entities.calendar_entry import CalendarEntryEntity
+from app.application.calendar_feed import render_ics
+from app.application.deadline_service import DeadlineService
+from app.domain.entities.calendar_entry import CalendarEntryEntity, CalendarVersionEntity
 from app.domain.entities.evaluation import EvaluationEntity
 from app.domain.interfaces.calendar_repository import CalendarRepository
+from app.infrastructure.cache.memory_cache import calendar_feed_cache
 
 
 class CalendarService:
-    def __init__(self, calendar_repo: CalendarRepository) -> None:
+    def __init__(self, calendar_repo: CalendarRepository, deadlines: DeadlineService) -> None:
         self._repo = calendar_repo
+        self._deadlines = deadlines
 
     async def generate_calendar(
         self,
         evaluation: EvaluationEntity,
         nit_last_digit: int | None,
     ) -> list[CalendarEntryEntity]:
+        return await self.generate_calendars([(evaluation, nit_last_digit)])
+
+    async def generate_calendars(
+        self, evaluations: list[tuple[EvaluationEntity, int | None]]
+    ) -> list[CalendarEntryEntity]:
+        """
+        Calendar entries for the obligations that apply in each evaluation,
+        one per due date of the obligation for the profile's NIT last digit.
+        Deadline tables come from the shared deadline cache and all entries
+        are written with one bulk insert; due dates the user's calendar
+        already has for the obligation are skipped, so re-evaluating does not
+        duplicate entries. Returns the entries that were created.
+        """
+        tables = await self._deadlines.get_tables([e.fiscal_year_id for e, _ in evaluations])
         entries: list[CalendarEntryEntity] = []
 
-        for result in evaluation.results:
-            if result.result != "applies":
+        for evaluation, nit_last_digit in evaluations:
+            table = tables.get(evaluation.fiscal_year_id)
+            if table is None:
                 continue
 
-            # Generate calendar entries based on the result's calendar_entries
-            for cal_data in result.calendar_entries:
-                entry = CalendarEntryEntity(
-                    id=uuid.uuid4(),
-                    evaluation_id=evaluation.id,
-                    user_id=evaluation.user_id,
-                    tenant_id=evaluation.tenant_id,
-                    obligation_type_id=result.obligation_type_id,
-                    title=cal_data.get("title", f"{result.obligation_name}"),
-                    description=cal_data.get("description"),
-                    due_date=date.fromisoformat(cal_data["due_date"])
-                    if isinstance(cal_data.get("due_date"), str)
-                    else cal_data.get("due_date", date.today()),
-                    periodicity=cal_data.get("periodicity", result.periodicity or "anual"),
-                )
-                entries.append(entry)
-
-        if entries:
-            await self._repo.create_entries(entries)
-
-        return entries
+            for result in evaluation.results:
+                if result.result != "applies":
+                    continue
+                for deadline in table.for_obligation(result.obligation_type_id, nit_last_digit):
+                    entries.append(
+                        CalendarEntryEntity(
+                            id=uuid.uuid4(),
+                            evaluation_id=evaluation.id,
+                            user_id=evaluation.user_id,
+                            tenant_id=evaluation.tenant_id,
+                            obligation_type_id=result.obligation_type_id,
+                            title=f"{result.obligation_name} - {deadline.period}",
+                            due_date=deadline.due_date,
+                            periodicity=deadline.frequency,
+                        )
+                    )
+
+        return await self._repo.create_entries(entries)
 
     async def list_calendar(
-        self, user_id: UUID, tenant_id: UUID
+        self,
+        user_id: UUID,
+        tenant_id: UUID,
+        due_from: date | None = None,
+        due_to: date | None = None,
+        completed: bool | None = None,
+        obligation_type_ids: list[UUID] | None = None,
+        limit: int | None = None,
+        after: tuple[date, UUID] | None = None,
+    ) -> list[CalendarEntryEntity]:
+        if due_from and due_to and due_from > due_to:
+            raise ValueError("due_from must not be after due_to")
+        return await self._repo.list_by_user(
+            user_id,
+            tenant_id,
+            due_from=due_from,
+            due_to=due_to,
+            completed=completed,
+            obligation_type_ids=obligation_type_ids,
+            limit=limit,
+            after=after,
+        )
+
+    async def upcoming_deadlines(
+        self, user_id: UUID, tenant_id: UUID, limit: int, today: date | None = None
     ) -> list[CalendarEntryEntity]:
-        return await self._repo.list_by_user(user_id, tenant_id)
+        """The next `limit` pending entries due today or later."""
+        return await self._repo.list_by_user(
+            user_id, tenant_id, due_from=today or date.today(), completed=False, limit=limit
+        )
 
     async def mark_completed(
         self, entry_id: UUID, tenant_id: UUID
     ) -> CalendarEntryEntity | None:
         return await self._repo.mark_completed(entry_id, tenant_id)
+
+    async def set_completed(
+        self, entry_ids: list[UUID], tenant_id: UUID, is_completed: bool = True
+    ) -> list[CalendarEntryEntity]:
+        """Complete (or reopen) several entries in one statement; returns those updated."""
+        return await self._repo.set_completed(
+            list(dict.fromkeys(entry_ids)), tenant_id, is_completed
+        )
+
+    async def get_version(self, user_id: UUID) -> CalendarVersionEntity:
+        return await self._repo.get_version(user_id)
+
+    async def render_feed(
+        self, user_id: UUID, tenant_id: UUID, version: CalendarVersionEntity
+    ) -> list[bytes]:
+        """
+        The user's calendar as iCalendar chunks. Feeds are rendered once per
+        calendar version and then served from `calendar_feed_cache`.
+        """
+        key = (user_id, version.version)
+        feed = calendar_feed_cache.get(key)
+        if feed is None:
+            entries = await self._repo.list_by_user(user_id, tenant_id)
+            feed = list(render_ics(entries, version.updated_at))
+            calendar_feed_cache.set(key, feed)
+        return feed
@@ -0,0 +1,50 @@
+"""Deadline service - national due dates per fiscal year, served from memory."""
+from __future__ import annotations
+
+from uuid import UUID
+
+from app.domain.calendar.deadlines import Deadline, DeadlineTable
+from app.domain.interfaces.deadline_repository import DeadlineRepository
+from app.infrastructure.cache.memory_cache import deadline_cache
+from app.infrastructure.cache.reference_cache import reference_cache
+
+
+class DeadlineService:
+    """
+    Deadlines depend only on the fiscal year, the obligation and the NIT last
+    digit, so each fiscal year's table is built once and shared by every
+    request of the process through `deadline_cache`.
+    """
+
+    def __init__(self, deadline_repo: DeadlineRepository) -> None:
+        self._repo = deadline_repo
+
+    async def get_tables(self, fiscal_year_ids: list[UUID]) -> dict[UUID, DeadlineTable]:
+        """Tables of the fiscal years that exist; those not cached are loaded in one query."""
+        tables: dict[UUID, DeadlineTable] = {}
+        missing: list[UUID] = []
+        for fiscal_year_id in dict.fromkeys(fiscal_year_ids):
+            table = deadline_cache.get(fiscal_year_id)
+            if table is None:
+                missing.append(fiscal_year_id)
+            else:
+                tables[fiscal_year_id] = table
+
+        if missing:
+            generations = {fy: reference_cache.local_generation(fy) for fy in missing}
+            loaded = await self._repo.get_tables(missing)
+            for fiscal_year_id, table in loaded.items():
+                if reference_cache.local_generation(fiscal_year_id) == generations[fiscal_year_id]:
+                    deadline_cache.set(fiscal_year_id, table)
+            tables.update(loaded)
+        return tables
+
+    async def get_table(self, fiscal_year_id: UUID) -> DeadlineTable | None:
+        return (await self.get_tables([fiscal_year_id])).get(fiscal_year_id)
+
+    async def list_deadlines(
+        self, fiscal_year_id: UUID, nit_last_digit: int | None
+    ) -> list[Deadline] | None:
+        """Deadlines for a NIT last digit, or None if the fiscal year does not exist."""
+        table = await self.get_table(fiscal_year_id)
+        return table.for_nit_digit(nit_last_digit) if table else None
@@ -0,0 +1,161 @@
+"""Engine executor - keeps CPU-heavy rule evaluation off the event loop."""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from decimal import Decimal
+from typing import Literal
+
+from app.application.evaluation_context import EvaluationContext
+from app.config import settings
+from app.domain.engine.compiler import CompiledRuleSet
+from app.domain.engine.engine import RulesEngine
+from app.domain.entities.evaluation import EvaluationResultEntity
+from app.domain.entities.obligation import ObligationTypeEntity
+from app.domain.entities.tax_profile import TaxProfileEntity
+from app.domain.value_objects.condition_trace import ConditionTrace
+
+ExecutorMode = Literal["auto", "inline", "thread", "process"]
+# The results for one profile, or the error that prevented its evaluation
+EngineOutcome = list[EvaluationResultEntity] | str
+
+
+def evaluate_profiles(
+    thresholds: dict[str, Decimal],
+    fiscal_year: int,
+    plan: CompiledRuleSet,
+    obligations: list[ObligationTypeEntity],
+    profiles: list[TaxProfileEntity],
+) -> list[EngineOutcome]:
+    engine = RulesEngine(thresholds=thresholds, fiscal_year=fiscal_year)
+    outcomes: list[EngineOutcome] = []
+    for profile in profiles:
+        try:
+            outcomes.append(engine.evaluate_compiled(profile, plan, obligations))
+        except ValueError as e:
+            outcomes.append(str(e))
+    return outcomes
+
+
+def _evaluate_in_worker(*args) -> list[EngineOutcome]:
+    """
+    `evaluate_profiles` for a worker process. Condition traces go back as
+    positions into the plan, which the caller already holds, instead of
+    pickling the compiled conditions they point to.
+    """
+    plan = args[2]
+    outcomes = evaluate_profiles(*args)
+    for outcome in outcomes:
+        if isinstance(outcome, str):
+            continue
+        for result in outcome:
+            result.conditions_evaluated = result.conditions_evaluated.to_positions(
+                plan.rules_for(result.obligation_type_id)
+            )
+    return outcomes
+
+
+def _attach_traces(outcomes: list[EngineOutcome], plan: CompiledRuleSet) -> list[EngineOutcome]:
+    for outcome in outcomes:
+        if isinstance(outcome, str):
+            continue
+        for result in outcome:
+            result.conditions_evaluated = ConditionTrace.from_positions(
+                plan.rules_for(result.obligation_type_id), result.conditions_evaluated
+            )
+    return outcomes
+
+
+class EngineExecutor:
+    """
+    Runs the rules engine for a batch of profiles inline, on a thread or in
+    a process pool. In "auto" mode the target is picked from the estimated
+    work (profiles x conditions in the plan): small evaluations stay on the
+    event loop, medium ones move to a thread so the loop keeps serving
+    requests, and large ones are split across worker processes.
+
+    Pools are created on first use and worker processes are spawned, not
+    forked, so they inherit no connections or event loop state.
+    """
+
+    def __init__(
+        self,
+        mode: ExecutorMode = settings.ENGINE_EXECUTOR,
+        thread_min_work: int = settings.ENGINE_THREAD_MIN_WORK,
+        process_min_work: int = settings.ENGINE_PROCESS_MIN_WORK,
+        process_workers: int = settings.ENGINE_PROCESS_WORKERS,
+    ) -> None:
+        self._mode = mode
+        self._thread_min_work = thread_min_work
+        self._process_min_work = process_min_work
+        self._process_workers = process_workers
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+
+    def choose(self, work: int) -> Literal["inline", "thread", "process"]:
+        if self._mode != "auto":
+            return self._mode
+        if work >= self._process_min_work:
+            return "process"
+        if work >= self._thread_min_work:
+            return "thread"
+        return "inline"
+
+    async def evaluate(
+        self,
+        context: EvaluationContext,
+        profiles: list[TaxProfileEntity],
+        obligations: list[ObligationTypeEntity] | None = None,
+    ) -> list[EngineOutcome]:
+        """Engine outcomes for `profiles`, in the same order; `obligations` defaults to all."""
+        if obligations is None:
+            obligations = context.obligations
+        args = (context.thresholds, context.fiscal_year.year, context.plan, obligations)
+        target = self.choose(len(profiles) * context.plan.condition_count)
+        if target == "inline" or not profiles:
+            return evaluate_profiles(*args, profiles)
+
+        loop = asyncio.get_running_loop()
+        if target == "process":
+            try:
+                return await self._evaluate_in_processes(loop, args, profiles)
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool next time and finish on a thread
+                self._processes = None
+        return await loop.run_in_executor(self._thread_pool(), evaluate_profiles, *args, profiles)
+
+    async def _evaluate_in_processes(
+        self, loop: asyncio.AbstractEventLoop, args: tuple, profiles: list[TaxProfileEntity]
+    ) -> list[EngineOutcome]:
+        pool = self._process_pool()
+        size = -(-len(profiles) // self._process_workers)
+        chunks = [profiles[i: i + size] for i in range(0, len(profiles), size)]
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(pool, _evaluate_in_worker, *args, chunk) for chunk in chunks
+        ))
+        return _attach_traces([o for part in parts for o in part], args[2])
+
+    def _thread_pool(self) -> Executor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(thread_name_prefix="engine")
+        return self._threads
+
+    def _process_pool(self) -> Executor:
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(
+                max_workers=self._process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._processes
+
+    def shutdown(self) -> None:
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = None
+        self._processes = None
+
+
+engine_executor = EngineExecutor()
@@ -0,0 +1,126 @@
+"""Evaluation context - static reference data needed to evaluate profiles of a fiscal year."""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from functools import cached_property
+from uuid import UUID
+
+from app.domain.engine.compiler import CompiledRuleSet, RuleSetCompiler
+from app.domain.entities.fiscal_year import FiscalYearEntity
+from app.domain.entities.obligation import ObligationTypeEntity
+from app.domain.entities.rule import RuleConditionEntity, RuleEntity, RuleSetEntity
+from app.domain.entities.tax_profile import TaxProfileEntity
+
+
+def _jsonable(value: object) -> object:
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _with_uuids(data: dict, *keys: str) -> dict:
+    return {
+        k: UUID(v) if k in keys else v
+        for k, v in data.items()
+        if k not in ("rules", "conditions")
+    }
+
+
+def _rule_from_dict(data: dict) -> RuleEntity:
+    return RuleEntity(
+        **_with_uuids(data, "id", "rule_set_id", "obligation_type_id"),
+        conditions=[
+            RuleConditionEntity(**_with_uuids(c, "id", "rule_id")) for c in data["conditions"]
+        ],
+    )
+
+
+def _digest(payload: object) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class EvaluationContext:
+    """
+    Everything an evaluation needs besides the profile itself. Shared between
+    requests through the context cache, so it must be treated as read-only.
+    """
+
+    fiscal_year: FiscalYearEntity
+    rule_set: RuleSetEntity
+    thresholds: dict[str, Decimal]
+    obligations: list[ObligationTypeEntity]
+    periodicities: dict[UUID, str]
+    plan: CompiledRuleSet
+
+    @classmethod
+    def build(
+        cls,
+        fiscal_year: FiscalYearEntity,
+        rule_set: RuleSetEntity,
+        thresholds: dict[str, Decimal],
+        obligations: list[ObligationTypeEntity],
+        periodicities: dict[UUID, str],
+    ) -> EvaluationContext:
+        return cls(
+            fiscal_year=fiscal_year,
+            rule_set=rule_set,
+            thresholds=thresholds,
+            obligations=obligations,
+            periodicities=periodicities,
+            plan=RuleSetCompiler(thresholds).compile(rule_set),
+        )
+
+    def to_reference(self) -> dict:
+        """JSON-safe form of the reference data, for the shared cache."""
+        return {
+            "fiscal_year": _jsonable(asdict(self.fiscal_year)),
+            "rule_set": _jsonable(asdict(self.rule_set)),
+            "thresholds": {code: str(value) for code, value in self.thresholds.items()},
+            "obligations": [_jsonable(asdict(o)) for o in self.obligations],
+            "periodicities": {str(k): v for k, v in self.periodicities.items()},
+        }
+
+    @classmethod
+    def from_reference(cls, data: dict) -> EvaluationContext:
+        fiscal_year = dict(data["fiscal_year"], uvt_value=Decimal(data["fiscal_year"]["uvt_value"]))
+        rule_set = data["rule_set"]
+        return cls.build(
+            fiscal_year=FiscalYearEntity(**_with_uuids(fiscal_year, "id")),
+            rule_set=RuleSetEntity(
+                **_with_uuids(rule_set, "id", "fiscal_year_id"),
+                rules=[_rule_from_dict(r) for r in rule_set["rules"]],
+            ),
+            thresholds={code: Decimal(value) for code, value in data["thresholds"].items()},
+            obligations=[ObligationTypeEntity(**_with_uuids(o, "id")) for o in data["obligations"]],
+            periodicities={UUID(k): v for k, v in data["periodicities"].items()},
+        )
+
+    @cached_property
+    def reference_version(self) -> str:
+        """Fingerprint of the rule set, thresholds and obligation catalog."""
+        return _digest({
+            "rule_set": [str(self.rule_set.id), self.rule_set.version],
+            "thresholds": {code: str(value) for code, value in self.thresholds.items()},
+            "obligations": [str(o.id) for o in self.obligations],
+            "periodicities": {str(k): v for k, v in self.periodicities.items()},
+        })
+
+    def input_hash(self, profile: TaxProfileEntity) -> str:
+        """
+        Canonical hash of everything that determines an evaluation's results.
+        Uses the exact profile fields rather than `to_snapshot()`, which
+        rounds amounts to floats and folds zero amounts into None.
+        """
+        fields = asdict(profile)
+        for key in ("id", "user_id", "tenant_id"):
+            fields.pop(key)
+        return _digest({"profile": fields, "reference": self.reference_version})
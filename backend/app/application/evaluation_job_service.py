@@ -0,0 +1,49 @@
+"""Evaluation job service - queue evaluations for the worker pool."""
+from __future__ import annotations
+
+import uuid
+from uuid import UUID
+
+from app.domain.entities.evaluation_job import EvaluationJobEntity
+from app.domain.interfaces.evaluation_job_repository import EvaluationJobRepository
+from app.domain.interfaces.profile_repository import ProfileRepository
+
+
+class EvaluationJobService:
+    def __init__(
+        self,
+        profile_repo: ProfileRepository,
+        job_repo: EvaluationJobRepository,
+    ) -> None:
+        self._profile_repo = profile_repo
+        self._job_repo = job_repo
+
+    async def enqueue(
+        self,
+        tax_profile_id: UUID,
+        user_id: UUID,
+        tenant_id: UUID,
+    ) -> EvaluationJobEntity:
+        """
+        Queue an evaluation of the profile. Ownership is checked up front so
+        that requests that would fail anyway are rejected immediately.
+        """
+        profile = await self._profile_repo.get_by_id(tax_profile_id, tenant_id)
+        if not profile:
+            raise ValueError("Tax profile not found")
+        if profile.user_id != user_id:
+            raise ValueError("Profile does not belong to user")
+
+        return await self._job_repo.enqueue(
+            EvaluationJobEntity(
+                id=uuid.uuid4(),
+                user_id=user_id,
+                tenant_id=tenant_id,
+                tax_profile_id=tax_profile_id,
+            )
+        )
+
+    async def get_job(
+        self, job_id: UUID, user_id: UUID, tenant_id: UUID
+    ) -> EvaluationJobEntity | None:
+        return await self._job_repo.get_by_id(job_id, user_id, tenant_id)
@@ -2,22 +2,34 @@
 from __future__ import annotations
 
 import uuid
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.engine.engine import RulesEngine
-from app.domain.entities.evaluation import EvaluationEntity
-from app.domain.entities.obligation import ObligationTypeEntity
-from app.domain.entities.rule import RuleEntity
+from app.application.calendar_service import CalendarService
+from app.application.engine_executor import EngineExecutor, engine_executor
+from app.application.evaluation_context import EvaluationContext
+from app.config import settings
+from app.domain.entities.evaluation import (
+    EvaluationEntity,
+    EvaluationResultEntity,
+    EvaluationSummaryEntity,
+)
+from app.domain.entities.tax_profile import TaxProfileEntity
 from app.domain.interfaces.evaluation_repository import EvaluationRepository
 from app.domain.interfaces.profile_repository import ProfileRepository
-from app.domain.interfaces.rule_repository import RuleRepository
-from app.domain.interfaces.threshold_repository import ThresholdRepository
-from app.infrastructure.database.models.fiscal_year import FiscalYear
-from app.infrastructure.database.models.obligation import ObligationType, ObligationPeriodicity
+from app.domain.value_objects.evaluation_detail import EvaluationDetail
+from app.infrastructure.cache.memory_cache import context_cache
+from app.infrastructure.cache.reference_cache import reference_cache
+from app.infrastructure.repositories.pg_evaluation_context_loader import PgEvaluationContextLoader
+
+
+@dataclass
+class BatchEvaluationOutcome:
+    evaluations: list[EvaluationEntity] = field(default_factory=list)
+    errors: dict[UUID, str] = field(default_factory=dict)
 
 
 class EvaluationService:
@@ -25,22 +37,31 @@ class EvaluationService:
         self,
         db: AsyncSession,
         profile_repo: ProfileRepository,
-        rule_repo: RuleRepository,
         evaluation_repo: EvaluationRepository,
-        threshold_repo: ThresholdRepository,
+        executor: EngineExecutor = engine_executor,
+        context_loader: PgEvaluationContextLoader | None = None,
+        calendar_service: CalendarService | None = None,
     ) -> None:
         self._db = db
         self._profile_repo = profile_repo
-        self._rule_repo = rule_repo
         self._evaluation_repo = evaluation_repo
-        self._threshold_repo = threshold_repo
+        self._executor = executor
+        self._context_loader = context_loader or PgEvaluationContextLoader(db)
+        self._calendar_service = calendar_service
 
     async def evaluate(
         self,
         tax_profile_id: UUID,
         user_id: UUID,
         tenant_id: UUID,
+        previous_profile: TaxProfileEntity | None = None,
     ) -> EvaluationEntity:
+        """
+        With `previous_profile`, the profile as it was before an update, only
+        obligations whose rules read a changed field are recomputed when the
+        previous version was evaluated under the current reference data; the
+        other results are copied from that evaluation.
+        """
         # 1. Load the profile
         profile = await self._profile_repo.get_by_id(tax_profile_id, tenant_id)
         if not profile:
@@ -48,96 +69,238 @@ class EvaluationService:
         if profile.user_id != user_id:
             raise ValueError("Profile does not belong to user")
 
-        # 2. Load fiscal year
-        fy_result = await self._db.execute(
-            select(FiscalYear).where(FiscalYear.id == profile.fiscal_year_id)
-        )
-        fiscal_year = fy_result.scalar_one_or_none()
-        if not fiscal_year:
-            raise ValueError("Fiscal year not found")
+        # 2. Load fiscal year, rule set, thresholds and obligations (cached)
+        context = await self._load_context(profile.fiscal_year_id)
 
-        # 3. Load active rule set
-        rule_set = await self._rule_repo.get_active_rule_set(fiscal_year.id)
-        if not rule_set:
-            raise ValueError(f"No active rule set for fiscal year {fiscal_year.year}")
+        # 3. Reuse the latest evaluation of identical inputs, if any
+        input_hash = context.input_hash(profile)
+        if settings.EVALUATION_MEMO_POLICY != "off":
+            # Read in full: the response carries the condition traces, like a
+            # fresh evaluation's, even though "persist" copies rows server-side
+            previous = await self._evaluation_repo.get_latest_by_input_hash(
+                profile.id, input_hash, tenant_id, EvaluationDetail.FULL
+            )
+            if previous:
+                # Same results as the previous evaluation: its calendar stands
+                return await self._reuse_evaluation(previous, profile, context)
 
-        # 4. Load thresholds
-        thresholds = await self._threshold_repo.get_thresholds_map(fiscal_year.id)
+        # 4. Evaluate and persist
+        results = None
+        if previous_profile is not None:
+            results = await self._evaluate_changes(previous_profile, profile, context, tenant_id)
+        if results is None:
+            [results] = await self._executor.evaluate(context, [profile])
+        if isinstance(results, str):
+            raise ValueError(results)
+        evaluation = self._build_evaluation(profile, context, results, user_id, tenant_id)
+        await self._evaluation_repo.create(evaluation)
+        await self._generate_calendars([(evaluation, profile.nit_last_digit)])
+        return evaluation
 
-        # 5. Load obligation types
-        obligations = await self._load_obligations()
+    async def evaluate_many(
+        self,
+        tax_profile_ids: list[UUID],
+        user_id: UUID,
+        tenant_id: UUID,
+        allow_tenant_profiles: bool = False,
+    ) -> BatchEvaluationOutcome:
+        """
+        Evaluate several profiles at once. Profiles are fetched in one query,
+        reference data is loaded once per fiscal year and all evaluations are
+        persisted with bulk inserts. Profiles that cannot be evaluated are
+        reported in `errors` instead of failing the whole batch.
 
-        # 6. Build rules by obligation map
-        rules_by_obligation: dict[UUID, list[RuleEntity]] = {}
-        for rule in rule_set.rules:
-            rules_by_obligation.setdefault(rule.obligation_type_id, []).append(rule)
+        With `allow_tenant_profiles` any profile of the tenant may be
+        evaluated (accountants evaluating their clients); each evaluation is
+        recorded under the profile owner.
+        """
+        outcome = BatchEvaluationOutcome()
+        profile_ids = list(dict.fromkeys(tax_profile_ids))
 
-        # 7. Run the engine
-        engine = RulesEngine(thresholds=thresholds, fiscal_year=fiscal_year.year)
-        results = engine.evaluate(profile, rule_set, obligations, rules_by_obligation)
+        profiles = {
+            p.id: p for p in await self._profile_repo.get_many(profile_ids, tenant_id)
+        }
+        contexts: dict[UUID, EvaluationContext | str] = {}
+        pending: dict[UUID, list[TaxProfileEntity]] = {}
 
-        # 8. Enrich results with periodicity
-        periodicities = await self._load_periodicities(fiscal_year.id)
-        for result in results:
-            key = result.obligation_type_id
-            if key in periodicities:
-                result.periodicity = periodicities[key]
+        for profile_id in profile_ids:
+            profile = profiles.get(profile_id)
+            if not profile:
+                outcome.errors[profile_id] = "Tax profile not found"
+                continue
+            if profile.user_id != user_id and not allow_tenant_profiles:
+                outcome.errors[profile_id] = "Profile does not belong to user"
+                continue
+
+            if profile.fiscal_year_id not in contexts:
+                try:
+                    contexts[profile.fiscal_year_id] = await self._load_context(
+                        profile.fiscal_year_id
+                    )
+                except ValueError as e:
+                    contexts[profile.fiscal_year_id] = str(e)
+            context = contexts[profile.fiscal_year_id]
+            if isinstance(context, str):
+                outcome.errors[profile_id] = context
+                continue
+            pending.setdefault(profile.fiscal_year_id, []).append(profile)
+
+        # One engine run per fiscal year, which the executor may offload
+        engine_outcomes: dict[UUID, list[EvaluationResultEntity] | str] = {}
+        for fiscal_year_id, fy_profiles in pending.items():
+            results = await self._executor.evaluate(contexts[fiscal_year_id], fy_profiles)
+            engine_outcomes.update(zip((p.id for p in fy_profiles), results))
+
+        for profile_id in profile_ids:
+            results = engine_outcomes.get(profile_id)
+            if results is None:
+                continue
+            if isinstance(results, str):
+                outcome.errors[profile_id] = results
+                continue
+            profile = profiles[profile_id]
+            outcome.evaluations.append(
+                self._build_evaluation(
+                    profile, contexts[profile.fiscal_year_id], results, profile.user_id, tenant_id
+                )
+            )
+
+        await self._evaluation_repo.create_many(outcome.evaluations)
+        await self._generate_calendars(
+            [(e, profiles[e.tax_profile_id].nit_last_digit) for e in outcome.evaluations]
+        )
+        return outcome
+
+    async def get_evaluation(
+        self,
+        evaluation_id: UUID,
+        tenant_id: UUID,
+        detail: EvaluationDetail = EvaluationDetail.FULL,
+    ) -> EvaluationEntity | None:
+        return await self._evaluation_repo.get_by_id(evaluation_id, tenant_id, detail)
+
+    async def list_evaluations(
+        self,
+        user_id: UUID,
+        tenant_id: UUID,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[EvaluationSummaryEntity]:
+        return await self._evaluation_repo.list_summaries(user_id, tenant_id, limit, after)
+
+    async def _reuse_evaluation(
+        self,
+        previous: EvaluationEntity,
+        profile: TaxProfileEntity,
+        context: EvaluationContext,
+    ) -> EvaluationEntity:
+        obligations = {o.id: o for o in context.obligations}
+        for result in previous.results:
+            obligation = obligations.get(result.obligation_type_id)
+            if obligation:
+                result.obligation_code = obligation.code
+                result.obligation_name = obligation.name
+
+        if settings.EVALUATION_MEMO_POLICY == "dedupe":
+            return previous
 
-        # 9. Create evaluation record
         evaluation = EvaluationEntity(
             id=uuid.uuid4(),
-            user_id=user_id,
-            tenant_id=tenant_id,
-            tax_profile_id=tax_profile_id,
-            rule_set_id=rule_set.id,
-            fiscal_year_id=fiscal_year.id,
+            user_id=previous.user_id,
+            tenant_id=previous.tenant_id,
+            tax_profile_id=profile.id,
+            rule_set_id=context.rule_set.id,
+            fiscal_year_id=context.fiscal_year.id,
             status="completed",
             evaluated_at=datetime.now(timezone.utc),
             profile_snapshot=profile.to_snapshot(),
-            results=results,
+            results=previous.results,
+            input_hash=previous.input_hash,
         )
-
-        await self._evaluation_repo.create(evaluation)
+        await self._evaluation_repo.create_from(evaluation, previous.id)
         return evaluation
 
-    async def get_evaluation(
-        self, evaluation_id: UUID, tenant_id: UUID
-    ) -> EvaluationEntity | None:
-        return await self._evaluation_repo.get_by_id(evaluation_id, tenant_id)
-
-    async def list_evaluations(
-        self, user_id: UUID, tenant_id: UUID
-    ) -> list[EvaluationEntity]:
-        return await self._evaluation_repo.list_by_user(user_id, tenant_id)
-
-    async def _load_obligations(self) -> list[ObligationTypeEntity]:
-        result = await self._db.execute(
-            select(ObligationType)
-            .where(ObligationType.is_active.is_(True))
-            .order_by(ObligationType.display_order)
+    async def _evaluate_changes(
+        self,
+        previous_profile: TaxProfileEntity,
+        profile: TaxProfileEntity,
+        context: EvaluationContext,
+        tenant_id: UUID,
+    ) -> list[EvaluationResultEntity] | str | None:
+        """Results recomputed only where needed, or None without a usable previous evaluation."""
+        # Matching the input hash proves the previous evaluation saw exactly the
+        # previous profile under the current rule set and thresholds. Copied
+        # results keep their stored traces, so these are not expanded.
+        previous = await self._evaluation_repo.get_latest_by_input_hash(
+            profile.id, context.input_hash(previous_profile), tenant_id, expand_traces=False
         )
+        if previous is None:
+            return None
+
+        stale = context.plan.obligations_reading(previous_profile.changed_fields(profile))
+        kept = {r.obligation_type_id: r for r in previous.results}
+        recompute = [o for o in context.obligations if o.id in stale or o.id not in kept]
+        fresh: dict[UUID, EvaluationResultEntity] = {}
+        if recompute:
+            [outcome] = await self._executor.evaluate(context, [profile], recompute)
+            if isinstance(outcome, str):
+                return outcome
+            fresh = {r.obligation_type_id: r for r in outcome}
+
         return [
-            ObligationTypeEntity(
-                id=o.id,
-                code=o.code,
-                name=o.name,
-                category=o.category,
-                description=o.description,
-                responsible_entity=o.responsible_entity,
-                legal_base=o.legal_base,
-                is_active=o.is_active,
-                display_order=o.display_order,
-            )
-            for o in result.scalars().all()
+            fresh.get(o.id)
+            or replace(kept[o.id], obligation_code=o.code, obligation_name=o.name)
+            for o in context.obligations
         ]
 
-    async def _load_periodicities(self, fiscal_year_id: UUID) -> dict[UUID, str]:
-        result = await self._db.execute(
-            select(ObligationPeriodicity).where(
-                ObligationPeriodicity.fiscal_year_id == fiscal_year_id
-            )
+    async def _generate_calendars(
+        self, evaluations: list[tuple[EvaluationEntity, int | None]]
+    ) -> None:
+        if self._calendar_service is not None and evaluations:
+            await self._calendar_service.generate_calendars(evaluations)
+
+    @staticmethod
+    def _build_evaluation(
+        profile: TaxProfileEntity,
+        context: EvaluationContext,
+        results: list[EvaluationResultEntity],
+        user_id: UUID,
+        tenant_id: UUID,
+    ) -> EvaluationEntity:
+        # Enrich results with periodicity
+        for result in results:
+            key = result.obligation_type_id
+            if key in context.periodicities:
+                result.periodicity = context.periodicities[key]
+
+        return EvaluationEntity(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            tenant_id=tenant_id,
+            tax_profile_id=profile.id,
+            rule_set_id=context.rule_set.id,
+            fiscal_year_id=context.fiscal_year.id,
+            status="completed",
+            evaluated_at=datetime.now(timezone.utc),
+            profile_snapshot=profile.to_snapshot(),
+            results=results,
+            input_hash=context.input_hash(profile),
         )
-        return {
-            p.obligation_type_id: p.frequency
-            for p in result.scalars().all()
-        }
+
+    async def _load_context(self, fiscal_year_id: UUID) -> EvaluationContext:
+        context = context_cache.get(fiscal_year_id)
+        if context is not None:
+            return context
+
+        generation = reference_cache.local_generation(fiscal_year_id)
+        version = await reference_cache.version(fiscal_year_id)
+        data = await reference_cache.get(fiscal_year_id, version)
+        if data is not None:
+            context = EvaluationContext.from_reference(data)
+        else:
+            context = await self._context_loader.load(fiscal_year_id)
+            await reference_cache.set(fiscal_year_id, version, context.to_reference())
+        # Dropped while loading: what was read may predate the change
+        if reference_cache.local_generation(fiscal_year_id) == generation:
+            context_cache.set(fiscal_year_id, context)
+        return context
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 import uuid
+from dataclasses import replace
 from decimal import Decimal
 from uuid import UUID
 
+from app.application.evaluation_service import EvaluationService
+from app.domain.entities.evaluation import EvaluationEntity
 from app.domain.entities.tax_profile import TaxProfileEntity
 from app.domain.interfaces.profile_repository import ProfileRepository
 
 
 class ProfileService:
-    def __init__(self, profile_repo: ProfileRepository) -> None:
+    def __init__(
+        self,
+        profile_repo: ProfileRepository,
+        evaluation_service: EvaluationService | None = None,
+    ) -> None:
         self._repo = profile_repo
+        self._evaluation_service = evaluation_service
 
     async def create_profile(
         self,
@@ -56,9 +64,42 @@ class ProfileService:
         tenant_id: UUID,
         data: dict,
     ) -> TaxProfileEntity:
+        change = await self._apply_update(profile_id, tenant_id, data)
+        if change is None:
+            raise ValueError("Profile not found")
+        return change[1]
+
+    async def update_and_evaluate(
+        self,
+        profile_id: UUID,
+        tenant_id: UUID,
+        data: dict,
+    ) -> tuple[TaxProfileEntity, EvaluationEntity] | None:
+        """
+        Update a profile and evaluate it right away, recorded under the
+        profile owner. Only obligations affected by the changed fields are
+        recomputed when the previous version has a current evaluation.
+        Returns None if the profile does not exist.
+        """
+        if self._evaluation_service is None:
+            raise RuntimeError("ProfileService needs an EvaluationService to evaluate")
+        change = await self._apply_update(profile_id, tenant_id, data)
+        if change is None:
+            return None
+        previous, updated = change
+        evaluation = await self._evaluation_service.evaluate(
+            updated.id, updated.user_id, tenant_id, previous_profile=previous
+        )
+        return updated, evaluation
+
+    async def _apply_update(
+        self, profile_id: UUID, tenant_id: UUID, data: dict
+    ) -> tuple[TaxProfileEntity, TaxProfileEntity] | None:
+        """The profile before and after the update."""
         existing = await self._repo.get_by_id(profile_id, tenant_id)
         if not existing:
-            raise ValueError("Profile not found")
+            return None
+        previous = replace(existing)
 
         for field, value in data.items():
             if hasattr(existing, field) and value is not None:
@@ -66,7 +107,7 @@ class ProfileService:
                     value = Decimal(str(value))
                 setattr(existing, field, value)
 
-        return await self._repo.update(existing)
+        return previous, await self._repo.update(existing)
 
     async def delete_profile(self, profile_id: UUID, tenant_id: UUID) -> bool:
         return await self._repo.delete(profile_id, tenant_id)
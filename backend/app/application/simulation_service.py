@@ -0,0 +1,181 @@
+"""Simulation service - impact of proposed thresholds or a draft rule set on stored profiles."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from uuid import UUID
+
+import numpy as np
+
+from app.config import settings
+from app.domain.engine.compiler import CompiledRuleSet, RuleSetCompiler
+from app.domain.engine.vectorized import ProfileColumns, VectorizedRulesEngine
+from app.domain.entities.obligation import ObligationTypeEntity
+from app.domain.entities.tax_profile import TaxProfileEntity
+from app.domain.interfaces.profile_repository import ProfileRepository
+from app.domain.interfaces.rule_repository import RuleRepository
+from app.domain.interfaces.threshold_repository import ThresholdRepository
+from app.infrastructure.repositories.pg_evaluation_context_loader import PgEvaluationContextLoader
+
+
+@dataclass
+class ProposedThreshold:
+    code: str
+    value_uvt: Decimal | None = None
+    value_cop: Decimal | None = None
+
+
+@dataclass
+class ObligationImpact:
+    obligation: ObligationTypeEntity
+    changed: int = 0
+    before: Counter = field(default_factory=Counter)
+    after: Counter = field(default_factory=Counter)
+    transitions: Counter = field(default_factory=Counter)
+
+    def add(self, before: np.ndarray, after: np.ndarray) -> np.ndarray:
+        """Accumulate one batch of results; returns the mask of changed profiles."""
+        changed = before != after
+        self.changed += int(changed.sum())
+        self.before.update(before.tolist())
+        self.after.update(after.tolist())
+        self.transitions.update(zip(before[changed].tolist(), after[changed].tolist()))
+        return changed
+
+    def to_dict(self) -> dict:
+        return {
+            "obligation_type_id": str(self.obligation.id),
+            "obligation_code": self.obligation.code,
+            "obligation_name": self.obligation.name,
+            "changed": self.changed,
+            "before": dict(self.before),
+            "after": dict(self.after),
+            "transitions": [
+                {"from": old, "to": new, "count": count}
+                for (old, new), count in self.transitions.most_common()
+            ],
+        }
+
+
+@dataclass
+class SimulationReport:
+    fiscal_year_id: UUID
+    rule_set_id: UUID
+    proposed_rule_set_id: UUID
+    thresholds: dict[str, Decimal]
+    obligations: list[ObligationImpact]
+    profiles_evaluated: int = 0
+    profiles_changed: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "fiscal_year_id": str(self.fiscal_year_id),
+            "rule_set_id": str(self.rule_set_id),
+            "proposed_rule_set_id": str(self.proposed_rule_set_id),
+            "thresholds": {code: float(value) for code, value in self.thresholds.items()},
+            "profiles_evaluated": self.profiles_evaluated,
+            "profiles_changed": self.profiles_changed,
+            "obligations": [o.to_dict() for o in self.obligations],
+        }
+
+
+class SimulationService:
+    """
+    Re-evaluates every profile of a fiscal year in the tenant under the
+    current reference data and under a proposal, and counts the outcomes
+    that change. Profiles are streamed in batches and each batch is decided
+    by the vectorized engine for both plans over the same columns. Nothing
+    is persisted.
+    """
+
+    def __init__(
+        self,
+        profile_repo: ProfileRepository,
+        rule_repo: RuleRepository,
+        threshold_repo: ThresholdRepository,
+        context_loader: PgEvaluationContextLoader,
+    ) -> None:
+        self._profile_repo = profile_repo
+        self._rule_repo = rule_repo
+        self._threshold_repo = threshold_repo
+        self._context_loader = context_loader
+
+    async def simulate(
+        self,
+        fiscal_year_id: UUID,
+        tenant_id: UUID,
+        thresholds: list[ProposedThreshold] | None = None,
+        rule_set_id: UUID | None = None,
+        uvt_value: Decimal | None = None,
+        batch_size: int | None = None,
+    ) -> SimulationReport:
+        """
+        `thresholds` override or add threshold values; UVT amounts are
+        converted with `uvt_value`, or the fiscal year's UVT when not given.
+        With `uvt_value`, stored thresholds set in UVT are re-derived from it
+        unless a proposal overrides them, and `uvt_expr` conditions use it.
+        `rule_set_id` replaces the active rule set with a draft of the same
+        fiscal year.
+        """
+        context = await self._context_loader.load(fiscal_year_id)
+
+        rule_set = context.rule_set
+        if rule_set_id is not None:
+            rule_set = await self._rule_repo.get_rule_set_by_id(rule_set_id)
+            if rule_set is None or rule_set.fiscal_year_id != fiscal_year_id:
+                raise ValueError("Rule set not found for this fiscal year")
+
+        uvt = uvt_value if uvt_value is not None else context.fiscal_year.uvt_value
+        proposed = dict(context.thresholds)
+        if uvt_value is not None:
+            amounts = await self._threshold_repo.get_uvt_amounts(fiscal_year_id)
+            proposed.update({code: amount * uvt for code, amount in amounts.items()})
+        proposed["uvt_value"] = uvt
+        for threshold in thresholds or []:
+            if threshold.value_cop is not None:
+                proposed[threshold.code] = threshold.value_cop
+            elif threshold.value_uvt is not None:
+                proposed[threshold.code] = threshold.value_uvt * uvt
+            else:
+                raise ValueError(f"Threshold {threshold.code} needs value_cop or value_uvt")
+
+        engine = VectorizedRulesEngine(context.thresholds, context.fiscal_year.year)
+        proposed_plan = RuleSetCompiler(proposed).compile(rule_set)
+        report = SimulationReport(
+            fiscal_year_id=fiscal_year_id,
+            rule_set_id=context.rule_set.id,
+            proposed_rule_set_id=rule_set.id,
+            thresholds=proposed,
+            obligations=[ObligationImpact(o) for o in context.obligations],
+        )
+
+        batches = self._profile_repo.stream_by_fiscal_year(
+            fiscal_year_id, tenant_id, batch_size or settings.SIMULATION_BATCH_SIZE
+        )
+        async for profiles in batches:
+            # NumPy work runs on a thread so the event loop keeps serving
+            await asyncio.to_thread(
+                self._compare, engine, context.plan, proposed_plan, profiles, report
+            )
+        return report
+
+    @staticmethod
+    def _compare(
+        engine: VectorizedRulesEngine,
+        plan: CompiledRuleSet,
+        proposed_plan: CompiledRuleSet,
+        profiles: list[TaxProfileEntity],
+        report: SimulationReport,
+    ) -> None:
+        columns = ProfileColumns(profiles)
+        obligations = [impact.obligation for impact in report.obligations]
+        before = engine.decide(columns, plan, obligations)
+        after = engine.decide(columns, proposed_plan, obligations)
+
+        changed = np.zeros(columns.size, dtype=bool)
+        for impact, old, new in zip(report.obligations, before, after):
+            changed |= impact.add(old.results(), new.results())
+        report.profiles_evaluated += columns.size
+        report.profiles_changed += int(changed.sum())
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
@@ -25,6 +27,41 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_MINUTE: int = 100
     EVALUATION_RATE_LIMIT_PER_MINUTE: int = 10
 
+    EVALUATION_CONTEXT_CACHE_TTL_SECONDS: int = 300
+    EVALUATION_CONTEXT_CACHE_MAX_ENTRIES: int = 16
+    REFERENCE_CACHE_TTL_SECONDS: int = 3600
+    REFERENCE_CACHE_CHANNEL: str = "refdata:invalidate"
+    DEADLINE_CACHE_TTL_SECONDS: int = 3600
+    DEADLINE_CACHE_MAX_ENTRIES: int = 16
+    CALENDAR_MAX_PAGE_SIZE: int = 200
+    # iCalendar subscription feeds (GET /calendar/feed.ics)
+    CALENDAR_FEED_TOKEN_EXPIRE_DAYS: int = 365
+    CALENDAR_FEED_CACHE_TTL_SECONDS: int = 86400
+    CALENDAR_FEED_CACHE_MAX_ENTRIES: int = 1024
+    EVALUATION_BATCH_MAX_PROFILES: int = 500
+    EVALUATION_COPY_MIN_ROWS: int = 1000
+    EVALUATION_HISTORY_MAX_PAGE_SIZE: int = 200
+    # Threshold what-if simulations (POST /admin/fiscal-years/{id}/simulations)
+    SIMULATION_BATCH_SIZE: int = 5000
+    # Reuse of results for unchanged profiles: "persist" records a new evaluation
+    # with copied results, "dedupe" returns the previous evaluation, "off" always re-runs.
+    EVALUATION_MEMO_POLICY: Literal["persist", "dedupe", "off"] = "persist"
+    # Evaluate profiles on every update (PUT /profiles/{id}); ?evaluate= overrides it
+    PROFILE_AUTO_EVALUATE: bool = False
+    # Where rule evaluation runs. "auto" picks by estimated work (profiles x plan
+    # conditions): inline below the thread threshold, worker processes above the
+    # process threshold, a thread in between.
+    ENGINE_EXECUTOR: Literal["auto", "inline", "thread", "process"] = "auto"
+    ENGINE_THREAD_MIN_WORK: int = 1000
+    ENGINE_PROCESS_MIN_WORK: int = 20000
+    ENGINE_PROCESS_WORKERS: int = 2
+    # Asynchronous evaluations (POST /evaluations?mode=async). Workers run in the
+    # API process; set to 0 when they run as a separate process instead.
+    EVALUATION_WORKERS: int = 2
+    EVALUATION_JOB_POLL_SECONDS: float = 0.5
+    EVALUATION_JOB_STALE_SECONDS: int = 300
+    EVALUATION_JOB_MAX_ATTEMPTS: int = 3
+
     model_config = {"env_file": ".env", "case_sensitive": True}
 
     @property
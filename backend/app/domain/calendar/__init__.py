@@ -0,0 +1,3 @@
+from app.domain.calendar.deadlines import Deadline, DeadlineSchedule, DeadlineTable
+
+__all__ = ["Deadline", "DeadlineSchedule", "DeadlineTable"]
@@ -0,0 +1,100 @@
+"""
+Deadline table - due dates of a fiscal year per obligation and NIT last digit.
+
+Due dates come from the `nit_schedule` of each obligation periodicity:
+
+    {"periods": [
+        {"label": "Enero", "due": {"1": "2025-02-11", "2": "2025-02-12", ..., "0": "2025-02-24"}},
+        {"label": "Febrero", "due": {"default": "2025-03-14"}},
+    ]}
+
+`due` maps the last digit of the NIT to the due date of the period. A
+"default" date applies to digits that are not listed, and is the only key
+for obligations whose deadline does not depend on the NIT.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from uuid import UUID
+
+NIT_DIGITS = tuple(range(10))
+
+
+@dataclass(frozen=True)
+class DeadlineSchedule:
+    obligation_type_id: UUID
+    obligation_code: str
+    frequency: str
+    nit_schedule: dict | None = None
+
+
+@dataclass(frozen=True)
+class Deadline:
+    obligation_type_id: UUID
+    obligation_code: str
+    frequency: str
+    period: str
+    due_date: date
+
+
+def _period_deadlines(schedule: DeadlineSchedule, period: dict) -> dict[int | None, Deadline]:
+    due = {key: date.fromisoformat(value) for key, value in period.get("due", {}).items()}
+
+    def deadline(due_date: date) -> Deadline:
+        return Deadline(
+            schedule.obligation_type_id,
+            schedule.obligation_code,
+            schedule.frequency,
+            period["label"],
+            due_date,
+        )
+
+    by_digit: dict[int | None, Deadline] = {}
+    for digit in NIT_DIGITS:
+        due_date = due.get(str(digit), due.get("default"))
+        if due_date is not None:
+            by_digit[digit] = deadline(due_date)
+    if due:
+        # Without a NIT the earliest date of the period is the one that cannot be missed
+        by_digit[None] = deadline(min(due.values()))
+    return by_digit
+
+
+class DeadlineTable:
+    """
+    All due dates of a fiscal year, expanded once for every NIT last digit so
+    that the deadlines of a digit, or of an obligation for a digit, are a
+    dictionary lookup.
+    """
+
+    def __init__(self, fiscal_year_id: UUID, deadlines: dict[int | None, list[Deadline]]):
+        self.fiscal_year_id = fiscal_year_id
+        self._by_digit = deadlines
+        self._by_obligation: dict[tuple[UUID, int | None], list[Deadline]] = {}
+        for digit, digit_deadlines in deadlines.items():
+            for deadline in digit_deadlines:
+                self._by_obligation.setdefault(
+                    (deadline.obligation_type_id, digit), []
+                ).append(deadline)
+
+    @classmethod
+    def build(cls, fiscal_year_id: UUID, schedules: list[DeadlineSchedule]) -> DeadlineTable:
+        """Obligations without a NIT schedule have no deadlines."""
+        deadlines: dict[int | None, list[Deadline]] = {}
+        for schedule in schedules:
+            for period in (schedule.nit_schedule or {}).get("periods", []):
+                for digit, deadline in _period_deadlines(schedule, period).items():
+                    deadlines.setdefault(digit, []).append(deadline)
+        for digit_deadlines in deadlines.values():
+            digit_deadlines.sort(key=lambda d: (d.due_date, d.obligation_code))
+        return cls(fiscal_year_id, deadlines)
+
+    def for_nit_digit(self, nit_last_digit: int | None) -> list[Deadline]:
+        """Every deadline of the fiscal year for a NIT last digit, by due date."""
+        return self._by_digit.get(nit_last_digit, [])
+
+    def for_obligation(
+        self, obligation_type_id: UUID, nit_last_digit: int | None
+    ) -> list[Deadline]:
+        return self._by_obligation.get((obligation_type_id, nit_last_digit), [])
@@ -1,3 +1,4 @@
+from app.domain.engine.compiler import CompiledRuleSet, RuleSetCompiler, compile_rule_set
 from app.domain.engine.engine import RulesEngine
 
-__all__ = ["RulesEngine"]
+__all__ = ["CompiledRuleSet", "RuleSetCompiler", "RulesEngine", "compile_rule_set"]
@@ -0,0 +1,195 @@
+"""Rule set compiler - turns a rule set plus thresholds into a reusable evaluation plan."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import cached_property, partial
+from uuid import UUID
+
+from app.domain.engine.evaluator import ConditionResult, RuleEvaluation
+from app.domain.engine.operators import bind_operator
+from app.domain.engine.resolver import ThresholdResolver
+from app.domain.entities.rule import RuleConditionEntity, RuleEntity, RuleSetEntity
+from app.domain.entities.tax_profile import TaxProfileEntity
+from app.domain.value_objects.condition_trace import threshold_code_of
+
+
+def _serialize_value(value: object) -> object:
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _raise_deferred(error: Exception, profile_value: object) -> bool:
+    raise type(error)(*error.args)
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A rule condition with its threshold resolved and its operator bound."""
+
+    condition: RuleConditionEntity
+    resolved_value: object
+    resolved_secondary: object
+    threshold_code: str | None
+    threshold_value: object
+    predicate: Callable[[object], bool] = field(repr=False, compare=False)
+
+    def test(self, profile: TaxProfileEntity) -> tuple[object, bool]:
+        profile_value = profile.get_field_value(self.condition.field)
+        return profile_value, self.predicate(profile_value)
+
+    def to_result(self, profile_value: object, passes: bool) -> ConditionResult:
+        return ConditionResult(
+            field=self.condition.field,
+            operator=self.condition.operator,
+            profile_value=_serialize_value(profile_value),
+            threshold_code=self.threshold_code,
+            threshold_value=self.threshold_value,
+            passes=passes,
+            description=self.condition.description,
+        )
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule: RuleEntity
+    requires_all: bool
+    conditions: tuple[CompiledCondition, ...]
+
+    def test(self, profile: TaxProfileEntity) -> tuple[bool, list[tuple[object, bool]]]:
+        """Check every condition; returns the rule outcome and the (profile_value, passes) pairs."""
+        checks = [compiled.test(profile) for compiled in self.conditions]
+        if self.requires_all:
+            passes = all(ok for _, ok in checks)
+        else:
+            passes = any(ok for _, ok in checks)
+        return passes, checks
+
+    def to_evaluation(
+        self, passes: bool, checks: list[tuple[object, bool]]
+    ) -> RuleEvaluation:
+        return RuleEvaluation(
+            rule=self.rule,
+            passes=passes,
+            condition_results=[
+                compiled.to_result(profile_value, ok)
+                for compiled, (profile_value, ok) in zip(self.conditions, checks)
+            ],
+        )
+
+    def evaluate(self, profile: TaxProfileEntity) -> RuleEvaluation:
+        return self.to_evaluation(*self.test(profile))
+
+
+@dataclass(frozen=True)
+class CompiledRuleSet:
+    """
+    Immutable evaluation plan for one rule set version and thresholds map.
+
+    Rules are grouped by obligation, filtered to active ones and sorted by
+    priority, so the plan can be evaluated against many profiles without
+    re-resolving thresholds or re-binding operators.
+    """
+
+    rule_set_id: UUID | None
+    version: int | None
+    rules_by_obligation: dict[UUID, tuple[CompiledRule, ...]]
+
+    def rules_for(self, obligation_type_id: UUID) -> tuple[CompiledRule, ...]:
+        return self.rules_by_obligation.get(obligation_type_id, ())
+
+    @cached_property
+    def condition_count(self) -> int:
+        """Conditions checked when every rule falls through; a bound on per-profile work."""
+        return sum(
+            len(rule.conditions) for rules in self.rules_by_obligation.values() for rule in rules
+        )
+
+    @cached_property
+    def field_dependencies(self) -> dict[str, frozenset[UUID]]:
+        """Profile field -> obligations with at least one active rule that reads it."""
+        dependencies: dict[str, set[UUID]] = {}
+        for obligation_type_id, rules in self.rules_by_obligation.items():
+            for rule in rules:
+                for compiled in rule.conditions:
+                    dependencies.setdefault(compiled.condition.field, set()).add(obligation_type_id)
+        return {name: frozenset(ids) for name, ids in dependencies.items()}
+
+    def obligations_reading(self, fields: Iterable[str]) -> set[UUID]:
+        """Obligations whose outcome may change when any of `fields` changes."""
+        affected: set[UUID] = set()
+        for name in fields:
+            affected |= self.field_dependencies.get(name, frozenset())
+        return affected
+
+
+class RuleSetCompiler:
+    """Compiles rule sets against a fixed thresholds map."""
+
+    def __init__(self, thresholds: dict[str, Decimal]) -> None:
+        self._resolver = ThresholdResolver(thresholds)
+
+    def compile(
+        self,
+        rule_set: RuleSetEntity,
+        rules_by_obligation: dict[UUID, list[RuleEntity]] | None = None,
+    ) -> CompiledRuleSet:
+        if rules_by_obligation is None:
+            rules_by_obligation = {}
+            for rule in rule_set.rules:
+                rules_by_obligation.setdefault(rule.obligation_type_id, []).append(rule)
+
+        compiled: dict[UUID, tuple[CompiledRule, ...]] = {}
+        for obligation_type_id, rules in rules_by_obligation.items():
+            compiled[obligation_type_id] = tuple(
+                self.compile_rule(rule)
+                for rule in sorted(rules, key=lambda r: r.priority)
+                if rule.is_active
+            )
+
+        return CompiledRuleSet(
+            rule_set_id=rule_set.id,
+            version=rule_set.version,
+            rules_by_obligation=compiled,
+        )
+
+    def compile_rule(self, rule: RuleEntity) -> CompiledRule:
+        return CompiledRule(
+            rule=rule,
+            requires_all=rule.logic_operator.upper() == "AND",
+            conditions=tuple(self.compile_condition(c) for c in rule.conditions),
+        )
+
+    def compile_condition(self, condition: RuleConditionEntity) -> CompiledCondition:
+        threshold_code = threshold_code_of(condition)
+        # Resolution and binding errors are deferred to evaluation time so a
+        # broken rule only fails the evaluations that actually reach it.
+        try:
+            resolved_value, resolved_secondary = self._resolver.resolve(condition)
+            predicate = bind_operator(condition.operator, resolved_value, resolved_secondary)
+        except (ValueError, ArithmeticError) as e:
+            return CompiledCondition(
+                condition=condition,
+                resolved_value=None,
+                resolved_secondary=None,
+                threshold_code=threshold_code,
+                threshold_value=None,
+                predicate=partial(_raise_deferred, e),
+            )
+
+        return CompiledCondition(
+            condition=condition,
+            resolved_value=resolved_value,
+            resolved_secondary=resolved_secondary,
+            threshold_code=threshold_code,
+            threshold_value=_serialize_value(resolved_value),
+            predicate=predicate,
+        )
+
+
+def compile_rule_set(
+    rule_set: RuleSetEntity, thresholds: dict[str, Decimal]
+) -> CompiledRuleSet:
+    return RuleSetCompiler(thresholds).compile(rule_set)
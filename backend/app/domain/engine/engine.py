@@ -1,16 +1,18 @@
 """Core rules engine - orchestrates the evaluation of tax profiles against rules."""
 from __future__ import annotations
 
+from collections.abc import Sequence
 from decimal import Decimal
 from uuid import UUID
 
-from app.domain.engine.evaluator import RuleEvaluator
+from app.domain.engine.compiler import CompiledRule, CompiledRuleSet, RuleSetCompiler
+from app.domain.engine.evaluator import RuleEvaluation
 from app.domain.engine.explainer import ExplanationBuilder
-from app.domain.engine.resolver import ThresholdResolver
 from app.domain.entities.evaluation import EvaluationResultEntity
 from app.domain.entities.obligation import ObligationTypeEntity
 from app.domain.entities.rule import RuleEntity, RuleSetEntity
 from app.domain.entities.tax_profile import TaxProfileEntity
+from app.domain.value_objects.condition_trace import ConditionTrace
 from app.domain.value_objects.evaluation_result import ObligationResult
 
 
@@ -25,10 +27,13 @@ class RulesEngine:
         thresholds: dict[str, Decimal],
         fiscal_year: int,
     ) -> None:
-        self._resolver = ThresholdResolver(thresholds)
-        self._evaluator = RuleEvaluator(self._resolver)
+        self._compiler = RuleSetCompiler(thresholds)
         self._explainer = ExplanationBuilder(fiscal_year)
 
+    def compile(self, rule_set: RuleSetEntity) -> CompiledRuleSet:
+        """Compile a rule set once so it can be evaluated against many profiles."""
+        return self._compiler.compile(rule_set)
+
     def evaluate(
         self,
         profile: TaxProfileEntity,
@@ -36,58 +41,56 @@ class RulesEngine:
         obligations: list[ObligationTypeEntity],
         rules_by_obligation: dict[UUID, list[RuleEntity]],
     ) -> list[EvaluationResultEntity]:
-        results: list[EvaluationResultEntity] = []
-
-        for obligation in obligations:
-            rules = rules_by_obligation.get(obligation.id, [])
-            rules_sorted = sorted(rules, key=lambda r: r.priority)
-
-            result = self._evaluate_obligation(profile, obligation, rules_sorted)
-            results.append(result)
+        plan = self._compiler.compile(rule_set, rules_by_obligation)
+        return self.evaluate_compiled(profile, plan, obligations)
 
-        return results
+    def evaluate_compiled(
+        self,
+        profile: TaxProfileEntity,
+        plan: CompiledRuleSet,
+        obligations: list[ObligationTypeEntity],
+    ) -> list[EvaluationResultEntity]:
+        return [
+            self._evaluate_obligation(profile, obligation, plan.rules_for(obligation.id))
+            for obligation in obligations
+        ]
 
     def _evaluate_obligation(
         self,
         profile: TaxProfileEntity,
         obligation: ObligationTypeEntity,
-        rules: list[RuleEntity],
+        rules: tuple[CompiledRule, ...],
     ) -> EvaluationResultEntity:
         obligation_result = ObligationResult.DOES_NOT_APPLY
-        triggered_rule: RuleEntity | None = None
-        all_conditions: list[dict] = []
-
-        for rule in rules:
-            if not rule.is_active:
-                continue
+        triggered: RuleEvaluation | None = None
+        trace = ConditionTrace()
 
-            evaluation = self._evaluator.evaluate_rule(rule, profile)
-            conditions_log = [
-                {
-                    "field": cr.field,
-                    "operator": cr.operator,
-                    "profile_value": cr.profile_value,
-                    "threshold_code": cr.threshold_code,
-                    "threshold_value": cr.threshold_value,
-                    "passes": cr.passes,
-                    "description": cr.description,
-                }
-                for cr in evaluation.condition_results
-            ]
-            all_conditions.extend(conditions_log)
+        for compiled_rule in rules:
+            passes, checks = compiled_rule.test(profile)
+            trace.extend(compiled_rule.conditions, checks)
 
-            if evaluation.passes:
-                obligation_result = ObligationResult(rule.result_if_true)
-                triggered_rule = rule
+            if passes:
+                obligation_result = ObligationResult(compiled_rule.rule.result_if_true)
+                # Only the triggered rule needs full condition results (for the explanation)
+                triggered = compiled_rule.to_evaluation(passes, checks)
                 break
 
+        return self.build_result(obligation, obligation_result, triggered, trace)
+
+    def build_result(
+        self,
+        obligation: ObligationTypeEntity,
+        obligation_result: ObligationResult,
+        triggered: RuleEvaluation | None,
+        conditions_evaluated: Sequence[dict],
+    ) -> EvaluationResultEntity:
+        """Assemble the result entity, explanation and legal references for one obligation."""
+        triggered_rule = triggered.rule if triggered else None
         explanation = self._explainer.build(
             obligation,
             obligation_result.value,
             triggered_rule,
-            self._evaluator.evaluate_rule(triggered_rule, profile).condition_results
-            if triggered_rule
-            else [],
+            triggered.condition_results if triggered else [],
         )
 
         legal_refs = self._explainer.get_legal_references(obligation, triggered_rule)
@@ -100,7 +103,7 @@ class RulesEngine:
             periodicity=None,
             responsible_entity=obligation.responsible_entity,
             triggered_rule_id=triggered_rule.id if triggered_rule else None,
-            conditions_evaluated=all_conditions,
+            conditions_evaluated=conditions_evaluated,
             explanation_es=explanation,
             legal_references=legal_refs,
         )
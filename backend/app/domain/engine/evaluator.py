@@ -19,6 +19,17 @@ class ConditionResult:
     passes: bool
     description: str | None
 
+    def to_dict(self) -> dict:
+        return {
+            "field": self.field,
+            "operator": self.operator,
+            "profile_value": self.profile_value,
+            "threshold_code": self.threshold_code,
+            "threshold_value": self.threshold_value,
+            "passes": self.passes,
+            "description": self.description,
+        }
+
 
 @dataclass
 class RuleEvaluation:
@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable
 from decimal import Decimal, InvalidOperation
+from functools import partial
 
 
 def _to_decimal(value: object) -> Decimal | None:
@@ -109,7 +111,7 @@ def op_is_false(profile_value: object, threshold_value: object = None) -> bool:
     return str(profile_value).strip().lower() in ("false", "0", "no")
 
 
-OPERATORS: dict[str, callable] = {
+OPERATORS: dict[str, Callable[..., bool]] = {
     "gt": op_gt,
     "gte": op_gte,
     "lt": op_lt,
@@ -136,3 +138,106 @@ def apply_operator(
     if operator == "between":
         return op_func(profile_value, threshold_value, threshold_value_secondary)
     return op_func(profile_value, threshold_value)
+
+
+# --- Bound operators ---
+#
+# The functions below take their threshold arguments first so they can be
+# pre-bound with ``functools.partial`` when a rule set is compiled. Partials of
+# module-level functions stay picklable, which lets compiled plans cross
+# process boundaries.
+
+
+def _never(profile_value: object) -> bool:
+    return False
+
+
+def _bound_gt(threshold: Decimal, profile_value: object) -> bool:
+    pv = _to_decimal(profile_value)
+    return pv is not None and pv > threshold
+
+
+def _bound_gte(threshold: Decimal, profile_value: object) -> bool:
+    pv = _to_decimal(profile_value)
+    return pv is not None and pv >= threshold
+
+
+def _bound_lt(threshold: Decimal, profile_value: object) -> bool:
+    pv = _to_decimal(profile_value)
+    return pv is not None and pv < threshold
+
+
+def _bound_lte(threshold: Decimal, profile_value: object) -> bool:
+    pv = _to_decimal(profile_value)
+    return pv is not None and pv <= threshold
+
+
+def _bound_between(low: Decimal, high: Decimal, profile_value: object) -> bool:
+    pv = _to_decimal(profile_value)
+    return pv is not None and low <= pv <= high
+
+
+def _bound_eq(threshold: Decimal | None, threshold_text: str, profile_value: object) -> bool:
+    if threshold is not None:
+        pv = _to_decimal(profile_value)
+        if pv is not None:
+            return pv == threshold
+    return str(profile_value).strip().lower() == threshold_text
+
+
+def _bound_neq(threshold: Decimal | None, threshold_text: str, profile_value: object) -> bool:
+    return not _bound_eq(threshold, threshold_text, profile_value)
+
+
+def _bound_in(members: frozenset[str], profile_value: object) -> bool:
+    return str(profile_value).strip().lower() in members
+
+
+def _bound_not_in(members: frozenset[str], profile_value: object) -> bool:
+    return not _bound_in(members, profile_value)
+
+
+_ORDERING_OPERATORS: dict[str, Callable[[Decimal, object], bool]] = {
+    "gt": _bound_gt,
+    "gte": _bound_gte,
+    "lt": _bound_lt,
+    "lte": _bound_lte,
+}
+
+
+def bind_operator(
+    operator: str,
+    threshold_value: object,
+    threshold_value_secondary: object = None,
+) -> Callable[[object], bool]:
+    """
+    Pre-convert the threshold side of a condition and return a one-argument
+    predicate equivalent to ``apply_operator(operator, value, threshold, secondary)``.
+    """
+    if operator in _ORDERING_OPERATORS:
+        tv = _to_decimal(threshold_value)
+        if tv is None:
+            return _never
+        return partial(_ORDERING_OPERATORS[operator], tv)
+    if operator == "between":
+        low = _to_decimal(threshold_value)
+        high = _to_decimal(threshold_value_secondary)
+        if low is None or high is None:
+            return _never
+        return partial(_bound_between, low, high)
+    if operator in ("eq", "neq"):
+        bound = _bound_eq if operator == "eq" else _bound_neq
+        return partial(
+            bound,
+            _to_decimal(threshold_value),
+            str(threshold_value).strip().lower(),
+        )
+    if operator in ("in", "not_in"):
+        members = frozenset(str(v).strip().lower() for v in _to_list(threshold_value))
+        bound = _bound_in if operator == "in" else _bound_not_in
+        return partial(bound, members)
+    if operator == "is_true":
+        return op_is_true
+    if operator == "is_false":
+        return op_is_false
+    raise ValueError(f"Unknown operator: {operator}")
@@ -18,3 +18,10 @@ class CalendarEntryEntity:
     description: str | None = None
     is_completed: bool = False
     completed_at: datetime | None = None
+
+
+@dataclass
+class CalendarVersionEntity:
+    user_id: UUID
+    version: int = 0
+    updated_at: datetime | None = None
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from uuid import UUID
@@ -14,10 +16,12 @@ class EvaluationResultEntity:
     periodicity: str | None = None
     responsible_entity: str | None = None
     triggered_rule_id: UUID | None = None
-    conditions_evaluated: list[dict] = field(default_factory=list)
+    conditions_evaluated: Sequence[dict] = field(default_factory=list)
     explanation_es: str = ""
     legal_references: list[str] = field(default_factory=list)
     calendar_entries: list[dict] = field(default_factory=list)
+    # Stored packed trace, written back as is when the result is copied
+    packed_trace: bytes | None = field(default=None, repr=False, compare=False)
 
 
 @dataclass
@@ -32,17 +36,44 @@ class EvaluationEntity:
     evaluated_at: datetime
     profile_snapshot: dict
     results: list[EvaluationResultEntity] = field(default_factory=list)
+    input_hash: str | None = None
+    # Counters stored with the evaluation, set when it is read back from storage
+    result_counts: dict | None = None
 
     def summary(self) -> dict:
-        total = len(self.results)
-        applies = sum(1 for r in self.results if r.result == "applies")
-        does_not_apply = sum(1 for r in self.results if r.result == "does_not_apply")
-        conditional = sum(1 for r in self.results if r.result == "conditional")
-        needs_more_info = sum(1 for r in self.results if r.result == "needs_more_info")
+        if self.result_counts is not None:
+            return dict(self.result_counts)
+        counts = Counter(r.result for r in self.results)
         return {
-            "total_obligations_evaluated": total,
-            "applies": applies,
-            "does_not_apply": does_not_apply,
-            "conditional": conditional,
-            "needs_more_info": needs_more_info,
+            "total_obligations_evaluated": len(self.results),
+            "applies": counts["applies"],
+            "does_not_apply": counts["does_not_apply"],
+            "conditional": counts["conditional"],
+            "needs_more_info": counts["needs_more_info"],
+        }
+
+
+@dataclass
+class EvaluationSummaryEntity:
+    """An evaluation without its results, for history listings. Counts come
+    from the counters stored on the evaluation row."""
+
+    id: UUID
+    fiscal_year_id: UUID
+    status: str
+    evaluated_at: datetime
+    created_at: datetime
+    total_obligations_evaluated: int = 0
+    applies: int = 0
+    does_not_apply: int = 0
+    conditional: int = 0
+    needs_more_info: int = 0
+
+    def summary(self) -> dict:
+        return {
+            "total_obligations_evaluated": self.total_obligations_evaluated,
+            "applies": self.applies,
+            "does_not_apply": self.does_not_apply,
+            "conditional": self.conditional,
+            "needs_more_info": self.needs_more_info,
         }
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from app.domain.value_objects.job_status import JobStatus
+
+
+@dataclass
+class EvaluationJobEntity:
+    id: UUID
+    user_id: UUID
+    tenant_id: UUID
+    tax_profile_id: UUID
+    status: str = JobStatus.QUEUED.value
+    evaluation_id: UUID | None = None
+    error: str | None = None
+    attempts: int = 0
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value)
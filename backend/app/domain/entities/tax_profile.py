@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from decimal import Decimal
 from uuid import UUID
 
@@ -35,6 +35,19 @@ class TaxProfileEntity:
             return getattr(self, field_name)
         return self.additional_data.get(field_name)
 
+    def changed_fields(self, other: TaxProfileEntity) -> set[str]:
+        """Field names whose value differs in `other`, including additional_data keys."""
+        changed = {
+            f.name for f in fields(self) if getattr(self, f.name) != getattr(other, f.name)
+        }
+        if "additional_data" in changed:
+            keys = self.additional_data.keys() | other.additional_data.keys()
+            changed.update(
+                key for key in keys
+                if self.additional_data.get(key) != other.additional_data.get(key)
+            )
+        return changed
+
     def to_snapshot(self) -> dict:
         """Create an immutable snapshot of the profile for evaluation records."""
         return {
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from datetime import date
 from uuid import UUID
 
-from app.domain.entities.calendar_entry import CalendarEntryEntity
+from app.domain.entities.calendar_entry import CalendarEntryEntity, CalendarVersionEntity
 
 
 class CalendarRepository(ABC):
@@ -12,9 +13,32 @@ class CalendarRepository(ABC):
         ...
 
     @abstractmethod
-    async def list_by_user(self, user_id: UUID, tenant_id: UUID) -> list[CalendarEntryEntity]:
+    async def list_by_user(
+        self,
+        user_id: UUID,
+        tenant_id: UUID,
+        due_from: date | None = None,
+        due_to: date | None = None,
+        completed: bool | None = None,
+        obligation_type_ids: list[UUID] | None = None,
+        limit: int | None = None,
+        after: tuple[date, UUID] | None = None,
+    ) -> list[CalendarEntryEntity]:
+        """Entries by due date; `after` is the (due_date, id) of the previous page's last row."""
         ...
 
     @abstractmethod
     async def mark_completed(self, entry_id: UUID, tenant_id: UUID) -> CalendarEntryEntity | None:
         ...
+
+    @abstractmethod
+    async def set_completed(
+        self, entry_ids: list[UUID], tenant_id: UUID, is_completed: bool
+    ) -> list[CalendarEntryEntity]:
+        """Complete or reopen the tenant's entries among `entry_ids`; returns those updated."""
+        ...
+
+    @abstractmethod
+    async def get_version(self, user_id: UUID) -> CalendarVersionEntity:
+        """The user's calendar version; version 0 if the calendar never changed."""
+        ...
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from app.domain.calendar.deadlines import DeadlineTable
+
+
+class DeadlineRepository(ABC):
+    @abstractmethod
+    async def get_tables(self, fiscal_year_ids: list[UUID]) -> dict[UUID, DeadlineTable]:
+        """Returns the deadline table of each fiscal year that exists, by fiscal_year_id."""
+        ...
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from app.domain.entities.evaluation_job import EvaluationJobEntity
+
+
+class EvaluationJobRepository(ABC):
+    @abstractmethod
+    async def enqueue(self, job: EvaluationJobEntity) -> EvaluationJobEntity:
+        ...
+
+    @abstractmethod
+    async def get_by_id(
+        self, job_id: UUID, user_id: UUID, tenant_id: UUID
+    ) -> EvaluationJobEntity | None:
+        ...
+
+    @abstractmethod
+    async def claim_next(
+        self, stale_after_seconds: int, max_attempts: int
+    ) -> EvaluationJobEntity | None:
+        ...
+
+    @abstractmethod
+    async def fail_exhausted(self, stale_after_seconds: int, max_attempts: int) -> int:
+        ...
+
+    @abstractmethod
+    async def complete(self, job_id: UUID, evaluation_id: UUID) -> None:
+        ...
+
+    @abstractmethod
+    async def fail(self, job_id: UUID, error: str, retry: bool = False) -> None:
+        ...
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from uuid import UUID
 
-from app.domain.entities.evaluation import EvaluationEntity
+from app.domain.entities.evaluation import EvaluationEntity, EvaluationSummaryEntity
+from app.domain.value_objects.evaluation_detail import EvaluationDetail
 
 
 class EvaluationRepository(ABC):
@@ -12,9 +14,41 @@ class EvaluationRepository(ABC):
         ...
 
     @abstractmethod
-    async def get_by_id(self, evaluation_id: UUID, tenant_id: UUID) -> EvaluationEntity | None:
+    async def create_many(self, evaluations: list[EvaluationEntity]) -> list[EvaluationEntity]:
         ...
 
     @abstractmethod
-    async def list_by_user(self, user_id: UUID, tenant_id: UUID) -> list[EvaluationEntity]:
+    async def create_from(
+        self, evaluation: EvaluationEntity, source_evaluation_id: UUID
+    ) -> EvaluationEntity:
+        ...
+
+    @abstractmethod
+    async def get_latest_by_input_hash(
+        self,
+        tax_profile_id: UUID,
+        input_hash: str,
+        tenant_id: UUID,
+        detail: EvaluationDetail = EvaluationDetail.FULL,
+        expand_traces: bool = True,
+    ) -> EvaluationEntity | None:
+        ...
+
+    @abstractmethod
+    async def get_by_id(
+        self,
+        evaluation_id: UUID,
+        tenant_id: UUID,
+        detail: EvaluationDetail = EvaluationDetail.FULL,
+    ) -> EvaluationEntity | None:
+        ...
+
+    @abstractmethod
+    async def list_summaries(
+        self,
+        user_id: UUID,
+        tenant_id: UUID,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[EvaluationSummaryEntity]:
         ...
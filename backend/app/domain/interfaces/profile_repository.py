@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from uuid import UUID
 
 from app.domain.entities.tax_profile import TaxProfileEntity
@@ -15,10 +16,21 @@ class ProfileRepository(ABC):
     async def get_by_id(self, profile_id: UUID, tenant_id: UUID) -> TaxProfileEntity | None:
         ...
 
+    @abstractmethod
+    async def get_many(self, profile_ids: list[UUID], tenant_id: UUID) -> list[TaxProfileEntity]:
+        ...
+
     @abstractmethod
     async def list_by_user(self, user_id: UUID, tenant_id: UUID) -> list[TaxProfileEntity]:
         ...
 
+    @abstractmethod
+    def stream_by_fiscal_year(
+        self, fiscal_year_id: UUID, tenant_id: UUID, batch_size: int
+    ) -> AsyncIterator[list[TaxProfileEntity]]:
+        """Every profile of a fiscal year in the tenant, in batches of at most `batch_size`."""
+        ...
+
     @abstractmethod
     async def update(self, profile: TaxProfileEntity) -> TaxProfileEntity:
         ...
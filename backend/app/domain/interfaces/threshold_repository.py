@@ -17,3 +17,8 @@ class ThresholdRepository(ABC):
     ) -> dict | None:
         """Returns full threshold details including UVT value and legal reference."""
         ...
+
+    @abstractmethod
+    async def get_uvt_amounts(self, fiscal_year_id: UUID) -> dict[str, Decimal]:
+        """Returns a dict mapping threshold code -> value_uvt, for thresholds set in UVT."""
+        ...
@@ -0,0 +1,208 @@
+"""Condition traces: the audit log of an evaluation and its packed storage form."""
+from __future__ import annotations
+
+import json
+import struct
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, overload
+from uuid import UUID
+
+from app.domain.engine.evaluator import ConditionResult
+from app.domain.entities.rule import RuleConditionEntity
+
+if TYPE_CHECKING:
+    from app.domain.engine.compiler import CompiledCondition, CompiledRule
+
+PACKED_TRACE_VERSION = 1
+_HEADER = struct.Struct(">BH")
+
+
+def threshold_code_of(condition: RuleConditionEntity) -> str | None:
+    return condition.value if condition.value_type == "threshold_ref" else None
+
+
+class ConditionTrace(Sequence[dict]):
+    """
+    Compact log of the conditions checked for one obligation.
+
+    The engine records one (condition, profile value, passes) tuple per check;
+    the dict form stored in `conditions_evaluated` is only built when the
+    trace is read, i.e. when it is persisted or returned by the API.
+    """
+
+    __slots__ = ("_entries", "_expanded")
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[CompiledCondition, object, bool]] = []
+        self._expanded: list[dict] | None = None
+
+    def append(self, compiled: CompiledCondition, profile_value: object, passes: bool) -> None:
+        self._entries.append((compiled, profile_value, passes))
+        self._expanded = None
+
+    def extend(
+        self,
+        conditions: Sequence[CompiledCondition],
+        checks: Sequence[tuple[object, bool]],
+    ) -> None:
+        self._entries.extend(
+            (compiled, profile_value, passes)
+            for compiled, (profile_value, passes) in zip(conditions, checks)
+        )
+        self._expanded = None
+
+    def to_positions(self, rules: Sequence[CompiledRule]) -> list[tuple[int, int, object, bool]]:
+        """
+        Entries as (rule index, condition index, profile value, passes) into
+        `rules`, so a trace can be sent to a process holding the same plan
+        without sending the compiled conditions along.
+        """
+        positions = {
+            id(compiled): (i, j)
+            for i, rule in enumerate(rules)
+            for j, compiled in enumerate(rule.conditions)
+        }
+        return [
+            (*positions[id(compiled)], profile_value, passes)
+            for compiled, profile_value, passes in self._entries
+        ]
+
+    @classmethod
+    def from_positions(
+        cls, rules: Sequence[CompiledRule], entries: Sequence[tuple[int, int, object, bool]]
+    ) -> ConditionTrace:
+        trace = cls()
+        trace._entries = [
+            (rules[i].conditions[j], profile_value, passes)
+            for i, j, profile_value, passes in entries
+        ]
+        return trace
+
+    def pack(self) -> bytes:
+        return PackedConditionTrace.from_trace(self).to_bytes()
+
+    def to_list(self) -> list[dict]:
+        if self._expanded is None:
+            self._expanded = [
+                compiled.to_result(profile_value, passes).to_dict()
+                for compiled, profile_value, passes in self._entries
+            ]
+        return self._expanded
+
+    @overload
+    def __getitem__(self, index: int) -> dict: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict]: ...
+
+    def __getitem__(self, index: int | slice) -> dict | list[dict]:
+        return self.to_list()[index]
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.to_list())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (ConditionTrace, list)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ConditionTrace({self.to_list()!r})"
+
+
+@dataclass(frozen=True)
+class PackedConditionTrace:
+    """
+    Storage form of a ConditionTrace. Conditions are referenced by id instead
+    of repeating their field, operator, threshold code and description:
+
+        u8 format version | u16 count | count x 16-byte condition id |
+        ceil(count / 8) bytes pass/fail bitmask |
+        JSON [[profile values...], [threshold values...]]
+
+    Threshold values are kept because thresholds may change after the fact.
+    """
+
+    condition_ids: tuple[UUID, ...]
+    passes: tuple[bool, ...]
+    profile_values: list
+    threshold_values: list
+
+    @classmethod
+    def from_trace(cls, trace: ConditionTrace) -> PackedConditionTrace:
+        results = [
+            compiled.to_result(profile_value, passes)
+            for compiled, profile_value, passes in trace._entries
+        ]
+        return cls(
+            condition_ids=tuple(compiled.condition.id for compiled, _, _ in trace._entries),
+            passes=tuple(r.passes for r in results),
+            profile_values=[r.profile_value for r in results],
+            threshold_values=[r.threshold_value for r in results],
+        )
+
+    def to_bytes(self) -> bytes:
+        count = len(self.condition_ids)
+        mask = bytearray((count + 7) // 8)
+        for i, passes in enumerate(self.passes):
+            if passes:
+                mask[i >> 3] |= 1 << (i & 7)
+        values = json.dumps(
+            [self.profile_values, self.threshold_values], separators=(",", ":"), default=str
+        )
+        return b"".join([
+            _HEADER.pack(PACKED_TRACE_VERSION, count),
+            *(condition_id.bytes for condition_id in self.condition_ids),
+            bytes(mask),
+            values.encode(),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> PackedConditionTrace:
+        version, count = _HEADER.unpack_from(data)
+        if version != PACKED_TRACE_VERSION:
+            raise ValueError(f"Unsupported condition trace format: {version}")
+        offset = _HEADER.size
+        condition_ids = tuple(
+            UUID(bytes=bytes(data[offset + 16 * i: offset + 16 * (i + 1)])) for i in range(count)
+        )
+        offset += 16 * count
+        mask = data[offset: offset + (count + 7) // 8]
+        offset += len(mask)
+        profile_values, threshold_values = json.loads(bytes(data[offset:]))
+        return cls(
+            condition_ids=condition_ids,
+            passes=tuple(bool(mask[i >> 3] & (1 << (i & 7))) for i in range(count)),
+            profile_values=profile_values,
+            threshold_values=threshold_values,
+        )
+
+    def expand(self, conditions: Mapping[UUID, RuleConditionEntity]) -> list[dict]:
+        """
+        The `conditions_evaluated` dicts, with condition metadata looked up by
+        id. Entries whose condition is not in `conditions` (e.g. deleted since)
+        are left out.
+        """
+        expanded = []
+        for condition_id, passes, profile_value, threshold_value in zip(
+            self.condition_ids, self.passes, self.profile_values, self.threshold_values
+        ):
+            condition = conditions.get(condition_id)
+            if condition is None:
+                continue
+            expanded.append(
+                ConditionResult(
+                    field=condition.field,
+                    operator=condition.operator,
+                    profile_value=profile_value,
+                    threshold_code=threshold_code_of(condition),
+                    threshold_value=threshold_value,
+                    passes=passes,
+                    description=condition.description,
+                ).to_dict()
+            )
+        return expanded
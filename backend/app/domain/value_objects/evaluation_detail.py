@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class EvaluationDetail(str, Enum):
+    """How much of a stored evaluation to read back."""
+
+    SUMMARY = "summary"  # evaluation row and result counters only
+    RESULTS = "results"  # plus the profile snapshot and per-obligation results
+    FULL = "full"  # plus the condition audit trail of every result
@@ -50,6 +50,18 @@ def create_refresh_token(user_id: UUID, tenant_id: UUID) -> str:
     return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
 
 
+def create_calendar_feed_token(user_id: UUID, tenant_id: UUID) -> str:
+    """Long-lived token for calendar apps, which cannot send an Authorization header."""
+    expire = datetime.now(timezone.utc) + timedelta(days=settings.CALENDAR_FEED_TOKEN_EXPIRE_DAYS)
+    payload = {
+        "sub": str(user_id),
+        "tenant_id": str(tenant_id),
+        "type": "calendar_feed",
+        "exp": expire,
+    }
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+
 def decode_token(token: str) -> dict | None:
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from app.config import settings
+
+
+class MemoryCache:
+    """Process-local LRU cache with a per-entry TTL."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        with self._lock:
+            keys = [k for k, (_, v) in self._entries.items() if predicate(k, v)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Fully loaded evaluation contexts (rule set, thresholds, obligations,
+# periodicities and compiled plan), keyed by fiscal_year_id.
+context_cache = MemoryCache(
+    max_entries=settings.EVALUATION_CONTEXT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.EVALUATION_CONTEXT_CACHE_TTL_SECONDS,
+)
+
+
+# Deadline tables (due dates per obligation and NIT last digit), keyed by
+# fiscal_year_id. They only change when periodicities are re-seeded.
+deadline_cache = MemoryCache(
+    max_entries=settings.DEADLINE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.DEADLINE_CACHE_TTL_SECONDS,
+)
+
+# Rendered iCalendar feeds, keyed by (user_id, calendar version). A change to
+# the user's entries bumps the version, so stale feeds are never read again.
+calendar_feed_cache = MemoryCache(
+    max_entries=settings.CALENDAR_FEED_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CALENDAR_FEED_CACHE_TTL_SECONDS,
+)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Callable, Iterable, Mapping
 from decimal import Decimal
 from typing import Any
 
@@ -17,8 +18,15 @@ class DecimalEncoder(json.JSONEncoder):
 
 
 class RedisCache:
-    def __init__(self) -> None:
-        self._redis: redis.Redis | None = None
+    # Keys per UNLINK / SCAN round trip in bulk invalidation
+    DELETE_CHUNK_SIZE = 500
+
+    def __init__(self, client: redis.Redis | None = None) -> None:
+        self._redis: redis.Redis | None = client
+
+    @property
+    def connected(self) -> bool:
+        return self._redis is not None
 
     async def connect(self) -> None:
         if not settings.REDIS_URL:
@@ -32,6 +40,7 @@ class RedisCache:
     async def disconnect(self) -> None:
         if self._redis:
             await self._redis.close()
+            self._redis = None
 
     async def get(self, key: str) -> Any | None:
         if not self._redis:
@@ -52,11 +61,100 @@ class RedisCache:
             return
         await self._redis.delete(key)
 
-    async def delete_pattern(self, pattern: str) -> None:
+    async def get_many(self, keys: Iterable[str]) -> list[Any | None]:
+        """Values for `keys` in order, None for misses, in one MGET."""
+        keys = list(keys)
+        if not self._redis or not keys:
+            return [None] * len(keys)
+        values = await self._redis.mget(keys)
+        return [json.loads(v) if v is not None else None for v in values]
+
+    async def set_many(self, items: Mapping[str, Any], ttl_seconds: int = 3600) -> None:
+        if not self._redis or not items:
+            return
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.set(key, json.dumps(value, cls=DecimalEncoder), ex=ttl_seconds)
+            await pipe.execute()
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """UNLINK `keys` in chunks; memory is reclaimed off the main Redis thread."""
+        if not self._redis:
+            return 0
+        deleted = 0
+        chunk: list[str] = []
+        for key in keys:
+            chunk.append(key)
+            if len(chunk) >= self.DELETE_CHUNK_SIZE:
+                deleted += await self._redis.unlink(*chunk)
+                chunk = []
+        if chunk:
+            deleted += await self._redis.unlink(*chunk)
+        return deleted
+
+    async def delete_pattern(self, pattern: str) -> int:
+        """
+        Delete every key matching `pattern`, one UNLINK per scanned chunk
+        rather than one round trip per key. Still O(keyspace) on the server;
+        prefer namespace generations for anything on a request path.
+        """
+        if not self._redis:
+            return 0
+        deleted = 0
+        chunk: list[str] = []
+        async for key in self._redis.scan_iter(match=pattern, count=self.DELETE_CHUNK_SIZE):
+            chunk.append(key)
+            if len(chunk) >= self.DELETE_CHUNK_SIZE:
+                deleted += await self.delete_many(chunk)
+                chunk = []
+        return deleted + await self.delete_many(chunk)
+
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"{namespace}:generation"
+
+    async def generation(self, namespace: str) -> int:
+        """Current generation of `namespace`; 0 until first invalidated."""
+        return await self.get_int(self._generation_key(namespace))
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        return f"{namespace}:g{await self.generation(namespace)}:{key}"
+
+    async def invalidate_namespace(self, namespace: str) -> int | None:
+        """
+        Invalidate every key of `namespace` with a single INCR. Keys of
+        older generations are never read again and expire by TTL.
+        """
+        return await self.incr(self._generation_key(namespace))
+
+    async def get_int(self, key: str) -> int:
+        if not self._redis:
+            return 0
+        value = await self._redis.get(key)
+        return int(value) if value is not None else 0
+
+    async def incr(self, key: str) -> int | None:
+        if not self._redis:
+            return None
+        return await self._redis.incr(key)
+
+    async def publish(self, channel: str, message: str) -> None:
+        if not self._redis:
+            return
+        await self._redis.publish(channel, message)
+
+    async def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Call `handler` with every message published on `channel` until cancelled."""
         if not self._redis:
             return
-        async for key in self._redis.scan_iter(match=pattern):
-            await self._redis.delete(key)
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    handler(message["data"])
+        finally:
+            await pubsub.aclose()
 
 
 cache = RedisCache()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any
+from uuid import UUID
+
+import structlog
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.infrastructure.cache.memory_cache import context_cache, deadline_cache
+from app.infrastructure.cache.redis_cache import RedisCache, cache
+
+logger = structlog.get_logger(__name__)
+
+
+class ReferenceDataCache:
+    """
+    Shared second-level cache for the reference data of a fiscal year
+    (fiscal year, active rule set, thresholds, obligation types and
+    periodicities), sitting behind the per-process `context_cache`.
+
+    Each fiscal year is a cache namespace and its data lives under the
+    namespace's current generation. Invalidating a fiscal year increments the
+    generation instead of deleting keys, so old entries simply stop being
+    read and expire, and publishes the fiscal year
+    on a channel so every worker drops its local context. A reader that
+    fetched the generation before a change can only write under the old,
+    already-unreachable one. Until this worker's own generation bump has
+    landed, it bypasses the shared entry of that fiscal year.
+
+    Process-local entries carry a local generation per fiscal year, bumped
+    whenever they are dropped. A load that started before a drop compares
+    generations and does not store what it read, since it may predate the
+    commit that caused the drop.
+
+    Redis is optional: without a connection every read misses and every
+    write is a no-op, and Redis errors are treated the same way.
+    """
+
+    def __init__(self, backend: RedisCache, ttl_seconds: int, channel: str) -> None:
+        self._backend = backend
+        self._ttl_seconds = ttl_seconds
+        self._channel = channel
+        self._pending: set[UUID] = set()
+        self._local_generations: dict[UUID, int] = {}
+        self._local_epoch = 0
+
+    @staticmethod
+    def _namespace(fiscal_year_id: UUID) -> str:
+        return f"refdata:{fiscal_year_id}"
+
+    @classmethod
+    def _data_key(cls, fiscal_year_id: UUID, version: int) -> str:
+        return f"{cls._namespace(fiscal_year_id)}:g{version}:context"
+
+    async def version(self, fiscal_year_id: UUID) -> int:
+        try:
+            return await self._backend.generation(self._namespace(fiscal_year_id))
+        except RedisError:
+            return 0
+
+    async def get(self, fiscal_year_id: UUID, version: int) -> dict | None:
+        if fiscal_year_id in self._pending:
+            return None
+        try:
+            return await self._backend.get(self._data_key(fiscal_year_id, version))
+        except RedisError:
+            return None
+
+    async def set(self, fiscal_year_id: UUID, version: int, data: dict) -> None:
+        if fiscal_year_id in self._pending:
+            return
+        try:
+            await self._backend.set(
+                self._data_key(fiscal_year_id, version), data, ttl_seconds=self._ttl_seconds
+            )
+        except RedisError:
+            pass
+
+    async def invalidate(self, fiscal_year_id: UUID) -> None:
+        self._pending.add(fiscal_year_id)
+        try:
+            await self._backend.invalidate_namespace(self._namespace(fiscal_year_id))
+            await self._backend.publish(self._channel, str(fiscal_year_id))
+        except RedisError:
+            pass
+        finally:
+            self._pending.discard(fiscal_year_id)
+
+    def mark_pending(self, fiscal_year_id: UUID) -> None:
+        self._pending.add(fiscal_year_id)
+
+    def local_generation(self, fiscal_year_id: UUID) -> tuple[int, int]:
+        """Read before loading; store locally only if it is unchanged after the load."""
+        return self._local_epoch, self._local_generations.get(fiscal_year_id, 0)
+
+    def drop_local(self, message: str | UUID) -> None:
+        fiscal_year_id = UUID(str(message))
+        self._local_generations[fiscal_year_id] = self._local_generations.get(fiscal_year_id, 0) + 1
+        context_cache.delete(fiscal_year_id)
+        deadline_cache.delete(fiscal_year_id)
+
+    def clear_local(self) -> None:
+        self._local_epoch += 1
+        context_cache.clear()
+        deadline_cache.clear()
+
+    async def listen(self, retry_seconds: float = 1.0) -> None:
+        """
+        Drop local contexts as invalidations arrive from other workers. When
+        the subscription fails or ends, the local cache is cleared, since
+        messages sent in the meantime were missed, and the channel is
+        subscribed again. Runs until cancelled or the backend disconnects.
+        """
+        while self._backend.connected:
+            try:
+                await self._backend.subscribe(self._channel, self.drop_local)
+            except Exception:
+                logger.exception("reference_cache_listen_failed", channel=self._channel)
+            else:
+                logger.warning("reference_cache_listen_ended", channel=self._channel)
+            self.clear_local()
+            await asyncio.sleep(retry_seconds)
+
+
+reference_cache = ReferenceDataCache(
+    cache,
+    ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS,
+    channel=settings.REFERENCE_CACHE_CHANNEL,
+)
+
+_background_tasks: set[asyncio.Task[Any]] = set()
+
+
+def _spawn(coro: Coroutine[Any, Any, None]) -> bool:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        coro.close()
+        return False
+    task = loop.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return True
+
+
+def invalidate_evaluation_context(db: AsyncSession, fiscal_year_id: UUID) -> None:
+    """
+    Drop the cached context for a fiscal year now and again once the current
+    transaction commits, so a request racing the commit cannot re-cache
+    pre-commit data for the whole TTL. The commit also bumps the shared
+    version and notifies the other workers.
+    """
+    reference_cache.drop_local(fiscal_year_id)
+
+    def after_commit(session: Any) -> None:
+        reference_cache.drop_local(fiscal_year_id)
+        if _spawn(reference_cache.invalidate(fiscal_year_id)):
+            reference_cache.mark_pending(fiscal_year_id)
+
+    event.listen(db.sync_session, "after_commit", after_commit, once=True)
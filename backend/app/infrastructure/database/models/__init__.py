@@ -6,7 +6,8 @@ from app.infrastructure.database.models.obligation import ObligationType, Obliga
 from app.infrastructure.database.models.rule import RuleSet, Rule, RuleCondition
 from app.infrastructure.database.models.tax_profile import TaxProfile
 from app.infrastructure.database.models.evaluation import Evaluation, EvaluationResult
-from app.infrastructure.database.models.calendar_entry import CalendarEntry
+from app.infrastructure.database.models.evaluation_job import EvaluationJob
+from app.infrastructure.database.models.calendar_entry import CalendarEntry, CalendarVersion
 from app.infrastructure.database.models.disclaimer import DisclaimerVersion, DisclaimerAcceptance
 from app.infrastructure.database.models.audit_log import AuditLog
 
@@ -23,7 +24,9 @@ __all__ = [
     "TaxProfile",
     "Evaluation",
     "EvaluationResult",
+    "EvaluationJob",
     "CalendarEntry",
+    "CalendarVersion",
     "DisclaimerVersion",
     "DisclaimerAcceptance",
     "AuditLog",
@@ -3,7 +3,18 @@ from __future__ import annotations
 import uuid
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -15,12 +26,25 @@ class CalendarEntry(Base):
     __table_args__ = (
         Index("ix_calendar_user_due_date", "user_id", "due_date"),
         Index("ix_calendar_tenant", "tenant_id"),
+        Index(
+            "ix_calendar_user_pending_due",
+            "user_id",
+            "due_date",
+            "id",
+            postgresql_where=text("NOT is_completed"),
+        ),
+        Index(
+            "uq_calendar_user_obligation_due",
+            "user_id",
+            "obligation_type_id",
+            "due_date",
+            unique=True,
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    evaluation_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("evaluations.id"), nullable=False
-    )
+    # Not a foreign key: evaluations is partitioned and keyed by (id, fiscal_year_id)
+    evaluation_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
     )
@@ -37,5 +61,21 @@ class CalendarEntry(Base):
     is_completed: Mapped[bool] = mapped_column(Boolean, default=False)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
-    evaluation: Mapped["Evaluation"] = relationship()  # noqa: F821
+    evaluation: Mapped["Evaluation"] = relationship(  # noqa: F821
+        primaryjoin="foreign(CalendarEntry.evaluation_id) == Evaluation.id", viewonly=True
+    )
     obligation_type: Mapped["ObligationType"] = relationship()  # noqa: F821
+
+
+class CalendarVersion(Base):
+    """Per-user counter bumped with every change to the user's calendar entries."""
+
+    __tablename__ = "calendar_versions"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True
+    )
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -3,15 +3,37 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    event,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.infrastructure.database.base import Base
 
+# Both tables are list-partitioned by fiscal year, one partition per year
+# (see app.infrastructure.database.partitions) plus a DEFAULT partition.
+# Primary keys include the partition key, so results reference their
+# evaluation by (evaluation_id, fiscal_year_id).
+
 
 class Evaluation(Base):
     __tablename__ = "evaluations"
+    __table_args__ = (
+        Index("ix_evaluations_profile_input_hash", "tax_profile_id", "input_hash"),
+        Index("ix_evaluations_tenant_user_created", "tenant_id", "user_id", "created_at", "id"),
+        {"postgresql_partition_by": "LIST (fiscal_year_id)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -27,13 +49,22 @@ class Evaluation(Base):
         UUID(as_uuid=True), ForeignKey("rule_sets.id"), nullable=False
     )
     fiscal_year_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("fiscal_years.id"), nullable=False
+        UUID(as_uuid=True), ForeignKey("fiscal_years.id"), primary_key=True
     )
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     evaluated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
     profile_snapshot: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    input_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Result counts, maintained at write time
+    total_obligations_evaluated: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default="0"
+    )
+    applies_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    does_not_apply_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    conditional_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    needs_more_info_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -45,10 +76,20 @@ class Evaluation(Base):
 
 class EvaluationResult(Base):
     __tablename__ = "evaluation_results"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["evaluation_id", "fiscal_year_id"],
+            ["evaluations.id", "evaluations.fiscal_year_id"],
+            name="evaluation_results_evaluation_fkey",
+        ),
+        Index("ix_evaluation_results_evaluation", "evaluation_id"),
+        {"postgresql_partition_by": "LIST (fiscal_year_id)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    evaluation_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("evaluations.id"), nullable=False
+    evaluation_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    fiscal_year_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("fiscal_years.id"), primary_key=True
     )
     obligation_type_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("obligation_types.id"), nullable=False
@@ -57,7 +98,10 @@ class EvaluationResult(Base):
     triggered_rule_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("rules.id"), nullable=True
     )
-    conditions_evaluated: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # Either the packed trace (see PackedConditionTrace) or, for rows written
+    # before it existed, the expanded list of condition dicts
+    conditions_evaluated: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    condition_trace: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     explanation_es: Mapped[str] = mapped_column(Text, nullable=False)
     explanation_en: Mapped[str | None] = mapped_column(Text, nullable=True)
     legal_references: Mapped[dict] = mapped_column(JSONB, default=list)
@@ -67,3 +111,11 @@ class EvaluationResult(Base):
     evaluation: Mapped["Evaluation"] = relationship(back_populates="results")
     obligation_type: Mapped["ObligationType"] = relationship()  # noqa: F821
     triggered_rule: Mapped["Rule | None"] = relationship()  # noqa: F821
+
+
+for _table in (Evaluation.__table__, EvaluationResult.__table__):
+    event.listen(
+        _table,
+        "after_create",
+        DDL("CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"),
+    )
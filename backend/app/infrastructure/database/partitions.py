@@ -0,0 +1,185 @@
+"""
+Fiscal-year partitions of the evaluation tables.
+
+`evaluations` and `evaluation_results` are list-partitioned by fiscal_year_id.
+Each fiscal year gets a `<table>_fy<year>` partition; rows of fiscal years
+without one land in `<table>_default`. Detaching a year turns its partitions
+into plain tables that can be dumped, moved or dropped without touching
+the live tables.
+
+Usage (from backend/):
+
+    python -m app.infrastructure.database.partitions list
+    python -m app.infrastructure.database.partitions ensure
+    python -m app.infrastructure.database.partitions create --year 2026
+    python -m app.infrastructure.database.partitions detach --year 2024
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from uuid import UUID
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.models.fiscal_year import FiscalYear
+
+# Referenced table first: partitions are attached in this order and detached
+# in reverse.
+PARTITIONED_TABLES = ("evaluations", "evaluation_results")
+
+
+def partition_name(table: str, year: int) -> str:
+    return f"{table}_fy{int(year)}"
+
+
+async def list_partitions(db: AsyncSession) -> list[dict]:
+    result = await db.execute(
+        text(
+            """
+            SELECT parent.relname AS parent, child.relname AS name,
+                   pg_get_expr(child.relpartbound, child.oid) AS bound
+            FROM pg_inherits
+            JOIN pg_class AS parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = ANY(:tables) AND child.relkind IN ('r', 'p')
+            ORDER BY parent.relname, child.relname
+            """
+        ),
+        {"tables": list(PARTITIONED_TABLES)},
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def _table_exists(db: AsyncSession, name: str) -> bool:
+    result = await db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+    return bool(result.scalar_one())
+
+
+async def create_fiscal_year_partitions(
+    db: AsyncSession, fiscal_year_id: UUID, year: int
+) -> list[str]:
+    """
+    Create and attach the partitions of a fiscal year, moving its rows out of
+    the default partitions. Existing partitions are left alone; returns the
+    names of the partitions created.
+    """
+    fiscal_year_id = UUID(str(fiscal_year_id))
+    missing = [
+        table for table in PARTITIONED_TABLES
+        if not await _table_exists(db, partition_name(table, year))
+    ]
+    # Block writes to the default partitions until the transaction ends, so no
+    # row of the year can be committed there after it has been moved.
+    for table in missing:
+        await db.execute(text(f"LOCK TABLE {table}_default IN SHARE ROW EXCLUSIVE MODE"))
+    for table in missing:
+        await db.execute(text(
+            f"CREATE TABLE {partition_name(table, year)} "
+            f"(LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+    # Results go first so no evaluation is deleted while still referenced
+    for table in reversed(missing):
+        await db.execute(
+            text(
+                f"WITH moved AS ("
+                f"DELETE FROM {table}_default WHERE fiscal_year_id = :fy RETURNING *"
+                f") INSERT INTO {partition_name(table, year)} SELECT * FROM moved"
+            ),
+            {"fy": fiscal_year_id},
+        )
+    for table in missing:
+        await db.execute(text(
+            f"ALTER TABLE {table} ATTACH PARTITION {partition_name(table, year)} "
+            f"FOR VALUES IN ('{fiscal_year_id}')"
+        ))
+    return [partition_name(table, year) for table in missing]
+
+
+async def detach_fiscal_year_partitions(db: AsyncSession, year: int) -> list[str]:
+    """
+    Detach the partitions of a fiscal year, leaving them as standalone tables.
+    The detached results keep no foreign key to the live evaluations.
+    """
+    detached = []
+    for table in reversed(PARTITIONED_TABLES):
+        name = partition_name(table, year)
+        if not await _table_exists(db, name):
+            continue
+        await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        foreign_keys = await db.execute(
+            text(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = to_regclass(:name) AND contype = 'f' "
+                "AND confrelid::regclass::text = ANY(:tables)"
+            ),
+            {"name": name, "tables": list(PARTITIONED_TABLES)},
+        )
+        for constraint in foreign_keys.scalars().all():
+            await db.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+        detached.append(name)
+    return detached
+
+
+async def ensure_partitions(db: AsyncSession) -> list[str]:
+    """Create the missing partitions of every fiscal year."""
+    result = await db.execute(select(FiscalYear.id, FiscalYear.year).order_by(FiscalYear.year))
+    created = []
+    for fiscal_year_id, year in result.all():
+        created.extend(await create_fiscal_year_partitions(db, fiscal_year_id, year))
+    return created
+
+
+async def _fiscal_year_id(db: AsyncSession, year: int) -> UUID:
+    result = await db.execute(select(FiscalYear.id).where(FiscalYear.year == year))
+    fiscal_year_id = result.scalar_one_or_none()
+    if fiscal_year_id is None:
+        raise ValueError(f"Fiscal year {year} not found")
+    return fiscal_year_id
+
+
+async def _run(args: argparse.Namespace) -> None:
+    from app.infrastructure.database.session import async_session_factory
+
+    async with async_session_factory() as db:
+        if args.command == "list":
+            for partition in await list_partitions(db):
+                print(f"  {partition['parent']}: {partition['name']} {partition['bound']}")
+            return
+        if args.command == "ensure":
+            names = await ensure_partitions(db)
+        elif args.command == "create":
+            names = await create_fiscal_year_partitions(
+                db, await _fiscal_year_id(db, args.year), args.year
+            )
+        else:
+            names = await detach_fiscal_year_partitions(db, args.year)
+        await db.commit()
+    verb = "Detached" if args.command == "detach" else "Created"
+    print(f"{verb}: {', '.join(names)}" if names else "Nothing to do")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage fiscal-year partitions of evaluations.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show the partitions")
+    commands.add_parser("ensure", help="create partitions for every fiscal year")
+    for name, help_text in (
+        ("create", "create the partitions of a fiscal year"),
+        ("detach", "detach the partitions of a fiscal year for archiving"),
+    ):
+        commands.add_parser(name, help=help_text).add_argument("--year", type=int, required=True)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_run(args))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime, timezone
+from datetime import date
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import any_, func, select, tuple_, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import array, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.entities.calendar_entry import CalendarEntryEntity
+from app.domain.entities.calendar_entry import CalendarEntryEntity, CalendarVersionEntity
 from app.domain.interfaces.calendar_repository import CalendarRepository
-from app.infrastructure.database.models.calendar_entry import CalendarEntry
+from app.infrastructure.database.models.calendar_entry import CalendarEntry, CalendarVersion
 
 
 class PgCalendarRepository(CalendarRepository):
@@ -17,51 +19,147 @@ class PgCalendarRepository(CalendarRepository):
         self._db = db
 
     async def create_entries(self, entries: list[CalendarEntryEntity]) -> list[CalendarEntryEntity]:
+        """
+        Insert the entries in one bulk statement, skipping those the user
+        already has for the same obligation and due date, whichever evaluation
+        created them; existing entries keep their completion. Returns the
+        entries that were inserted.
+        """
+        if not entries:
+            return entries
+
         for entry in entries:
-            db_entry = CalendarEntry(
-                id=entry.id or uuid.uuid4(),
-                evaluation_id=entry.evaluation_id,
-                user_id=entry.user_id,
-                tenant_id=entry.tenant_id,
-                obligation_type_id=entry.obligation_type_id,
-                title=entry.title,
-                description=entry.description,
-                due_date=entry.due_date,
-                periodicity=entry.periodicity,
-                is_completed=False,
+            if entry.id is None:
+                entry.id = uuid.uuid4()
+        result = await self._db.execute(
+            insert(CalendarEntry)
+            .on_conflict_do_nothing(
+                index_elements=["user_id", "obligation_type_id", "due_date"]
             )
-            self._db.add(db_entry)
-        await self._db.flush()
-        return entries
+            .returning(CalendarEntry.id),
+            [
+                {
+                    "id": entry.id,
+                    "evaluation_id": entry.evaluation_id,
+                    "user_id": entry.user_id,
+                    "tenant_id": entry.tenant_id,
+                    "obligation_type_id": entry.obligation_type_id,
+                    "title": entry.title,
+                    "description": entry.description,
+                    "due_date": entry.due_date,
+                    "periodicity": entry.periodicity,
+                    "is_completed": False,
+                }
+                for entry in entries
+            ],
+        )
+        inserted = set(result.scalars().all())
+        created = [entry for entry in entries if entry.id in inserted]
+        await self._bump_versions({entry.user_id for entry in created})
+        return created
 
-    async def list_by_user(self, user_id: UUID, tenant_id: UUID) -> list[CalendarEntryEntity]:
-        result = await self._db.execute(
+    async def list_by_user(
+        self,
+        user_id: UUID,
+        tenant_id: UUID,
+        due_from: date | None = None,
+        due_to: date | None = None,
+        completed: bool | None = None,
+        obligation_type_ids: list[UUID] | None = None,
+        limit: int | None = None,
+        after: tuple[date, UUID] | None = None,
+    ) -> list[CalendarEntryEntity]:
+        """
+        Entries ordered by (due_date, id). The date window is a range on
+        ix_calendar_user_due_date; pending-only reads match the predicate of
+        ix_calendar_user_pending_due.
+        """
+        stmt = (
             select(CalendarEntry)
             .where(
                 CalendarEntry.user_id == user_id,
                 CalendarEntry.tenant_id == tenant_id,
             )
-            .order_by(CalendarEntry.due_date)
+            .order_by(CalendarEntry.due_date, CalendarEntry.id)
+            .limit(limit)
         )
+        if due_from is not None:
+            stmt = stmt.where(CalendarEntry.due_date >= due_from)
+        if due_to is not None:
+            stmt = stmt.where(CalendarEntry.due_date <= due_to)
+        if completed is not None:
+            stmt = stmt.where(
+                CalendarEntry.is_completed if completed else ~CalendarEntry.is_completed
+            )
+        if obligation_type_ids:
+            stmt = stmt.where(CalendarEntry.obligation_type_id.in_(obligation_type_ids))
+        if after is not None:
+            stmt = stmt.where(tuple_(CalendarEntry.due_date, CalendarEntry.id) > tuple_(*after))
+        result = await self._db.execute(stmt)
         return [self._to_entity(e) for e in result.scalars().all()]
 
     async def mark_completed(self, entry_id: UUID, tenant_id: UUID) -> CalendarEntryEntity | None:
+        updated = await self.set_completed([entry_id], tenant_id, True)
+        return updated[0] if updated else None
+
+    async def set_completed(
+        self, entry_ids: list[UUID], tenant_id: UUID, is_completed: bool
+    ) -> list[CalendarEntryEntity]:
+        """
+        One UPDATE ... WHERE id = ANY(...) RETURNING for the whole list.
+        Entries completed earlier keep their original completed_at.
+        """
+        if not entry_ids:
+            return []
         result = await self._db.execute(
-            select(CalendarEntry).where(
-                CalendarEntry.id == entry_id,
+            update(CalendarEntry)
+            .where(
+                CalendarEntry.id == any_(array(entry_ids, type_=postgresql.UUID(as_uuid=True))),
                 CalendarEntry.tenant_id == tenant_id,
             )
+            .values(
+                is_completed=is_completed,
+                completed_at=func.coalesce(CalendarEntry.completed_at, func.now())
+                if is_completed
+                else None,
+            )
+            .returning(*CalendarEntry.__table__.c)
+            .execution_options(synchronize_session="fetch")
+        )
+        updated = [self._to_entity(row) for row in result]
+        await self._bump_versions({entry.user_id for entry in updated})
+        return updated
+
+    async def get_version(self, user_id: UUID) -> CalendarVersionEntity:
+        result = await self._db.execute(
+            select(CalendarVersion.version, CalendarVersion.updated_at).where(
+                CalendarVersion.user_id == user_id
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return CalendarVersionEntity(user_id=user_id)
+        return CalendarVersionEntity(
+            user_id=user_id, version=row.version, updated_at=row.updated_at
+        )
+
+    async def _bump_versions(self, user_ids: set[UUID]) -> None:
+        """Increment the calendar version of each user, in the writer's transaction."""
+        if not user_ids:
+            return
+        # Sorted so concurrent writers lock the version rows in the same order
+        stmt = insert(CalendarVersion).values(
+            [{"user_id": user_id, "version": 1} for user_id in sorted(user_ids)]
+        )
+        await self._db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[CalendarVersion.user_id],
+                set_={"version": CalendarVersion.version + 1, "updated_at": func.now()},
+            )
         )
-        db_entry = result.scalar_one_or_none()
-        if not db_entry:
-            return None
-        db_entry.is_completed = True
-        db_entry.completed_at = datetime.now(timezone.utc)
-        await self._db.flush()
-        return self._to_entity(db_entry)
 
     @staticmethod
-    def _to_entity(db: CalendarEntry) -> CalendarEntryEntity:
+    def _to_entity(db) -> CalendarEntryEntity:
         return CalendarEntryEntity(
             id=db.id,
             evaluation_id=db.evaluation_id,
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.calendar.deadlines import DeadlineSchedule, DeadlineTable
+from app.domain.interfaces.deadline_repository import DeadlineRepository
+from app.infrastructure.database.models.fiscal_year import FiscalYear
+from app.infrastructure.database.models.obligation import ObligationPeriodicity, ObligationType
+
+
+class PgDeadlineRepository(DeadlineRepository):
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def get_tables(self, fiscal_year_ids: list[UUID]) -> dict[UUID, DeadlineTable]:
+        # Outer joins keep fiscal years without periodicities (empty tables)
+        result = await self._db.execute(
+            select(
+                FiscalYear.id.label("fiscal_year_id"),
+                ObligationPeriodicity.obligation_type_id,
+                ObligationType.code,
+                ObligationPeriodicity.frequency,
+                ObligationPeriodicity.nit_schedule,
+            )
+            .select_from(FiscalYear)
+            .outerjoin(
+                ObligationPeriodicity, ObligationPeriodicity.fiscal_year_id == FiscalYear.id
+            )
+            .outerjoin(
+                ObligationType, ObligationType.id == ObligationPeriodicity.obligation_type_id
+            )
+            .where(FiscalYear.id.in_(fiscal_year_ids))
+        )
+        schedules: dict[UUID, list[DeadlineSchedule]] = {}
+        for row in result:
+            fiscal_year_schedules = schedules.setdefault(row.fiscal_year_id, [])
+            if row.obligation_type_id is not None:
+                fiscal_year_schedules.append(
+                    DeadlineSchedule(
+                        row.obligation_type_id, row.code, row.frequency, row.nit_schedule
+                    )
+                )
+        return {
+            fiscal_year_id: DeadlineTable.build(fiscal_year_id, fiscal_year_schedules)
+            for fiscal_year_id, fiscal_year_schedules in schedules.items()
+        }
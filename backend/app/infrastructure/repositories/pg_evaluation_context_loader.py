@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.evaluation_context import EvaluationContext
+
+# The whole reference data of a fiscal year as one JSON document, in the
+# EvaluationContext.to_reference() layout. Numerics are sent as text so
+# amounts keep their exact decimal value.
+CONTEXT_QUERY = text(
+    """
+    SELECT json_build_object(
+        'fiscal_year', (
+            SELECT json_build_object(
+                'id', fy.id, 'year', fy.year, 'status', fy.status,
+                'uvt_value', fy.uvt_value::text, 'notes', fy.notes
+            )
+            FROM fiscal_years AS fy
+            WHERE fy.id = :fiscal_year_id
+        ),
+        'rule_set', (
+            SELECT json_build_object(
+                'id', rs.id, 'fiscal_year_id', rs.fiscal_year_id,
+                'version', rs.version, 'status', rs.status,
+                'rules', coalesce((
+                    SELECT json_agg(json_build_object(
+                        'id', r.id, 'rule_set_id', r.rule_set_id,
+                        'obligation_type_id', r.obligation_type_id,
+                        'code', r.code, 'name', r.name, 'logic_operator', r.logic_operator,
+                        'priority', r.priority, 'result_if_true', r.result_if_true,
+                        'is_active', r.is_active, 'description', r.description,
+                        'conditions', coalesce((
+                            SELECT json_agg(json_build_object(
+                                'id', c.id, 'rule_id', c.rule_id, 'field', c.field,
+                                'operator', c.operator, 'value_type', c.value_type,
+                                'value', c.value, 'value_secondary', c.value_secondary,
+                                'description', c.description
+                            ))
+                            FROM rule_conditions AS c
+                            WHERE c.rule_id = r.id
+                        ), '[]'::json)
+                    ) ORDER BY r.priority)
+                    FROM rules AS r
+                    WHERE r.rule_set_id = rs.id
+                ), '[]'::json)
+            )
+            FROM rule_sets AS rs
+            WHERE rs.fiscal_year_id = :fiscal_year_id AND rs.status = 'active'
+            ORDER BY rs.version DESC
+            LIMIT 1
+        ),
+        'thresholds', (
+            SELECT coalesce(json_object_agg(t.code, t.value_cop::text), '{}'::json)
+            FROM thresholds AS t
+            WHERE t.fiscal_year_id = :fiscal_year_id AND t.value_cop IS NOT NULL
+        ),
+        'obligations', (
+            SELECT coalesce(json_agg(json_build_object(
+                'id', o.id, 'code', o.code, 'name', o.name, 'category', o.category,
+                'description', o.description, 'responsible_entity', o.responsible_entity,
+                'legal_base', o.legal_base, 'is_active', o.is_active,
+                'display_order', o.display_order
+            ) ORDER BY o.display_order), '[]'::json)
+            FROM obligation_types AS o
+            WHERE o.is_active
+        ),
+        'periodicities', (
+            SELECT coalesce(json_object_agg(p.obligation_type_id, p.frequency), '{}'::json)
+            FROM obligation_periodicities AS p
+            WHERE p.fiscal_year_id = :fiscal_year_id
+        )
+    )
+    """
+)
+
+
+class PgEvaluationContextLoader:
+    """
+    Loads the evaluation context of a fiscal year in a single round trip,
+    instead of one query per kind of reference data.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def load(self, fiscal_year_id: UUID) -> EvaluationContext:
+        result = await self._db.execute(CONTEXT_QUERY, {"fiscal_year_id": fiscal_year_id})
+        data = result.scalar_one()
+        if data["fiscal_year"] is None:
+            raise ValueError("Fiscal year not found")
+        if data["rule_set"] is None:
+            raise ValueError(f"No active rule set for fiscal year {data['fiscal_year']['year']}")
+        return EvaluationContext.from_reference(data)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.evaluation_job import EvaluationJobEntity
+from app.domain.interfaces.evaluation_job_repository import EvaluationJobRepository
+from app.domain.value_objects.job_status import JobStatus
+from app.infrastructure.database.models.evaluation_job import EvaluationJob
+
+JOB_COLUMNS = tuple(EvaluationJob.__table__.c)
+
+
+class PgEvaluationJobRepository(EvaluationJobRepository):
+    """
+    Evaluation jobs queued in Postgres. Workers claim jobs with
+    `SELECT ... FOR UPDATE SKIP LOCKED`, so any number of them can poll the
+    table without blocking on, or double-claiming, each other's jobs.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def enqueue(self, job: EvaluationJobEntity) -> EvaluationJobEntity:
+        if job.id is None:
+            job.id = uuid.uuid4()
+        result = await self._db.execute(
+            insert(EvaluationJob)
+            .values(
+                id=job.id,
+                user_id=job.user_id,
+                tenant_id=job.tenant_id,
+                tax_profile_id=job.tax_profile_id,
+                status=JobStatus.QUEUED.value,
+            )
+            .returning(*JOB_COLUMNS)
+        )
+        return self._to_entity(result.one())
+
+    async def get_by_id(
+        self, job_id: UUID, user_id: UUID, tenant_id: UUID
+    ) -> EvaluationJobEntity | None:
+        result = await self._db.execute(
+            select(*JOB_COLUMNS).where(
+                EvaluationJob.id == job_id,
+                EvaluationJob.user_id == user_id,
+                EvaluationJob.tenant_id == tenant_id,
+            )
+        )
+        row = result.one_or_none()
+        return self._to_entity(row) if row else None
+
+    async def claim_next(
+        self, stale_after_seconds: int, max_attempts: int
+    ) -> EvaluationJobEntity | None:
+        """
+        Mark the oldest claimable job as running and return it. Jobs left
+        running by a worker that died are claimed again once they are older
+        than `stale_after_seconds`, up to `max_attempts` times.
+        """
+        claimable = (
+            select(EvaluationJob.id)
+            .where(
+                or_(
+                    EvaluationJob.status == JobStatus.QUEUED.value,
+                    and_(
+                        self._stale(stale_after_seconds),
+                        EvaluationJob.attempts < max_attempts,
+                    ),
+                )
+            )
+            .order_by(EvaluationJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self._db.execute(
+            update(EvaluationJob)
+            .where(EvaluationJob.id == claimable)
+            .values(
+                status=JobStatus.RUNNING.value,
+                started_at=func.now(),
+                attempts=EvaluationJob.attempts + 1,
+            )
+            .returning(*JOB_COLUMNS)
+        )
+        row = result.one_or_none()
+        return self._to_entity(row) if row else None
+
+    async def fail_exhausted(self, stale_after_seconds: int, max_attempts: int) -> int:
+        """Mark stale running jobs that used all their attempts as failed."""
+        result = await self._db.execute(
+            update(EvaluationJob)
+            .where(
+                self._stale(stale_after_seconds),
+                EvaluationJob.attempts >= max_attempts,
+            )
+            .values(
+                status=JobStatus.FAILED.value,
+                error="Evaluation did not finish",
+                finished_at=func.now(),
+            )
+        )
+        return result.rowcount
+
+    async def complete(self, job_id: UUID, evaluation_id: UUID) -> None:
+        await self._db.execute(
+            update(EvaluationJob)
+            .where(EvaluationJob.id == job_id)
+            .values(
+                status=JobStatus.SUCCEEDED.value,
+                evaluation_id=evaluation_id,
+                error=None,
+                finished_at=func.now(),
+            )
+        )
+
+    async def fail(self, job_id: UUID, error: str, retry: bool = False) -> None:
+        """Record a failure; with `retry` the job goes back to the queue."""
+        await self._db.execute(
+            update(EvaluationJob)
+            .where(EvaluationJob.id == job_id)
+            .values(
+                status=JobStatus.QUEUED.value if retry else JobStatus.FAILED.value,
+                error=error,
+                finished_at=None if retry else func.now(),
+            )
+        )
+
+    @staticmethod
+    def _stale(stale_after_seconds: int):
+        return and_(
+            EvaluationJob.status == JobStatus.RUNNING.value,
+            EvaluationJob.started_at < func.now() - timedelta(seconds=stale_after_seconds),
+        )
+
+    @staticmethod
+    def _to_entity(row) -> EvaluationJobEntity:
+        return EvaluationJobEntity(**row._mapping)
@@ -1,15 +1,62 @@
 from __future__ import annotations
 
+import json
 import uuid
+from collections.abc import Mapping
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Table, func, insert, literal, select, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, selectinload
 
-from app.domain.entities.evaluation import EvaluationEntity, EvaluationResultEntity
+from app.config import settings
+from app.domain.entities.evaluation import (
+    EvaluationEntity,
+    EvaluationResultEntity,
+    EvaluationSummaryEntity,
+)
+from app.domain.entities.rule import RuleConditionEntity
 from app.domain.interfaces.evaluation_repository import EvaluationRepository
+from app.domain.value_objects.condition_trace import ConditionTrace, PackedConditionTrace
+from app.domain.value_objects.evaluation_detail import EvaluationDetail
 from app.infrastructure.database.models.evaluation import Evaluation, EvaluationResult
+from app.infrastructure.database.models.rule import RuleCondition
+
+# summary() key -> counter column on evaluations
+SUMMARY_COLUMNS = {
+    "total_obligations_evaluated": "total_obligations_evaluated",
+    "applies": "applies_count",
+    "does_not_apply": "does_not_apply_count",
+    "conditional": "conditional_count",
+    "needs_more_info": "needs_more_info_count",
+}
+
+# Loader options per detail level; heavy JSONB columns are only read when needed
+DETAIL_OPTIONS = {
+    EvaluationDetail.SUMMARY: (defer(Evaluation.profile_snapshot),),
+    EvaluationDetail.RESULTS: (
+        selectinload(Evaluation.results).defer(
+            EvaluationResult.conditions_evaluated, EvaluationResult.condition_trace
+        ),
+    ),
+    EvaluationDetail.FULL: (selectinload(Evaluation.results),),
+}
+
+
+def _trace_columns(result: EvaluationResultEntity) -> dict:
+    """
+    Engine traces and copied packed traces are stored packed; any other
+    sequence as the expanded dicts.
+    """
+    if result.packed_trace is not None:
+        return {"conditions_evaluated": None, "condition_trace": result.packed_trace}
+    trace = result.conditions_evaluated
+    if isinstance(trace, ConditionTrace):
+        return {"conditions_evaluated": None, "condition_trace": trace.pack()}
+    return {"conditions_evaluated": list(trace), "condition_trace": None}
 
 
 class PgEvaluationRepository(EvaluationRepository):
@@ -17,64 +64,263 @@ class PgEvaluationRepository(EvaluationRepository):
         self._db = db
 
     async def create(self, evaluation: EvaluationEntity) -> EvaluationEntity:
-        db_eval = Evaluation(
-            id=evaluation.id or uuid.uuid4(),
-            user_id=evaluation.user_id,
-            tenant_id=evaluation.tenant_id,
-            tax_profile_id=evaluation.tax_profile_id,
-            rule_set_id=evaluation.rule_set_id,
-            fiscal_year_id=evaluation.fiscal_year_id,
-            status=evaluation.status,
-            evaluated_at=evaluation.evaluated_at,
-            profile_snapshot=evaluation.profile_snapshot,
-        )
-        self._db.add(db_eval)
-        await self._db.flush()
-
-        for result in evaluation.results:
-            db_result = EvaluationResult(
-                id=uuid.uuid4(),
-                evaluation_id=db_eval.id,
-                obligation_type_id=result.obligation_type_id,
-                result=result.result,
-                triggered_rule_id=result.triggered_rule_id,
-                conditions_evaluated=result.conditions_evaluated,
-                explanation_es=result.explanation_es,
-                legal_references=result.legal_references,
-                periodicity=result.periodicity,
-                responsible_entity=result.responsible_entity,
+        """
+        Write the evaluation and its results in one round trip: the evaluation
+        row is inserted in a CTE and the results with a multi-row VALUES list.
+        Rows bypass the ORM unit of work entirely.
+        """
+        if evaluation.id is None:
+            evaluation.id = uuid.uuid4()
+
+        stmt = insert(Evaluation).values(self._evaluation_row(evaluation))
+        result_rows = self._result_rows([evaluation])
+        if result_rows:
+            stmt = insert(EvaluationResult).values(result_rows).add_cte(
+                stmt.cte("new_evaluation")
             )
-            self._db.add(db_result)
+        await self._db.execute(stmt)
+        return evaluation
+
+    async def create_many(self, evaluations: list[EvaluationEntity]) -> list[EvaluationEntity]:
+        """
+        Persist several evaluations with one bulk INSERT per table, or with
+        COPY once the batch reaches EVALUATION_COPY_MIN_ROWS result rows.
+        """
+        if not evaluations:
+            return evaluations
+
+        for evaluation in evaluations:
+            if evaluation.id is None:
+                evaluation.id = uuid.uuid4()
+
+        evaluation_rows = [self._evaluation_row(e) for e in evaluations]
+        result_rows = self._result_rows(evaluations)
 
-        await self._db.flush()
+        if len(result_rows) >= settings.EVALUATION_COPY_MIN_ROWS:
+            await self._copy_rows(Evaluation.__table__, evaluation_rows)
+            await self._copy_rows(EvaluationResult.__table__, result_rows)
+            return evaluations
+
+        await self._db.execute(insert(Evaluation), evaluation_rows)
+        if result_rows:
+            await self._db.execute(insert(EvaluationResult), result_rows)
+        return evaluations
+
+    async def create_from(
+        self, evaluation: EvaluationEntity, source_evaluation_id: UUID
+    ) -> EvaluationEntity:
+        """
+        Insert a new evaluation whose results are copied server-side from an
+        existing one (INSERT ... SELECT), in a single statement.
+        """
+        if evaluation.id is None:
+            evaluation.id = uuid.uuid4()
+
+        new_evaluation = insert(Evaluation).values(self._evaluation_row(evaluation))
+        copied = [
+            c.name
+            for c in EvaluationResult.__table__.c
+            if c.name not in ("id", "evaluation_id", "fiscal_year_id")
+        ]
+        stmt = (
+            insert(EvaluationResult)
+            .from_select(
+                ["id", "evaluation_id", "fiscal_year_id", *copied],
+                select(
+                    func.gen_random_uuid(),
+                    literal(evaluation.id, postgresql.UUID(as_uuid=True)),
+                    literal(evaluation.fiscal_year_id, postgresql.UUID(as_uuid=True)),
+                    *(EvaluationResult.__table__.c[name] for name in copied),
+                ).where(
+                    EvaluationResult.evaluation_id == source_evaluation_id,
+                    # Memo sources share the profile, hence the fiscal year
+                    EvaluationResult.fiscal_year_id == evaluation.fiscal_year_id,
+                ),
+            )
+            .add_cte(new_evaluation.cte("new_evaluation"))
+        )
+        await self._db.execute(stmt)
         return evaluation
 
-    async def get_by_id(self, evaluation_id: UUID, tenant_id: UUID) -> EvaluationEntity | None:
+    async def get_latest_by_input_hash(
+        self,
+        tax_profile_id: UUID,
+        input_hash: str,
+        tenant_id: UUID,
+        detail: EvaluationDetail = EvaluationDetail.FULL,
+        expand_traces: bool = True,
+    ) -> EvaluationEntity | None:
+        """
+        Without `expand_traces`, FULL results keep packed traces as stored
+        (`packed_trace`) instead of resolving their conditions.
+        """
         result = await self._db.execute(
             select(Evaluation)
-            .options(selectinload(Evaluation.results))
+            .options(*DETAIL_OPTIONS[detail])
             .where(
-                Evaluation.id == evaluation_id,
+                Evaluation.tax_profile_id == tax_profile_id,
+                Evaluation.input_hash == input_hash,
                 Evaluation.tenant_id == tenant_id,
             )
+            .order_by(Evaluation.created_at.desc())
+            .limit(1)
         )
         db_eval = result.scalar_one_or_none()
-        return self._to_entity(db_eval) if db_eval else None
+        if not db_eval:
+            return None
+        expand = expand_traces and detail == EvaluationDetail.FULL
+        traces = await self._expand_traces(db_eval) if expand else {}
+        return self._to_entity(db_eval, detail, traces)
+
+    async def _copy_rows(self, table: Table, rows: list[dict]) -> None:
+        if not rows:
+            return
+        columns = list(rows[0])
+        json_columns = {c for c in columns if isinstance(table.c[c].type, JSONB)}
+        records = [
+            tuple(
+                json.dumps(row[c]) if c in json_columns and row[c] is not None else row[c]
+                for c in columns
+            )
+            for row in rows
+        ]
 
-    async def list_by_user(self, user_id: UUID, tenant_id: UUID) -> list[EvaluationEntity]:
+        connection = await self._db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name, columns=columns, records=records
+        )
+
+    @staticmethod
+    def _evaluation_row(evaluation: EvaluationEntity) -> dict:
+        return {
+            "id": evaluation.id,
+            "user_id": evaluation.user_id,
+            "tenant_id": evaluation.tenant_id,
+            "tax_profile_id": evaluation.tax_profile_id,
+            "rule_set_id": evaluation.rule_set_id,
+            "fiscal_year_id": evaluation.fiscal_year_id,
+            "status": evaluation.status,
+            "evaluated_at": evaluation.evaluated_at,
+            "profile_snapshot": evaluation.profile_snapshot,
+            "input_hash": evaluation.input_hash,
+            **{
+                SUMMARY_COLUMNS[key]: count
+                for key, count in evaluation.summary().items()
+            },
+        }
+
+    @staticmethod
+    def _result_rows(evaluations: list[EvaluationEntity]) -> list[dict]:
+        return [
+            {
+                "id": uuid.uuid4(),
+                "evaluation_id": e.id,
+                "fiscal_year_id": e.fiscal_year_id,
+                "obligation_type_id": r.obligation_type_id,
+                "result": r.result,
+                "triggered_rule_id": r.triggered_rule_id,
+                **_trace_columns(r),
+                "explanation_es": r.explanation_es,
+                "legal_references": r.legal_references,
+                "periodicity": r.periodicity,
+                "responsible_entity": r.responsible_entity,
+            }
+            for e in evaluations
+            for r in e.results
+        ]
+
+    async def get_by_id(
+        self,
+        evaluation_id: UUID,
+        tenant_id: UUID,
+        detail: EvaluationDetail = EvaluationDetail.FULL,
+    ) -> EvaluationEntity | None:
         result = await self._db.execute(
             select(Evaluation)
-            .options(selectinload(Evaluation.results))
+            .options(*DETAIL_OPTIONS[detail])
+            .where(
+                Evaluation.id == evaluation_id,
+                Evaluation.tenant_id == tenant_id,
+            )
+        )
+        db_eval = result.scalar_one_or_none()
+        if not db_eval:
+            return None
+        traces = await self._expand_traces(db_eval) if detail == EvaluationDetail.FULL else {}
+        return self._to_entity(db_eval, detail, traces)
+
+    async def list_summaries(
+        self,
+        user_id: UUID,
+        tenant_id: UUID,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[EvaluationSummaryEntity]:
+        """
+        Newest-first evaluations with their stored result counters; results
+        are not read. Pages are keyset-based: `after` is the (created_at, id)
+        of the last row of the previous page.
+        """
+        stmt = (
+            select(
+                Evaluation.id,
+                Evaluation.fiscal_year_id,
+                Evaluation.status,
+                Evaluation.evaluated_at,
+                Evaluation.created_at,
+                *(
+                    Evaluation.__table__.c[column].label(key)
+                    for key, column in SUMMARY_COLUMNS.items()
+                ),
+            )
             .where(
                 Evaluation.user_id == user_id,
                 Evaluation.tenant_id == tenant_id,
             )
-            .order_by(Evaluation.created_at.desc())
+            .order_by(Evaluation.created_at.desc(), Evaluation.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Evaluation.created_at, Evaluation.id) < tuple_(*after))
+        result = await self._db.execute(stmt)
+        return [EvaluationSummaryEntity(**row._mapping) for row in result]
+
+    async def _expand_traces(self, db_eval: Evaluation) -> dict[UUID, list[dict]]:
+        """Expand packed condition traces, loading the referenced conditions in one query."""
+        packed = {
+            r.id: PackedConditionTrace.from_bytes(r.condition_trace)
+            for r in db_eval.results
+            if r.condition_trace is not None
+        }
+        if not packed:
+            return {}
+        condition_ids = {cid for trace in packed.values() for cid in trace.condition_ids}
+        result = await self._db.execute(
+            select(
+                RuleCondition.id,
+                RuleCondition.rule_id,
+                RuleCondition.field,
+                RuleCondition.operator,
+                RuleCondition.value_type,
+                RuleCondition.value,
+                RuleCondition.value_secondary,
+                RuleCondition.description,
+            ).where(RuleCondition.id.in_(condition_ids))
         )
-        return [self._to_entity(e) for e in result.scalars().all()]
+        conditions = {row.id: RuleConditionEntity(**row._mapping) for row in result}
+        return {result_id: trace.expand(conditions) for result_id, trace in packed.items()}
 
     @staticmethod
-    def _to_entity(db: Evaluation) -> EvaluationEntity:
+    def _to_entity(
+        db: Evaluation,
+        detail: EvaluationDetail = EvaluationDetail.FULL,
+        traces: Mapping[UUID, list[dict]] | None = None,
+    ) -> EvaluationEntity:
+        """
+        Map a row loaded with DETAIL_OPTIONS[detail]; deferred columns are not
+        touched. `traces` holds the expanded packed traces by result id.
+        """
         return EvaluationEntity(
             id=db.id,
             user_id=db.user_id,
@@ -84,7 +330,11 @@ class PgEvaluationRepository(EvaluationRepository):
             fiscal_year_id=db.fiscal_year_id,
             status=db.status,
             evaluated_at=db.evaluated_at,
-            profile_snapshot=db.profile_snapshot,
+            profile_snapshot=db.profile_snapshot if detail != EvaluationDetail.SUMMARY else {},
+            input_hash=db.input_hash,
+            result_counts={
+                key: getattr(db, column) for key, column in SUMMARY_COLUMNS.items()
+            },
             results=[
                 EvaluationResultEntity(
                     obligation_type_id=r.obligation_type_id,
@@ -94,12 +344,19 @@ class PgEvaluationRepository(EvaluationRepository):
                     periodicity=r.periodicity,
                     responsible_entity=r.responsible_entity,
                     triggered_rule_id=r.triggered_rule_id,
-                    conditions_evaluated=r.conditions_evaluated,
+                    conditions_evaluated=(
+                        (traces or {}).get(r.id, r.conditions_evaluated or [])
+                        if detail == EvaluationDetail.FULL
+                        else []
+                    ),
                     explanation_es=r.explanation_es,
                     legal_references=r.legal_references or [],
+                    packed_trace=(
+                        r.condition_trace if detail == EvaluationDetail.FULL else None
+                    ),
                 )
                 for r in db.results
             ]
-            if db.results
+            if detail != EvaluationDetail.SUMMARY
             else [],
         )
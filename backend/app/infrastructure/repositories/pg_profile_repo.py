@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import uuid
+from collections.abc import AsyncIterator
 from uuid import UUID
 
 from sqlalchemy import select, delete
@@ -53,6 +54,17 @@ class PgProfileRepository(ProfileRepository):
         db_profile = result.scalar_one_or_none()
         return self._to_entity(db_profile) if db_profile else None
 
+    async def get_many(self, profile_ids: list[UUID], tenant_id: UUID) -> list[TaxProfileEntity]:
+        if not profile_ids:
+            return []
+        result = await self._db.execute(
+            select(TaxProfile).where(
+                TaxProfile.id.in_(profile_ids),
+                TaxProfile.tenant_id == tenant_id,
+            )
+        )
+        return [self._to_entity(row) for row in result.scalars().all()]
+
     async def list_by_user(self, user_id: UUID, tenant_id: UUID) -> list[TaxProfileEntity]:
         result = await self._db.execute(
             select(TaxProfile).where(
@@ -62,6 +74,22 @@ class PgProfileRepository(ProfileRepository):
         )
         return [self._to_entity(row) for row in result.scalars().all()]
 
+    async def stream_by_fiscal_year(
+        self, fiscal_year_id: UUID, tenant_id: UUID, batch_size: int
+    ) -> AsyncIterator[list[TaxProfileEntity]]:
+        # Plain rows from a server-side cursor: nothing is added to the
+        # session, so memory stays bounded by the batch size.
+        result = await self._db.stream(
+            select(*TaxProfile.__table__.c)
+            .where(
+                TaxProfile.fiscal_year_id == fiscal_year_id,
+                TaxProfile.tenant_id == tenant_id,
+            )
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions(batch_size):
+            yield [self._to_entity(row) for row in rows]
+
     async def update(self, profile: TaxProfileEntity) -> TaxProfileEntity:
         result = await self._db.execute(
             select(TaxProfile).where(TaxProfile.id == profile.id)
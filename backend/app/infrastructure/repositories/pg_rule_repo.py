@@ -10,6 +10,7 @@ from sqlalchemy.orm import selectinload
 
 from app.domain.entities.rule import RuleConditionEntity, RuleEntity, RuleSetEntity
 from app.domain.interfaces.rule_repository import RuleRepository
+from app.infrastructure.cache.reference_cache import invalidate_evaluation_context
 from app.infrastructure.database.models.rule import Rule, RuleCondition, RuleSet
 
 
@@ -85,6 +86,7 @@ class PgRuleRepository(RuleRepository):
         db_rs.status = "active"
         db_rs.published_at = datetime.now(timezone.utc)
         await self._db.flush()
+        invalidate_evaluation_context(self._db, db_rs.fiscal_year_id)
         return self._to_entity(db_rs)
 
     def _to_entity(self, db: RuleSet) -> RuleSetEntity:
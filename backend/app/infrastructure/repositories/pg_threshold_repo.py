@@ -21,6 +21,15 @@ class PgThresholdRepository(ThresholdRepository):
         thresholds = result.scalars().all()
         return {t.code: t.value_cop for t in thresholds if t.value_cop is not None}
 
+    async def get_uvt_amounts(self, fiscal_year_id: UUID) -> dict[str, Decimal]:
+        result = await self._db.execute(
+            select(Threshold.code, Threshold.value_uvt).where(
+                Threshold.fiscal_year_id == fiscal_year_id,
+                Threshold.value_uvt.is_not(None),
+            )
+        )
+        return dict(result.tuples().all())
+
     async def get_threshold_detail(self, fiscal_year_id: UUID, code: str) -> dict | None:
         result = await self._db.execute(
             select(Threshold).where(
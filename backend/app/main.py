@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 
@@ -7,12 +9,31 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.v1.profiles import EVALUATION_ID_HEADER
 from app.api.v1.router import api_v1_router
+from app.application.engine_executor import engine_executor
+from app.infrastructure.cache.redis_cache import cache
+from app.infrastructure.cache.reference_cache import reference_cache
+from app.infrastructure.database.session import async_session_factory
+from app.workers.evaluation_worker import EvaluationWorkerPool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-    yield
+    await cache.connect()
+    listener = asyncio.create_task(reference_cache.listen())
+    workers = EvaluationWorkerPool(async_session_factory)
+    workers.start()
+    try:
+        yield
+    finally:
+        await workers.stop()
+        engine_executor.shutdown()
+        listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await listener
+        await cache.disconnect()
 
 
 def create_app() -> FastAPI:
@@ -29,6 +50,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, EVALUATION_ID_HEADER, "Location", "Retry-After"],
     )
 
     application.include_router(api_v1_router, prefix=settings.API_V1_PREFIX)
@@ -9,6 +9,8 @@ FISCAL_YEAR_2025 = {
     "notes": "Año gravable 2025. UVT fijado por Resolución DIAN.",
 }
 
+# No nit_schedule is seeded: due dates must come from the decree published
+# for the year, and until one is loaded calendars get no entries.
 PERIODICITIES_2025 = [
     {"obligation_code": "renta", "frequency": "anual", "description": "Declaración anual de renta"},
     {"obligation_code": "iva", "frequency": "bimestral", "description": "Declaración bimestral de IVA"},
@@ -14,6 +14,7 @@ from app.infrastructure.database.models.fiscal_year import FiscalYear
 from app.infrastructure.database.models.threshold import Threshold
 from app.infrastructure.database.models.rule import RuleSet, Rule, RuleCondition
 from app.infrastructure.database.models.disclaimer import DisclaimerVersion
+from app.infrastructure.database.partitions import ensure_partitions
 
 from app.seeds.obligation_types import OBLIGATION_TYPES
 from app.seeds.fiscal_year_2025 import FISCAL_YEAR_2025, PERIODICITIES_2025
@@ -213,6 +214,7 @@ async def run_all_seeds() -> None:
     async with async_session_factory() as db:
         obligation_mapping = await seed_obligation_types(db)
         fiscal_year_id = await seed_fiscal_year(db)
+        await ensure_partitions(db)
         await seed_thresholds(db, fiscal_year_id)
         await seed_periodicities(db, fiscal_year_id, obligation_mapping)
         await seed_rules(db, fiscal_year_id, obligation_mapping)
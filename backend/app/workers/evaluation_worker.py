@@ -0,0 +1,149 @@
+"""
+Evaluation worker pool - runs evaluations queued with `POST /evaluations?mode=async`.
+
+The API process starts EVALUATION_WORKERS workers on startup. Workers can
+also run as a separate process, in which case set EVALUATION_WORKERS=0 on
+the API:
+
+    python -m app.workers.evaluation_worker --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import sys
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.application.calendar_service import CalendarService
+from app.application.deadline_service import DeadlineService
+from app.application.evaluation_service import EvaluationService
+from app.config import settings
+from app.domain.entities.evaluation_job import EvaluationJobEntity
+from app.infrastructure.repositories.pg_calendar_repo import PgCalendarRepository
+from app.infrastructure.repositories.pg_deadline_repo import PgDeadlineRepository
+from app.infrastructure.repositories.pg_evaluation_job_repo import PgEvaluationJobRepository
+from app.infrastructure.repositories.pg_evaluation_repo import PgEvaluationRepository
+from app.infrastructure.repositories.pg_profile_repo import PgProfileRepository
+
+logger = structlog.get_logger(__name__)
+
+
+class EvaluationWorkerPool:
+    """
+    A fixed number of asyncio workers draining the evaluation job queue.
+
+    A job is claimed in its own short transaction, so the claim is visible
+    (and the row lock released) while the evaluation runs. The evaluation
+    and the job's completion are then committed together. A worker that
+    dies mid-job leaves it running; it is claimed again once stale.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int = settings.EVALUATION_WORKERS,
+        poll_interval: float = settings.EVALUATION_JOB_POLL_SECONDS,
+        stale_after_seconds: int = settings.EVALUATION_JOB_STALE_SECONDS,
+        max_attempts: int = settings.EVALUATION_JOB_MAX_ATTEMPTS,
+    ) -> None:
+        self._session_factory = session_factory
+        self._concurrency = concurrency
+        self._poll_interval = poll_interval
+        self._stale_after_seconds = stale_after_seconds
+        self._max_attempts = max_attempts
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def run_once(self) -> bool:
+        """Claim and run one job. Returns False when the queue is empty."""
+        async with self._session_factory() as db:
+            jobs = PgEvaluationJobRepository(db)
+            await jobs.fail_exhausted(self._stale_after_seconds, self._max_attempts)
+            job = await jobs.claim_next(self._stale_after_seconds, self._max_attempts)
+            await db.commit()
+        if job is None:
+            return False
+
+        async with self._session_factory() as db:
+            await self._run(db, job)
+        return True
+
+    async def _run(self, db: AsyncSession, job: EvaluationJobEntity) -> None:
+        jobs = PgEvaluationJobRepository(db)
+        service = EvaluationService(
+            db=db,
+            profile_repo=PgProfileRepository(db),
+            evaluation_repo=PgEvaluationRepository(db),
+            calendar_service=CalendarService(
+                PgCalendarRepository(db), DeadlineService(PgDeadlineRepository(db))
+            ),
+        )
+        try:
+            evaluation = await service.evaluate(job.tax_profile_id, job.user_id, job.tenant_id)
+            await jobs.complete(job.id, evaluation.id)
+        except ValueError as e:
+            await db.rollback()
+            await jobs.fail(job.id, str(e))
+        except Exception:
+            logger.exception("evaluation_job_failed", job_id=str(job.id))
+            await db.rollback()
+            await jobs.fail(job.id, "Evaluation failed", retry=job.attempts < self._max_attempts)
+        try:
+            await db.commit()
+        except Exception:
+            # The evaluation could not be saved; record the failure on its own
+            logger.exception("evaluation_job_commit_failed", job_id=str(job.id))
+            await db.rollback()
+            await jobs.fail(job.id, "Evaluation failed", retry=job.attempts < self._max_attempts)
+            await db.commit()
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                busy = await self.run_once()
+            except Exception:
+                logger.exception("evaluation_worker_poll_failed")
+                busy = False
+            if not busy:
+                await asyncio.sleep(self._poll_interval)
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self._concurrency)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+
+async def _serve(workers: int) -> None:
+    from app.infrastructure.cache.redis_cache import cache
+    from app.infrastructure.database.session import async_session_factory
+
+    await cache.connect()
+    pool = EvaluationWorkerPool(async_session_factory, concurrency=workers)
+    pool.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+        await cache.disconnect()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the evaluation worker pool.")
+    parser.add_argument("--workers", type=int, default=max(settings.EVALUATION_WORKERS, 1))
+    args = parser.parse_args(argv)
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args.workers))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
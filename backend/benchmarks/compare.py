@@ -0,0 +1,69 @@
+"""
+Compare two benchmark reports.
+
+    python -m benchmarks.compare before.json after.json --tolerance 0.10
+
+Exits with status 1 when any benchmark's median got slower than the tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+
+def compare(before: dict, after: dict, tolerance: float) -> tuple[list[dict], bool]:
+    rows = []
+    regressed = False
+    for name, new in sorted(after["benchmarks"].items()):
+        old = before["benchmarks"].get(name)
+        if old is None:
+            rows.append({"name": name, "before": None, "after": new["median"], "ratio": None})
+            continue
+        ratio = new["median"] / old["median"] if old["median"] else float("inf")
+        slower = ratio > 1 + tolerance
+        regressed = regressed or slower
+        rows.append({
+            "name": name,
+            "before": old["median"],
+            "after": new["median"],
+            "ratio": ratio,
+            "regression": slower,
+        })
+    return rows, regressed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports.")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    parser.add_argument("--json", action="store_true", help="print the comparison as JSON")
+    args = parser.parse_args(argv)
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    if before.get("params") != after.get("params"):
+        print("warning: reports were produced with different parameters", file=sys.stderr)
+
+    rows, regressed = compare(before, after, args.tolerance)
+    if args.json:
+        report = {"tolerance": args.tolerance, "regressed": regressed, "rows": rows}
+        print(json.dumps(report, indent=2))
+    else:
+        for row in rows:
+            if row["ratio"] is None:
+                print(f"{row['name']:45} {'new':>12} {row['after'] * 1e6:12.2f}us")
+                continue
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(
+                f"{row['name']:45} {row['before'] * 1e6:12.2f}us {row['after'] * 1e6:12.2f}us "
+                f"{row['ratio']:7.2f}x{flag}"
+            )
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
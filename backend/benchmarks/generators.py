@@ -0,0 +1,184 @@
+"""Synthetic data generators for engine benchmarks."""
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+
+from app.domain.entities.obligation import ObligationTypeEntity
+from app.domain.entities.rule import RuleConditionEntity, RuleEntity, RuleSetEntity
+from app.domain.entities.tax_profile import TaxProfileEntity
+from app.seeds.obligation_types import OBLIGATION_TYPES
+from app.seeds.rules_2025 import RULES_2025
+from app.seeds.thresholds_2025 import THRESHOLDS_2025, UVT_2025
+
+PERSONA_TYPES = ["natural", "natural_comerciante", "juridica"]
+REGIMES = ["ordinario", "simple", "no_responsable"]
+CITIES = ["Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena", "Bucaramanga", "Pereira"]
+CIIU_CODES = ["4711", "4719", "5611", "6201", "6910", "7020", "8559", "9602"]
+
+
+@dataclass
+class GeneratedRuleSet:
+    rule_set: RuleSetEntity
+    obligations: list[ObligationTypeEntity]
+    thresholds: dict[str, Decimal]
+
+    @property
+    def condition_count(self) -> int:
+        return sum(len(r.conditions) for r in self.rule_set.rules)
+
+
+def _amount(rng: random.Random, median_uvt: int) -> Decimal:
+    """Log-normal COP amount around `median_uvt` UVT, rounded to pesos."""
+    uvt = rng.lognormvariate(0, 1.1) * median_uvt
+    return (Decimal(str(round(uvt, 2))) * UVT_2025).quantize(Decimal("1"))
+
+
+def generate_profiles(count: int, seed: int = 2025) -> list[TaxProfileEntity]:
+    """Profiles whose income and asset distribution straddles the 2025 thresholds."""
+    rng = random.Random(seed)
+    fiscal_year_id = uuid.UUID(int=rng.getrandbits(128))
+    profiles = []
+    for _ in range(count):
+        persona_type = rng.choice(PERSONA_TYPES)
+        has_employees = rng.random() < 0.35
+        profiles.append(
+            TaxProfileEntity(
+                id=uuid.UUID(int=rng.getrandbits(128)),
+                user_id=uuid.UUID(int=rng.getrandbits(128)),
+                tenant_id=uuid.UUID(int=rng.getrandbits(128)),
+                fiscal_year_id=fiscal_year_id,
+                persona_type=persona_type,
+                regime=rng.choices(REGIMES, weights=[6, 3, 1])[0],
+                is_iva_responsable=rng.random() < 0.4,
+                ingresos_brutos_cop=_amount(rng, 1400),
+                patrimonio_bruto_cop=_amount(rng, 3000) if rng.random() < 0.8 else None,
+                consignaciones_cop=_amount(rng, 1000) if rng.random() < 0.6 else None,
+                compras_consumos_cop=_amount(rng, 800) if rng.random() < 0.6 else None,
+                has_employees=has_employees,
+                employee_count=rng.randint(1, 40) if has_employees else 0,
+                economic_activity_ciiu=rng.choice(CIIU_CODES),
+                city=rng.choice(CITIES),
+                has_rut=rng.random() < 0.8,
+                has_comercio_registration=persona_type != "natural" or rng.random() < 0.3,
+                nit_last_digit=rng.randint(0, 9),
+            )
+        )
+    return profiles
+
+
+def _obligation(data: dict, code: str) -> ObligationTypeEntity:
+    return ObligationTypeEntity(
+        id=uuid.uuid4(),
+        code=code,
+        name=data["name"],
+        category=data["category"],
+        description=data["description"],
+        responsible_entity=data["responsible_entity"],
+        legal_base=data.get("legal_base"),
+        display_order=data.get("display_order", 0),
+    )
+
+
+def generate_rule_set(scale: int = 1, seed: int = 2025) -> GeneratedRuleSet:
+    """
+    Scale the seeded 2025 rules `scale` times. Every copy gets its own set of
+    obligation types and perturbed thresholds, and extra fall-through rules
+    are mixed in so deeper priority chains are exercised.
+    """
+    rng = random.Random(seed)
+    obligations: list[ObligationTypeEntity] = []
+    thresholds = {"uvt_value": UVT_2025}
+    rule_set_id = uuid.uuid4()
+    rules: list[RuleEntity] = []
+
+    for copy in range(scale):
+        suffix = "" if copy == 0 else f"_{copy}"
+        by_code = {}
+        for data in OBLIGATION_TYPES:
+            obligation = _obligation(data, data["code"] + suffix)
+            obligations.append(obligation)
+            by_code[data["code"]] = obligation
+
+        for t in THRESHOLDS_2025:
+            factor = Decimal(1) if copy == 0 else Decimal(str(round(rng.uniform(0.8, 1.2), 3)))
+            thresholds[t["code"] + suffix] = (t["value_cop"] * factor).quantize(Decimal("1"))
+
+        for data in RULES_2025:
+            obligation = by_code[data["obligation_code"]]
+            rules.append(_rule(rule_set_id, obligation, data, suffix))
+            if copy > 0:
+                rules.append(_fallthrough_rule(rule_set_id, obligation, data, rng))
+
+    rule_set = RuleSetEntity(
+        id=rule_set_id, fiscal_year_id=uuid.uuid4(), version=1, status="active", rules=rules
+    )
+    return GeneratedRuleSet(rule_set=rule_set, obligations=obligations, thresholds=thresholds)
+
+
+def _rule(rule_set_id: uuid.UUID, obligation, data: dict, suffix: str) -> RuleEntity:
+    rule_id = uuid.uuid4()
+    conditions = []
+    for c in data["conditions"]:
+        value = c.get("value")
+        if c["value_type"] == "threshold_ref":
+            value = value + suffix
+        conditions.append(
+            RuleConditionEntity(
+                id=uuid.uuid4(),
+                rule_id=rule_id,
+                field=c["field"],
+                operator=c["operator"],
+                value_type=c["value_type"],
+                value=value,
+                value_secondary=c.get("value_secondary"),
+                description=c.get("description"),
+            )
+        )
+    return RuleEntity(
+        id=rule_id,
+        rule_set_id=rule_set_id,
+        obligation_type_id=obligation.id,
+        code=data["code"] + suffix,
+        name=data["name"],
+        logic_operator=data["logic_operator"],
+        priority=data["priority"] * 10,
+        result_if_true=data["result_if_true"],
+        description=data.get("description"),
+        conditions=conditions,
+    )
+
+
+def _fallthrough_rule(
+    rule_set_id: uuid.UUID, obligation, data: dict, rng: random.Random
+) -> RuleEntity:
+    """A higher-priority rule that rarely matches, so evaluation falls through to the seeded one."""
+    rule_id = uuid.uuid4()
+    conditions = [
+        RuleConditionEntity(
+            id=uuid.uuid4(), rule_id=rule_id, field="city", operator="in",
+            value_type="literal", value=", ".join(rng.sample(CITIES, 2)),
+        ),
+        RuleConditionEntity(
+            id=uuid.uuid4(), rule_id=rule_id, field="ingresos_brutos_cop", operator="between",
+            value_type="uvt_expr", value=str(rng.randint(50_000, 60_000)),
+            value_secondary=str(rng.randint(60_000, 90_000)),
+        ),
+        RuleConditionEntity(
+            id=uuid.uuid4(), rule_id=rule_id, field="economic_activity_ciiu", operator="eq",
+            value_type="literal", value=rng.choice(CIIU_CODES),
+        ),
+    ]
+    return RuleEntity(
+        id=rule_id,
+        rule_set_id=rule_set_id,
+        obligation_type_id=obligation.id,
+        code=f"{data['code']}_fallthrough_{rule_id.hex[:6]}",
+        name=f"{data['name']} (variante)",
+        logic_operator="AND",
+        priority=data["priority"] * 10 - 5,
+        result_if_true="conditional",
+        conditions=conditions,
+    )
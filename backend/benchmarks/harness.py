@@ -0,0 +1,74 @@
+"""Timing helpers and JSON report format for the benchmark suite."""
+from __future__ import annotations
+
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+REPORT_SCHEMA_VERSION = 1
+
+
+def _stats(samples: list[float], number: int) -> dict:
+    per_op = [s / number for s in samples]
+    return {
+        "unit": "s/op",
+        "number": number,
+        "repeat": len(samples),
+        "mean": statistics.fmean(per_op),
+        "median": statistics.median(per_op),
+        "min": min(per_op),
+        "stdev": statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        "ops_per_sec": number / statistics.median(samples),
+    }
+
+
+def measure(fn: Callable[[], object], number: int, repeat: int = 5, warmup: int = 1) -> dict:
+    """Run `fn` `number` times per sample and report per-call timings."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append(time.perf_counter() - start)
+    return _stats(samples, number)
+
+
+async def measure_async(
+    fn: Callable[[], Awaitable[object]], number: int, repeat: int = 5, warmup: int = 1
+) -> dict:
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await fn()
+        samples.append(time.perf_counter() - start)
+    return _stats(samples, number)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(params: dict, results: dict[str, dict]) -> dict:
+    return {
+        "schema": REPORT_SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),  # noqa: UP017 (Python 3.10)
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": params,
+        "benchmarks": results,
+    }
@@ -0,0 +1,294 @@
+"""
+Engine benchmark runner.
+
+Usage (from backend/):
+
+    python -m benchmarks.run --profiles 500 --scale 10 --output before.json
+    python -m benchmarks.run --db --output after.json   # also time EvaluationService.evaluate
+    python -m benchmarks.compare before.json after.json
+
+`--db` runs against a migrated database at DATABASE_URL (or --database-url).
+All rows it creates are written inside one transaction that is rolled back.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import uuid
+from decimal import Decimal
+
+from app.domain.engine.engine import RulesEngine
+from app.domain.engine.explainer import ExplanationBuilder
+from app.domain.engine.operators import apply_operator
+from app.domain.engine.vectorized import VectorizedRulesEngine
+from benchmarks.generators import GeneratedRuleSet, generate_profiles, generate_rule_set
+from benchmarks.harness import build_report, measure, measure_async
+
+
+def _rules_by_obligation(generated: GeneratedRuleSet) -> dict:
+    rules_by_obligation: dict = {}
+    for rule in generated.rule_set.rules:
+        rules_by_obligation.setdefault(rule.obligation_type_id, []).append(rule)
+    return rules_by_obligation
+
+
+def bench_engine(generated: GeneratedRuleSet, profiles: list, repeat: int) -> dict[str, dict]:
+    engine = RulesEngine(thresholds=generated.thresholds, fiscal_year=2025)
+    rules_by_obligation = _rules_by_obligation(generated)
+    plan = engine.compile(generated.rule_set)
+    cycle = itertools.cycle(profiles)
+    number = len(profiles)
+
+    results = {
+        "rules_engine.evaluate": measure(
+            lambda: engine.evaluate(
+                next(cycle), generated.rule_set, generated.obligations, rules_by_obligation
+            ),
+            number=number,
+            repeat=repeat,
+        ),
+        "rules_engine.evaluate_compiled": measure(
+            lambda: engine.evaluate_compiled(next(cycle), plan, generated.obligations),
+            number=number,
+            repeat=repeat,
+        ),
+        "rules_engine.compile": measure(
+            lambda: engine.compile(generated.rule_set), number=1, repeat=repeat
+        ),
+    }
+
+    vectorized = VectorizedRulesEngine(thresholds=generated.thresholds, fiscal_year=2025)
+    batch = measure(
+        lambda: vectorized.decide(profiles, plan, generated.obligations), number=1, repeat=repeat
+    )
+    # Report per profile so it compares directly with the scalar engine
+    results["vectorized.decide_per_profile"] = {
+        **batch,
+        **{k: batch[k] / number for k in ("mean", "median", "min", "stdev")},
+        "number": number,
+        "ops_per_sec": batch["ops_per_sec"] * number,
+    }
+    return results
+
+
+def bench_explainer(generated: GeneratedRuleSet, profiles: list, repeat: int) -> dict[str, dict]:
+    engine = RulesEngine(thresholds=generated.thresholds, fiscal_year=2025)
+    plan = engine.compile(generated.rule_set)
+    builder = ExplanationBuilder(fiscal_year=2025)
+
+    cases = []
+    for profile in profiles[:200]:
+        for obligation in generated.obligations:
+            for compiled_rule in plan.rules_for(obligation.id):
+                evaluation = compiled_rule.evaluate(profile)
+                if evaluation.passes:
+                    cases.append((obligation, compiled_rule.rule.result_if_true,
+                                  compiled_rule.rule, evaluation.condition_results))
+                    break
+            else:
+                cases.append((obligation, "does_not_apply", None, []))
+    cycle = itertools.cycle(cases)
+
+    return {
+        "explanation_builder.build": measure(
+            lambda: builder.build(*next(cycle)), number=len(cases), repeat=repeat
+        ),
+    }
+
+
+def bench_operators(profiles: list, repeat: int) -> dict[str, dict]:
+    calls = []
+    for profile in profiles[:500]:
+        calls.extend([
+            ("gte", profile.ingresos_brutos_cop, Decimal("69497400"), None),
+            ("lt", profile.patrimonio_bruto_cop, Decimal("223384500"), None),
+            ("between", profile.ingresos_brutos_cop, Decimal("1000000"), Decimal("90000000")),
+            ("eq", profile.regime, "ordinario", None),
+            ("in", profile.city, "Bogotá, Medellín, Cali", None),
+            ("is_true", profile.has_employees, None, None),
+        ])
+    cycle = itertools.cycle(calls)
+
+    return {
+        "operators.apply_operator": measure(
+            lambda: apply_operator(*next(cycle)), number=len(calls), repeat=repeat
+        ),
+    }
+
+
+async def bench_service(
+    generated: GeneratedRuleSet, profiles: list, repeat: int, database_url: str
+) -> dict[str, dict]:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.application.evaluation_service import EvaluationService
+    from app.config import settings
+    from app.infrastructure.database.session import _fix_database_url
+    from app.infrastructure.repositories.pg_evaluation_repo import PgEvaluationRepository
+    from app.infrastructure.repositories.pg_profile_repo import PgProfileRepository
+
+    engine = create_async_engine(_fix_database_url(database_url))
+    memo_policy = settings.EVALUATION_MEMO_POLICY
+    try:
+        async with engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(bind=connection, expire_on_commit=False)
+            try:
+                seeded = await _seed(session, generated, profiles)
+                service = EvaluationService(
+                    db=session,
+                    profile_repo=PgProfileRepository(session),
+                    evaluation_repo=PgEvaluationRepository(session),
+                )
+                cycle = itertools.cycle(seeded)
+
+                async def evaluate():
+                    profile_id, user_id, tenant_id = next(cycle)
+                    await service.evaluate(profile_id, user_id, tenant_id)
+
+                settings.EVALUATION_MEMO_POLICY = "off"
+                results = {
+                    "evaluation_service.evaluate": await measure_async(
+                        evaluate, number=len(seeded), repeat=repeat
+                    ),
+                }
+                settings.EVALUATION_MEMO_POLICY = "persist"
+                results["evaluation_service.evaluate_memo_hit"] = await measure_async(
+                    evaluate, number=len(seeded), repeat=repeat
+                )
+                return results
+            finally:
+                await session.close()
+                await transaction.rollback()
+    finally:
+        settings.EVALUATION_MEMO_POLICY = memo_policy
+        await engine.dispose()
+
+
+async def _seed(session, generated: GeneratedRuleSet, profiles: list) -> list[tuple]:
+    from app.infrastructure.database.models import (
+        FiscalYear,
+        ObligationType,
+        Rule,
+        RuleCondition,
+        RuleSet,
+        TaxProfile,
+        Tenant,
+        Threshold,
+        User,
+    )
+
+    run = uuid.uuid4().hex[:6]
+    tenant = Tenant(id=uuid.uuid4(), name="Benchmark", slug=f"benchmark-{run}", is_active=True)
+    fiscal_year = FiscalYear(
+        id=uuid.uuid4(), year=10_000 + int(run, 16) % 80_000, status="active",
+        uvt_value=generated.thresholds["uvt_value"],
+    )
+    session.add_all([tenant, fiscal_year])
+    await session.flush()
+
+    for o in generated.obligations:
+        session.add(ObligationType(
+            id=o.id, code=f"{o.code}_{run}", name=o.name, category=o.category,
+            description=o.description, responsible_entity=o.responsible_entity,
+            legal_base=o.legal_base,
+        ))
+    for code, value in generated.thresholds.items():
+        session.add(Threshold(
+            id=uuid.uuid4(), fiscal_year_id=fiscal_year.id, code=code, label=code, value_cop=value,
+        ))
+    rule_set = RuleSet(id=generated.rule_set.id, fiscal_year_id=fiscal_year.id, status="active")
+    session.add(rule_set)
+    await session.flush()
+
+    for rule in generated.rule_set.rules:
+        session.add(Rule(
+            id=rule.id, rule_set_id=rule_set.id, obligation_type_id=rule.obligation_type_id,
+            code=rule.code, name=rule.name, logic_operator=rule.logic_operator,
+            priority=rule.priority, result_if_true=rule.result_if_true,
+        ))
+    await session.flush()
+    for rule in generated.rule_set.rules:
+        for c in rule.conditions:
+            session.add(RuleCondition(
+                id=c.id, rule_id=rule.id, field=c.field, operator=c.operator,
+                value_type=c.value_type, value=c.value, value_secondary=c.value_secondary,
+                description=c.description,
+            ))
+
+    seeded = []
+    for i, p in enumerate(profiles):
+        user = User(
+            id=uuid.uuid4(), tenant_id=tenant.id, email=f"bench{i}@{run}.example.com",
+            hashed_password="!", full_name=f"Benchmark {i}", role="user", is_active=True,
+        )
+        profile_id = uuid.uuid4()
+        session.add(user)
+        session.add(TaxProfile(
+            id=profile_id, user_id=user.id, tenant_id=tenant.id, fiscal_year_id=fiscal_year.id,
+            persona_type=p.persona_type, regime=p.regime, is_iva_responsable=p.is_iva_responsable,
+            economic_activity_ciiu=p.economic_activity_ciiu, economic_activities=[],
+            ingresos_brutos_cop=p.ingresos_brutos_cop, patrimonio_bruto_cop=p.patrimonio_bruto_cop,
+            has_employees=p.has_employees, employee_count=p.employee_count, city=p.city,
+            has_rut=p.has_rut, has_comercio_registration=p.has_comercio_registration,
+            nit_last_digit=p.nit_last_digit, consignaciones_cop=p.consignaciones_cop,
+            compras_consumos_cop=p.compras_consumos_cop, additional_data={},
+        ))
+        seeded.append((profile_id, user.id, tenant.id))
+    await session.flush()
+    return seeded
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the rules engine benchmarks.")
+    parser.add_argument("--profiles", type=int, default=500, help="synthetic profiles per run")
+    parser.add_argument("--scale", type=int, default=1, help="copies of the 2025 rule set")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per benchmark")
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--db", action="store_true", help="also benchmark EvaluationService")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--service-profiles", type=int, default=50)
+    parser.add_argument("--output", default="-", help="JSON report path, '-' for stdout")
+    args = parser.parse_args(argv)
+
+    generated = generate_rule_set(scale=args.scale, seed=args.seed)
+    profiles = generate_profiles(args.profiles, seed=args.seed)
+
+    results: dict[str, dict] = {}
+    results.update(bench_engine(generated, profiles, args.repeat))
+    results.update(bench_explainer(generated, profiles, args.repeat))
+    results.update(bench_operators(profiles, args.repeat))
+    if args.db:
+        from app.config import settings
+
+        results.update(asyncio.run(bench_service(
+            generated,
+            profiles[: args.service_profiles],
+            args.repeat,
+            args.database_url or settings.DATABASE_URL,
+        )))
+
+    params = {
+        "profiles": args.profiles,
+        "scale": args.scale,
+        "rules": len(generated.rule_set.rules),
+        "conditions": generated.condition_count,
+        "obligations": len(generated.obligations),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "service_profiles": args.service_profiles if args.db else 0,
+    }
+    report = json.dumps(build_report(params, results), indent=2)
+    if args.output == "-":
+        sys.stdout.write(report + "\n")
+    else:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
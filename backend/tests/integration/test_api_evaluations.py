@@ -160,3 +160,810 @@ async def test_evaluation_not_found(client: AsyncClient, auth_headers):
     fake_id = str(uuid.uuid4())
     response = await client.get(f"/api/v1/evaluations/{fake_id}", headers=auth_headers)
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_threshold_update_invalidates_cached_context(
+    client: AsyncClient, auth_headers, admin_headers, seeded_data
+):
+    fy = seeded_data["fiscal_year"]
+
+    profile_response = await client.post(
+        "/api/v1/profiles",
+        json={
+            "fiscal_year_id": str(fy.id),
+            "persona_type": "natural",
+            "regime": "ordinario",
+            "is_iva_responsable": False,
+            "ingresos_brutos_cop": 80000000,
+        },
+        headers=auth_headers,
+    )
+    profile_id = profile_response.json()["id"]
+
+    async def renta_result() -> str:
+        response = await client.post(
+            "/api/v1/evaluations",
+            json={"tax_profile_id": profile_id},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+        return next(
+            r["result"] for r in response.json()["results"]
+            if r["obligation"]["code"] == "renta_test"
+        )
+
+    assert await renta_result() == "applies"
+
+    # Raise the threshold above the profile's income; the cached context
+    # for this fiscal year must not be reused.
+    response = await client.post(
+        f"/api/v1/admin/fiscal-years/{fy.id}/thresholds",
+        json={
+            "code": "renta_test_tope",
+            "label": "Tope renta test",
+            "value_uvt": 2000,
+            "value_cop": 99282000,
+        },
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+
+    assert await renta_result() == "does_not_apply"
+
+
+@pytest.mark.asyncio
+async def test_create_evaluations_batch(
+    client: AsyncClient, auth_headers, admin_headers, seeded_data
+):
+    fy = seeded_data["fiscal_year"]
+
+    # An admin (accountant) evaluates its own profile and a client's profile
+    profile_ids = []
+    for headers, ingresos in ((admin_headers, 180000000), (auth_headers, 10000000)):
+        response = await client.post(
+            "/api/v1/profiles",
+            json={
+                "fiscal_year_id": str(fy.id),
+                "persona_type": "natural",
+                "regime": "ordinario",
+                "is_iva_responsable": False,
+                "ingresos_brutos_cop": ingresos,
+            },
+            headers=headers,
+        )
+        profile_ids.append(response.json()["id"])
+    missing_id = str(uuid.uuid4())
+
+    response = await client.post(
+        "/api/v1/evaluations/batch",
+        json={"tax_profile_ids": profile_ids + [missing_id]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    data = response.json()
+
+    assert len(data["evaluations"]) == 2
+    renta_results = [
+        next(r["result"] for r in e["results"] if r["obligation"]["code"] == "renta_test")
+        for e in data["evaluations"]
+    ]
+    assert renta_results == ["applies", "does_not_apply"]
+    assert data["errors"] == [
+        {"tax_profile_id": missing_id, "detail": "Tax profile not found"}
+    ]
+
+    # The client's evaluation is recorded under the client
+    response = await client.get("/api/v1/evaluations", headers=auth_headers)
+    assert [e["id"] for e in response.json()] == [data["evaluations"][1]["id"]]
+
+
+@pytest.mark.asyncio
+async def test_create_evaluations_batch_rejects_foreign_profiles(
+    client: AsyncClient, auth_headers, admin_headers, seeded_data
+):
+    fy = seeded_data["fiscal_year"]
+    response = await client.post(
+        "/api/v1/profiles",
+        json={
+            "fiscal_year_id": str(fy.id),
+            "persona_type": "natural",
+            "regime": "ordinario",
+            "is_iva_responsable": False,
+            "ingresos_brutos_cop": 10000000,
+        },
+        headers=admin_headers,
+    )
+    admin_profile_id = response.json()["id"]
+
+    response = await client.post(
+        "/api/v1/evaluations/batch",
+        json={"tax_profile_ids": [admin_profile_id]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    assert response.json()["evaluations"] == []
+    assert response.json()["errors"][0]["detail"] == "Profile does not belong to user"
+
+
+@pytest.mark.asyncio
+async def test_create_evaluations_batch_rejects_empty(client: AsyncClient, auth_headers):
+    response = await client.post(
+        "/api/v1/evaluations/batch",
+        json={"tax_profile_ids": []},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_evaluations_batch_copy_path(
+    client: AsyncClient, auth_headers, seeded_data, monkeypatch
+):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "EVALUATION_COPY_MIN_ROWS", 1)
+    fy = seeded_data["fiscal_year"]
+
+    response = await client.post(
+        "/api/v1/profiles",
+        json={
+            "fiscal_year_id": str(fy.id),
+            "persona_type": "natural",
+            "regime": "ordinario",
+            "is_iva_responsable": False,
+            "ingresos_brutos_cop": 180000000,
+            "additional_data": {"sector": "comercio"},
+        },
+        headers=auth_headers,
+    )
+    profile_id = response.json()["id"]
+
+    response = await client.post(
+        "/api/v1/evaluations/batch",
+        json={"tax_profile_ids": [profile_id]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 201
+    created = response.json()["evaluations"][0]
+
+    response = await client.get(f"/api/v1/evaluations/{created['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    stored = response.json()
+    assert stored["profile_summary"] == created["profile_summary"]
+    renta = next(r for r in stored["results"] if r["explanation"] and r["result"] == "applies")
+    assert renta["conditions_evaluated"][0]["field"] == "ingresos_brutos_cop"
+    assert renta["conditions_evaluated"][0]["passes"] is True
+
+    # Counters written through COPY match the stored results
+    history = (await client.get("/api/v1/evaluations", headers=auth_headers)).json()
+    listed = next(e for e in history if e["id"] == created["id"])
+    assert listed["summary"] == stored["summary"] == created["summary"]
+
+
+async def _create_profile(client, headers, fy, **overrides):
+    payload = {
+        "fiscal_year_id": str(fy.id),
+        "persona_type": "natural",
+        "regime": "ordinario",
+        "is_iva_responsable": False,
+        "ingresos_brutos_cop": 180000000,
+    }
+    payload.update(overrides)
+    response = await client.post("/api/v1/profiles", json=payload, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_profile_reuses_results(client: AsyncClient, auth_headers, seeded_data):
+    profile_id = await _create_profile(client, auth_headers, seeded_data["fiscal_year"])
+
+    first = await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    second = await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    assert second.status_code == 201
+
+    # Default policy records a new evaluation with the same results
+    assert second.json()["id"] != first.json()["id"]
+    assert second.json()["results"] == first.json()["results"]
+
+    stored = await client.get(f"/api/v1/evaluations/{second.json()['id']}", headers=auth_headers)
+    assert [r["conditions_evaluated"] for r in stored.json()["results"]] == [
+        r["conditions_evaluated"] for r in first.json()["results"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_trace_of_deleted_condition_is_left_out(
+    client: AsyncClient, auth_headers, seeded_data, db_session: AsyncSession
+):
+    from sqlalchemy import delete
+
+    profile_id = await _create_profile(client, auth_headers, seeded_data["fiscal_year"])
+    created = await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    await db_session.execute(delete(RuleCondition))
+
+    stored = await client.get(f"/api/v1/evaluations/{created.json()['id']}", headers=auth_headers)
+    assert stored.status_code == 200
+    assert all(r["conditions_evaluated"] == [] for r in stored.json()["results"])
+
+
+@pytest.mark.asyncio
+async def test_dedupe_policy_returns_previous_evaluation(
+    client: AsyncClient, auth_headers, seeded_data, monkeypatch
+):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "EVALUATION_MEMO_POLICY", "dedupe")
+    profile_id = await _create_profile(client, auth_headers, seeded_data["fiscal_year"])
+
+    first = await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    second = await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    assert second.json()["id"] == first.json()["id"]
+    assert second.json()["results"] == first.json()["results"]
+
+    # A profile change produces a fresh evaluation
+    response = await client.put(
+        f"/api/v1/profiles/{profile_id}",
+        json={"ingresos_brutos_cop": 1000000},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    third = await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    assert third.json()["id"] != first.json()["id"]
+    renta = next(r for r in third.json()["results"] if r["obligation"]["code"] == "renta_test")
+    assert renta["result"] == "does_not_apply"
+
+
+@pytest.mark.asyncio
+async def test_list_evaluations_keyset_pages(client: AsyncClient, auth_headers, seeded_data):
+    profile_id = await _create_profile(client, auth_headers, seeded_data["fiscal_year"])
+    created = []
+    for _ in range(3):
+        response = await client.post(
+            "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+        )
+        created.append(response.json())
+
+    full = await client.get("/api/v1/evaluations", headers=auth_headers)
+    assert full.status_code == 200
+    assert "x-next-cursor" not in full.headers
+    history = full.json()
+    assert {e["id"] for e in history} == {e["id"] for e in created}
+    assert all(e["summary"] == created[0]["summary"] for e in history)
+
+    first = await client.get("/api/v1/evaluations?limit=2", headers=auth_headers)
+    cursor = first.headers["x-next-cursor"]
+    second = await client.get(
+        f"/api/v1/evaluations?limit=2&cursor={cursor}", headers=auth_headers
+    )
+    assert "x-next-cursor" not in second.headers
+    assert [e["id"] for e in first.json() + second.json()] == [e["id"] for e in history]
+
+    bad = await client.get("/api/v1/evaluations?cursor=not-a-cursor", headers=auth_headers)
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_evaluation_detail_levels(client: AsyncClient, auth_headers, seeded_data):
+    profile_id = await _create_profile(client, auth_headers, seeded_data["fiscal_year"])
+    created = (
+        await client.post(
+            "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+        )
+    ).json()
+    url = f"/api/v1/evaluations/{created['id']}"
+
+    full = (await client.get(url, headers=auth_headers)).json()
+    assert full["detail"] == "full"
+    assert any(r["conditions_evaluated"] for r in full["results"])
+
+    results = (await client.get(f"{url}?detail=results", headers=auth_headers)).json()
+    assert results["profile_summary"] == full["profile_summary"]
+    assert [r["result"] for r in results["results"]] == [r["result"] for r in full["results"]]
+    assert all(r["conditions_evaluated"] == [] for r in results["results"])
+
+    summary = (await client.get(f"{url}?detail=summary", headers=auth_headers)).json()
+    assert summary["results"] == []
+    assert summary["profile_summary"] == {}
+    assert summary["summary"] == full["summary"] == created["summary"]
+
+    response = await client.get(f"{url}?detail=everything", headers=auth_headers)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_fiscal_year_partitions_create_and_detach(
+    client: AsyncClient, auth_headers, seeded_data, db_session: AsyncSession
+):
+    from sqlalchemy import text
+
+    from app.infrastructure.database.partitions import (
+        create_fiscal_year_partitions,
+        detach_fiscal_year_partitions,
+        list_partitions,
+    )
+
+    fy = seeded_data["fiscal_year"]
+    profile_id = await _create_profile(client, auth_headers, fy)
+    created = (
+        await client.post(
+            "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+        )
+    ).json()
+    url = f"/api/v1/evaluations/{created['id']}"
+
+    # Rows already in the default partitions move into the new ones
+    names = await create_fiscal_year_partitions(db_session, fy.id, fy.year)
+    assert names == [f"evaluations_fy{fy.year}", f"evaluation_results_fy{fy.year}"]
+    assert await create_fiscal_year_partitions(db_session, fy.id, fy.year) == []
+    assert {p["name"] for p in await list_partitions(db_session)} >= set(names)
+    moved = await db_session.execute(text(f"SELECT count(*) FROM evaluation_results_fy{fy.year}"))
+    assert moved.scalar_one() == len(created["results"])
+    left = await db_session.execute(
+        text("SELECT count(*) FROM evaluation_results_default WHERE fiscal_year_id = :fy"),
+        {"fy": fy.id},
+    )
+    assert left.scalar_one() == 0
+    stored = (await client.get(url, headers=auth_headers)).json()
+    assert [r["result"] for r in stored["results"]] == [r["result"] for r in created["results"]]
+
+    # Detached years keep their rows but leave the live tables
+    assert await detach_fiscal_year_partitions(db_session, fy.year) == names[::-1]
+    assert (await client.get(url, headers=auth_headers)).status_code == 404
+    archived = await db_session.execute(text(f"SELECT count(*) FROM evaluations_fy{fy.year}"))
+    assert archived.scalar_one() == 1
+
+
+@pytest.mark.asyncio
+async def test_async_evaluation_job(
+    client: AsyncClient, auth_headers, seeded_data, db_session: AsyncSession
+):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.workers.evaluation_worker import EvaluationWorkerPool
+
+    profile_id = await _create_profile(client, auth_headers, seeded_data["fiscal_year"])
+    response = await client.post(
+        "/api/v1/evaluations?mode=async",
+        json={"tax_profile_id": profile_id},
+        headers=auth_headers,
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued"
+    assert job["evaluation_id"] is None
+    assert response.headers["location"] == f"/api/v1/evaluations/jobs/{job['id']}"
+
+    pending = await client.get(response.headers["location"], headers=auth_headers)
+    assert pending.json()["status"] == "queued"
+    assert pending.headers["retry-after"] == "1"
+
+    # Worker sessions share the test transaction; their commits are savepoints
+    session_factory = async_sessionmaker(
+        bind=await db_session.connection(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    pool = EvaluationWorkerPool(session_factory)
+    assert await pool.run_once()
+    assert not await pool.run_once()
+
+    done = await client.get(response.headers["location"], headers=auth_headers)
+    assert done.json()["status"] == "succeeded"
+    assert done.json()["attempts"] == 1
+    assert "retry-after" not in done.headers
+    evaluation = await client.get(
+        f"/api/v1/evaluations/{done.json()['evaluation_id']}", headers=auth_headers
+    )
+    assert evaluation.status_code == 200
+    assert any(r["result"] == "applies" for r in evaluation.json()["results"])
+
+
+@pytest.mark.asyncio
+async def test_stale_job_out_of_attempts_is_failed(
+    client: AsyncClient, auth_headers, seeded_data, db_session: AsyncSession
+):
+    from datetime import datetime, timedelta, timezone
+
+    from sqlalchemy import update
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.infrastructure.database.models.evaluation_job import EvaluationJob
+    from app.workers.evaluation_worker import EvaluationWorkerPool
+
+    profile_id = await _create_profile(client, auth_headers, seeded_data["fiscal_year"])
+    response = await client.post(
+        "/api/v1/evaluations?mode=async",
+        json={"tax_profile_id": profile_id},
+        headers=auth_headers,
+    )
+    location = response.headers["location"]
+    # A worker died on the job's last attempt an hour ago
+    await db_session.execute(
+        update(EvaluationJob)
+        .where(EvaluationJob.id == uuid.UUID(response.json()["id"]))
+        .values(
+            status="running",
+            attempts=3,
+            started_at=datetime.now(timezone.utc) - timedelta(hours=1),
+        )
+    )
+
+    session_factory = async_sessionmaker(
+        bind=await db_session.connection(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+    pool = EvaluationWorkerPool(session_factory, stale_after_seconds=60, max_attempts=3)
+    assert not await pool.run_once()
+
+    failed = await client.get(location, headers=auth_headers)
+    assert failed.json()["status"] == "failed"
+    assert failed.json()["error"] == "Evaluation did not finish"
+    assert "retry-after" not in failed.headers
+
+
+@pytest.mark.asyncio
+async def test_async_evaluation_job_rejects_unknown_profile(
+    client: AsyncClient, auth_headers, seeded_data
+):
+    response = await client.post(
+        "/api/v1/evaluations?mode=async",
+        json={"tax_profile_id": str(uuid.uuid4())},
+        headers=auth_headers,
+    )
+    assert response.status_code == 400
+    missing = await client.get(f"/api/v1/evaluations/jobs/{uuid.uuid4()}", headers=auth_headers)
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_context_loader_uses_one_query(seeded_data, db_session: AsyncSession):
+    from sqlalchemy import event
+
+    from app.infrastructure.repositories.pg_evaluation_context_loader import (
+        PgEvaluationContextLoader,
+    )
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        context = await PgEvaluationContextLoader(db_session).load(seeded_data["fiscal_year"].id)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert len(statements) == 1
+    renta = seeded_data["obligation"]
+    assert context.fiscal_year.uvt_value == Decimal("49641")
+    assert context.thresholds == {"renta_test_tope": Decimal("69497400")}
+    assert renta.id in {o.id for o in context.obligations}
+    assert context.periodicities[renta.id] == "anual"
+    [rule] = context.rule_set.rules
+    assert rule.code == "renta_test_rule"
+    assert [c.value for c in rule.conditions] == ["renta_test_tope"]
+    assert context.plan.rules_for(renta.id)
+
+
+@pytest.mark.asyncio
+async def test_context_loader_rejects_unknown_fiscal_year(db_session: AsyncSession):
+    from app.infrastructure.repositories.pg_evaluation_context_loader import (
+        PgEvaluationContextLoader,
+    )
+
+    with pytest.raises(ValueError, match="Fiscal year not found"):
+        await PgEvaluationContextLoader(db_session).load(uuid.uuid4())
+
+
+@pytest.mark.asyncio
+async def test_evaluation_generates_calendar_from_nit_schedule(
+    client: AsyncClient, auth_headers, seeded_data, db_session: AsyncSession, sample_tenant
+):
+    from sqlalchemy import update
+
+    from app.application.calendar_service import CalendarService
+    from app.application.deadline_service import DeadlineService
+    from app.infrastructure.repositories.pg_calendar_repo import PgCalendarRepository
+    from app.infrastructure.repositories.pg_deadline_repo import PgDeadlineRepository
+    from app.infrastructure.repositories.pg_evaluation_repo import PgEvaluationRepository
+
+    fy, renta = seeded_data["fiscal_year"], seeded_data["obligation"]
+    await db_session.execute(
+        update(ObligationPeriodicity)
+        .where(ObligationPeriodicity.obligation_type_id == renta.id)
+        .values(nit_schedule={"periods": [
+            {"label": "AG 2099", "due": {"7": "2100-08-20", "default": "2100-08-25"}},
+        ]})
+    )
+    profile_id = await _create_profile(client, auth_headers, fy, nit_last_digit=7)
+    created = await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    assert created.status_code == 201
+
+    calendar = (await client.get("/api/v1/calendar", headers=auth_headers)).json()
+    assert [(e["title"], e["due_date"], e["periodicity"]) for e in calendar] == [
+        ("Renta Test - AG 2099", "2100-08-20", "anual")
+    ]
+
+    # Generating again for the same evaluation adds nothing
+    evaluation = await PgEvaluationRepository(db_session).get_by_id(
+        uuid.UUID(created.json()["id"]), sample_tenant.id
+    )
+    service = CalendarService(
+        PgCalendarRepository(db_session), DeadlineService(PgDeadlineRepository(db_session))
+    )
+    assert await service.generate_calendar(evaluation, 7) == []
+    assert len((await client.get("/api/v1/calendar", headers=auth_headers)).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_reevaluating_profile_keeps_calendar(
+    client: AsyncClient, auth_headers, seeded_data, db_session: AsyncSession, monkeypatch
+):
+    from sqlalchemy import update
+
+    from app.config import settings
+
+    fy, renta = seeded_data["fiscal_year"], seeded_data["obligation"]
+    await db_session.execute(
+        update(ObligationPeriodicity)
+        .where(ObligationPeriodicity.obligation_type_id == renta.id)
+        .values(nit_schedule={"periods": [
+            {"label": "AG 2099", "due": {"default": "2100-08-25"}},
+        ]})
+    )
+    profile_id = await _create_profile(client, auth_headers, fy)
+    await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    [entry] = (await client.get("/api/v1/calendar", headers=auth_headers)).json()
+    response = await client.patch(
+        f"/api/v1/calendar/{entry['id']}", json={"is_completed": True}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    calendar = (await client.get("/api/v1/calendar", headers=auth_headers)).json()
+    feed_url = (await client.post("/api/v1/calendar/feed-token", headers=auth_headers)).json()["url"]
+    etag = (await client.get(feed_url)).headers["etag"]
+
+    # A memo hit, a fresh evaluation and an incremental one after an update
+    await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    monkeypatch.setattr(settings, "EVALUATION_MEMO_POLICY", "off")
+    await client.post(
+        "/api/v1/evaluations", json={"tax_profile_id": profile_id}, headers=auth_headers
+    )
+    response = await client.put(
+        f"/api/v1/profiles/{profile_id}",
+        params={"evaluate": True},
+        json={"city": "Cali"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+
+    assert (await client.get("/api/v1/calendar", headers=auth_headers)).json() == calendar
+    assert calendar[0]["is_completed"] is True
+    assert (await client.get(feed_url)).headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_fiscal_year_deadlines_served_from_memory(
+    client: AsyncClient, seeded_data, db_session: AsyncSession
+):
+    from sqlalchemy import event, update
+
+    fy, renta = seeded_data["fiscal_year"], seeded_data["obligation"]
+    await db_session.execute(
+        update(ObligationPeriodicity)
+        .where(ObligationPeriodicity.obligation_type_id == renta.id)
+        .values(nit_schedule={"periods": [
+            {"label": "AG 2099", "due": {"3": "2100-08-14", "default": "2100-08-25"}},
+        ]})
+    )
+    url = f"/api/v1/fiscal-years/{fy.id}/deadlines"
+
+    response = await client.get(url, params={"nit_digit": 3})
+    assert response.status_code == 200
+    assert response.json() == [{
+        "obligation_type_id": str(renta.id),
+        "obligation_code": "renta_test",
+        "frequency": "anual",
+        "period": "AG 2099",
+        "due_date": "2100-08-14",
+    }]
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        other = await client.get(url, params={"nit_digit": 8})
+        unknown = await client.get(url)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert statements == []
+    assert [d["due_date"] for d in other.json()] == ["2100-08-25"]
+    assert [d["due_date"] for d in unknown.json()] == ["2100-08-14"]
+
+    assert (await client.get(url, params={"nit_digit": 10})).status_code == 422
+    missing = await client.get(f"/api/v1/fiscal-years/{uuid.uuid4()}/deadlines")
+    assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_threshold_simulation_reports_changed_outcomes(
+    client: AsyncClient, auth_headers, admin_headers, seeded_data, sample_tenant,
+    db_session: AsyncSession,
+):
+    from sqlalchemy import func, select
+
+    from app.infrastructure.database.models.evaluation import Evaluation
+    from app.infrastructure.database.models.tax_profile import TaxProfile
+    from app.infrastructure.database.models.user import User
+
+    fy = seeded_data["fiscal_year"]
+    for i, ingresos in enumerate((10, 60, 80, 100, 200)):
+        user = User(
+            id=uuid.uuid4(), tenant_id=sample_tenant.id, email=f"sim{i}@example.com",
+            hashed_password="x", full_name=f"Sim {i}", role="user", is_active=True,
+        )
+        db_session.add(user)
+        await db_session.flush()
+        db_session.add(TaxProfile(
+            id=uuid.uuid4(), user_id=user.id, tenant_id=sample_tenant.id,
+            fiscal_year_id=fy.id, persona_type="natural", regime="ordinario",
+            is_iva_responsable=False, ingresos_brutos_cop=Decimal(ingresos * 1_000_000),
+        ))
+    await db_session.flush()
+    url = f"/api/v1/admin/fiscal-years/{fy.id}/simulations"
+
+    # 2000 UVT = 99,282,000 COP: the 80M profile stops declaring
+    response = await client.post(
+        url,
+        json={"thresholds": [{"code": "renta_test_tope", "value_uvt": 2000}]},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["profiles_evaluated"], report["profiles_changed"]) == (5, 1)
+    [renta] = [o for o in report["obligations"] if o["obligation_code"] == "renta_test"]
+    assert renta["before"] == {"applies": 3, "does_not_apply": 2}
+    assert renta["after"] == {"applies": 2, "does_not_apply": 3}
+    assert renta["transitions"] == [{"from": "applies", "to": "does_not_apply", "count": 1}]
+
+    # A new UVT value applies to UVT amounts; COP amounts are taken as given
+    response = await client.post(
+        url,
+        json={
+            "uvt_value": 100000,
+            "thresholds": [{"code": "renta_test_tope", "value_uvt": 1400}],
+        },
+        headers=admin_headers,
+    )
+    assert response.json()["profiles_changed"] == 2
+    assert response.json()["thresholds"]["renta_test_tope"] == 140000000
+
+    # A new UVT value alone re-derives the stored UVT thresholds:
+    # 1400 UVT x 60,000 = 84,000,000 COP
+    response = await client.post(url, json={"uvt_value": 60000}, headers=admin_headers)
+    report = response.json()
+    assert report["thresholds"]["renta_test_tope"] == 84000000
+    assert report["thresholds"]["uvt_value"] == 60000
+    assert report["profiles_changed"] == 1
+    [renta] = [o for o in report["obligations"] if o["obligation_code"] == "renta_test"]
+    assert renta["transitions"] == [{"from": "applies", "to": "does_not_apply", "count": 1}]
+
+    evaluations = await db_session.scalar(select(func.count()).select_from(Evaluation))
+    assert evaluations == 0
+
+    bad = await client.post(
+        url, json={"rule_set_id": str(uuid.uuid4())}, headers=admin_headers
+    )
+    assert bad.status_code == 400
+    forbidden = await client.post(url, json={}, headers=auth_headers)
+    assert forbidden.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_profile_update_reevaluates_only_affected_obligations(
+    client: AsyncClient, auth_headers, seeded_data, monkeypatch, db_session: AsyncSession
+):
+    from sqlalchemy import select
+
+    from app.application.engine_executor import engine_executor
+    from app.infrastructure.database.models.evaluation import EvaluationResult
+
+    fy = seeded_data["fiscal_year"]
+    renta = seeded_data["obligation"].id
+    recomputed: list[list[str]] = []
+    evaluate = engine_executor.evaluate
+
+    async def spy(context, profiles, obligations=None):
+        recomputed.append([o.code for o in (obligations or context.obligations)])
+        return await evaluate(context, profiles, obligations)
+
+    monkeypatch.setattr(engine_executor, "evaluate", spy)
+
+    profile = await client.post(
+        "/api/v1/profiles",
+        json={
+            "fiscal_year_id": str(fy.id),
+            "persona_type": "natural",
+            "regime": "ordinario",
+            "is_iva_responsable": False,
+            "ingresos_brutos_cop": 80000000,
+        },
+        headers=auth_headers,
+    )
+    url = f"/api/v1/profiles/{profile.json()['id']}"
+    evaluation_ids: list[uuid.UUID] = []
+
+    async def update(**changes):
+        response = await client.put(url, params={"evaluate": True}, json=changes, headers=auth_headers)
+        assert response.status_code == 200
+        evaluation_ids.append(uuid.UUID(response.headers["X-Evaluation-Id"]))
+        rows = await db_session.execute(
+            select(EvaluationResult.obligation_type_id, EvaluationResult.result).where(
+                EvaluationResult.evaluation_id == evaluation_ids[-1]
+            )
+        )
+        return dict(rows.all())
+
+    async def renta_trace(evaluation_id):
+        row = await db_session.execute(
+            select(EvaluationResult.condition_trace, EvaluationResult.conditions_evaluated).where(
+                EvaluationResult.evaluation_id == evaluation_id,
+                EvaluationResult.obligation_type_id == renta,
+            )
+        )
+        return row.one()
+
+    # Nothing to start from: every obligation is evaluated
+    first = await update(city="Cali")
+    assert first[renta] == "applies"
+    assert len(recomputed[-1]) == len(first)
+
+    # No rule reads the city: results are copied from the previous evaluation
+    calls = len(recomputed)
+    assert await update(city="Medellín") == first
+    assert len(recomputed) == calls
+
+    # Copied results keep the packed trace instead of the expanded JSON
+    original, copied = [await renta_trace(e) for e in evaluation_ids]
+    assert copied.conditions_evaluated is None
+    assert copied.condition_trace == original.condition_trace is not None
+
+    # Income feeds the renta rule, so only renta is recomputed
+    lowered = await update(ingresos_brutos_cop=10000000)
+    assert recomputed[-1] == ["renta_test"]
+    assert lowered == {**first, renta: "does_not_apply"}
+
+    plain = await client.put(url, json={"city": "Pasto"}, headers=auth_headers)
+    assert "X-Evaluation-Id" not in plain.headers
+    missing = await client.put(
+        f"/api/v1/profiles/{uuid.uuid4()}", params={"evaluate": True}, json={}, headers=auth_headers
+    )
+    assert missing.status_code == 404
@@ -0,0 +1,54 @@
+"""Tests for iCalendar feed rendering."""
+
+import uuid
+from datetime import date, datetime, timezone
+
+from app.application.calendar_feed import render_ics
+from app.domain.entities.calendar_entry import CalendarEntryEntity
+
+
+def _entry(title: str, **overrides) -> CalendarEntryEntity:
+    values = dict(
+        id=uuid.uuid4(),
+        evaluation_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        tenant_id=uuid.uuid4(),
+        obligation_type_id=uuid.uuid4(),
+        title=title,
+        due_date=date(2026, 8, 12),
+        periodicity="anual",
+    )
+    values.update(overrides)
+    return CalendarEntryEntity(**values)
+
+
+def _render(entries, **kwargs) -> str:
+    stamp = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    return b"".join(render_ics(entries, stamp, **kwargs)).decode()
+
+
+def test_events_are_all_day_and_escaped():
+    body = _render([_entry("Renta; personas, naturales", description="Línea 1\nLínea 2")])
+    assert "DTSTART;VALUE=DATE:20260812\r\n" in body
+    assert "DTEND;VALUE=DATE:20260813\r\n" in body
+    assert "DTSTAMP:20260102T030405Z\r\n" in body
+    assert "SUMMARY:Renta\\; personas\\, naturales\r\n" in body
+    assert "DESCRIPTION:Línea 1\\nLínea 2\r\n" in body
+
+
+def test_long_lines_are_folded_on_character_boundaries():
+    body = _render([_entry("Declaración " * 20)])
+    lines = body.split("\r\n")
+    assert all(len(line.encode()) <= 75 for line in lines)
+    unfolded = body.replace("\r\n ", "")
+    assert ("SUMMARY:" + "Declaración " * 20).rstrip() in unfolded
+
+
+def test_completed_entries_are_marked_and_chunked():
+    entries = [_entry(f"E{i}", is_completed=i == 0) for i in range(5)]
+    chunks = list(render_ics(entries, chunk_size=2))
+    # Header, three chunks of events, footer
+    assert len(chunks) == 5
+    body = b"".join(chunks).decode()
+    assert body.count("BEGIN:VEVENT") == 5
+    assert "SUMMARY:[Completada] E0\r\n" in body
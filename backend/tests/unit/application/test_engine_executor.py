@@ -0,0 +1,77 @@
+"""Tests for offloading engine work to threads and worker processes."""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.application.engine_executor import EngineExecutor
+from app.application.evaluation_context import EvaluationContext
+from app.domain.entities.fiscal_year import FiscalYearEntity
+from app.domain.entities.rule import RuleConditionEntity
+from benchmarks.generators import generate_profiles, generate_rule_set
+
+
+def _context(generated=None):
+    generated = generated or generate_rule_set(scale=2)
+    return EvaluationContext.build(
+        fiscal_year=FiscalYearEntity(
+            id=uuid.uuid4(), year=2025, status="active", uvt_value=Decimal("49799")
+        ),
+        rule_set=generated.rule_set,
+        thresholds=generated.thresholds,
+        obligations=generated.obligations,
+        periodicities={},
+    )
+
+
+def _flatten(outcomes):
+    return [
+        outcome if isinstance(outcome, str) else [
+            (r.obligation_type_id, r.result, r.triggered_rule_id, list(r.conditions_evaluated),
+             r.explanation_es)
+            for r in outcome
+        ]
+        for outcome in outcomes
+    ]
+
+
+def test_choose_by_estimated_work():
+    executor = EngineExecutor(mode="auto", thread_min_work=100, process_min_work=1000)
+    assert executor.choose(99) == "inline"
+    assert executor.choose(100) == "thread"
+    assert executor.choose(1000) == "process"
+    assert EngineExecutor(mode="thread").choose(1) == "thread"
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+async def test_offloaded_results_match_inline(mode):
+    context = _context()
+    profiles = generate_profiles(30)
+    executor = EngineExecutor(mode=mode, process_workers=2)
+    try:
+        outcomes = await executor.evaluate(context, profiles)
+    finally:
+        executor.shutdown()
+
+    expected = await EngineExecutor(mode="inline").evaluate(context, profiles)
+    assert _flatten(outcomes) == _flatten(expected)
+    # Traces are re-bound to the local plan and can still be packed
+    assert outcomes[0][0].conditions_evaluated.pack() == expected[0][0].conditions_evaluated.pack()
+
+
+async def test_errors_are_reported_per_profile():
+    generated = generate_rule_set(scale=2)
+    rule = min(generated.rule_set.rules, key=lambda r: r.priority)  # checked first
+    rule.conditions.insert(0, RuleConditionEntity(
+        id=uuid.uuid4(), rule_id=rule.id, field="ingresos_brutos_cop", operator="gte",
+        value_type="threshold_ref", value="missing_threshold",
+    ))
+    context = _context(generated)
+    executor = EngineExecutor(mode="process", process_workers=1)
+    try:
+        outcomes = await executor.evaluate(context, generate_profiles(3))
+    finally:
+        executor.shutdown()
+
+    assert all(isinstance(o, str) and "missing_threshold" in o for o in outcomes)
@@ -0,0 +1,43 @@
+"""Smoke tests for the benchmark generators, runner and comparison."""
+
+import json
+
+from app.domain.engine.engine import RulesEngine
+from app.seeds.rules_2025 import RULES_2025
+from benchmarks import compare, run
+from benchmarks.generators import generate_profiles, generate_rule_set
+
+
+class TestGenerators:
+    def test_profiles_are_deterministic(self):
+        assert generate_profiles(20, seed=3) == generate_profiles(20, seed=3)
+        assert generate_profiles(20, seed=3) != generate_profiles(20, seed=4)
+
+    def test_rule_set_scales_and_compiles(self):
+        generated = generate_rule_set(scale=3)
+        engine = RulesEngine(thresholds=generated.thresholds, fiscal_year=2025)
+        plan = engine.compile(generated.rule_set)
+
+        assert len(generated.rule_set.rules) == len(RULES_2025) * 5
+        assert len({o.code for o in generated.obligations}) == len(generated.obligations)
+        for profile in generate_profiles(10):
+            results = engine.evaluate_compiled(profile, plan, generated.obligations)
+            assert len(results) == len(generated.obligations)
+
+
+class TestRunner:
+    def test_report_and_compare(self, tmp_path, capsys):
+        before = tmp_path / "before.json"
+        run.main(["--profiles", "10", "--repeat", "1", "--output", str(before)])
+        report = json.loads(before.read_text())
+
+        assert report["params"]["profiles"] == 10
+        assert "rules_engine.evaluate_compiled" in report["benchmarks"]
+        assert compare.main([str(before), str(before)]) == 0
+
+        for stats in report["benchmarks"].values():
+            stats["median"] *= 2
+        after = tmp_path / "after.json"
+        after.write_text(json.dumps(report))
+        assert compare.main([str(before), str(after), "--tolerance", "0.5"]) == 1
+        assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,227 @@
+"""Tests for the rule set compiler."""
+
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.domain.engine.compiler import RuleSetCompiler, compile_rule_set
+from app.domain.engine.engine import RulesEngine
+from app.domain.engine.evaluator import RuleEvaluator
+from app.domain.engine.resolver import ThresholdResolver
+from app.domain.entities.obligation import ObligationTypeEntity
+from app.domain.entities.rule import RuleConditionEntity, RuleEntity, RuleSetEntity
+from app.domain.entities.tax_profile import TaxProfileEntity
+
+
+def _condition(field, operator, value_type="literal", value=None, value_secondary=None):
+    return RuleConditionEntity(
+        id=uuid.uuid4(),
+        rule_id=uuid.uuid4(),
+        field=field,
+        operator=operator,
+        value_type=value_type,
+        value=value,
+        value_secondary=value_secondary,
+    )
+
+
+def _rule(obligation_id, conditions, priority=1, logic_operator="AND", is_active=True, code=None):
+    return RuleEntity(
+        id=uuid.uuid4(),
+        rule_set_id=uuid.uuid4(),
+        obligation_type_id=obligation_id,
+        code=code or f"rule_{priority}",
+        name=code or f"Rule {priority}",
+        logic_operator=logic_operator,
+        priority=priority,
+        is_active=is_active,
+        conditions=conditions,
+    )
+
+
+def _profile(**overrides):
+    data = dict(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        tenant_id=uuid.uuid4(),
+        fiscal_year_id=uuid.uuid4(),
+        persona_type="natural",
+        regime="ordinario",
+        is_iva_responsable=False,
+        ingresos_brutos_cop=Decimal("100000000"),
+        city="Bogotá",
+    )
+    data.update(overrides)
+    return TaxProfileEntity(**data)
+
+
+@pytest.fixture
+def thresholds():
+    return {
+        "uvt_value": Decimal("49641"),
+        "renta_pn_ingresos_tope": Decimal("69497400"),
+        "iva_responsable_tope": Decimal("173743500"),
+    }
+
+
+@pytest.fixture
+def obligation():
+    return ObligationTypeEntity(
+        id=uuid.uuid4(),
+        code="renta",
+        name="Renta",
+        category="nacional",
+        description="Renta",
+        responsible_entity="DIAN",
+    )
+
+
+class TestRuleSetCompiler:
+    def test_rules_sorted_by_priority_and_inactive_dropped(self, thresholds, obligation):
+        low = _rule(obligation.id, [], priority=5, code="low")
+        high = _rule(obligation.id, [], priority=1, code="high")
+        inactive = _rule(obligation.id, [], priority=0, is_active=False, code="inactive")
+        rule_set = RuleSetEntity(
+            id=uuid.uuid4(), fiscal_year_id=uuid.uuid4(), rules=[low, inactive, high]
+        )
+
+        plan = compile_rule_set(rule_set, thresholds)
+
+        assert [c.rule.code for c in plan.rules_for(obligation.id)] == ["high", "low"]
+        assert plan.rules_for(uuid.uuid4()) == ()
+
+    def test_threshold_ref_resolved_once(self, thresholds):
+        compiler = RuleSetCompiler(thresholds)
+        compiled = compiler.compile_condition(
+            _condition("ingresos_brutos_cop", "gte", "threshold_ref", "renta_pn_ingresos_tope")
+        )
+        assert compiled.resolved_value == Decimal("69497400")
+        assert compiled.threshold_code == "renta_pn_ingresos_tope"
+        assert compiled.threshold_value == 69497400.0
+
+    def test_uvt_expr_multiplied_ahead_of_time(self, thresholds):
+        compiler = RuleSetCompiler(thresholds)
+        compiled = compiler.compile_condition(
+            _condition("ingresos_brutos_cop", "between", "uvt_expr", "1400", "3500")
+        )
+        assert compiled.resolved_value == Decimal("1400") * Decimal("49641")
+        assert compiled.resolved_secondary == Decimal("3500") * Decimal("49641")
+
+    def test_missing_threshold_fails_only_when_reached(self, thresholds, obligation):
+        ok_rule = _rule(obligation.id, [_condition("has_rut", "is_false")], priority=1)
+        broken_rule = _rule(
+            obligation.id,
+            [_condition("ingresos_brutos_cop", "gte", "threshold_ref", "missing_tope")],
+            priority=2,
+        )
+        rule_set = RuleSetEntity(
+            id=uuid.uuid4(), fiscal_year_id=uuid.uuid4(), rules=[ok_rule, broken_rule]
+        )
+        engine = RulesEngine(thresholds=thresholds, fiscal_year=2025)
+        plan = engine.compile(rule_set)
+
+        results = engine.evaluate_compiled(_profile(has_rut=False), plan, [obligation])
+        assert results[0].result == "applies"
+
+        with pytest.raises(ValueError, match="Threshold not found: missing_tope"):
+            engine.evaluate_compiled(_profile(has_rut=True), plan, [obligation])
+
+    @pytest.mark.parametrize(
+        "condition",
+        [
+            _condition("ingresos_brutos_cop", "gt", "threshold_ref", "renta_pn_ingresos_tope"),
+            _condition("ingresos_brutos_cop", "lte", "threshold_ref", "iva_responsable_tope"),
+            _condition("ingresos_brutos_cop", "between", "uvt_expr", "1000", "2500"),
+            _condition("patrimonio_bruto_cop", "gte", "literal", "1000"),
+            _condition("regime", "eq", "literal", "Ordinario"),
+            _condition("regime", "neq", "literal", "simple"),
+            _condition("employee_count", "eq", "literal", "0"),
+            _condition("city", "in", "literal", '["Bogotá", "Medellín"]'),
+            _condition("city", "not_in", "literal", "Cali, Pasto"),
+            _condition("has_employees", "is_true", "literal", "true"),
+            _condition("has_rut", "is_false"),
+            _condition("sector", "eq", "literal", "comercio"),
+        ],
+        ids=lambda c: f"{c.field}-{c.operator}",
+    )
+    def test_compiled_condition_matches_evaluator(self, thresholds, condition):
+        evaluator = RuleEvaluator(ThresholdResolver(thresholds))
+        compiled = RuleSetCompiler(thresholds).compile_condition(condition)
+        rule = _rule(uuid.uuid4(), [condition])
+
+        profiles = [
+            _profile(),
+            _profile(ingresos_brutos_cop=Decimal("69497400"), regime="simple", city="Cali"),
+            _profile(patrimonio_bruto_cop=Decimal("1000"), has_employees=True, employee_count=2),
+            _profile(additional_data={"sector": "Comercio"}),
+        ]
+        for profile in profiles:
+            expected = evaluator.evaluate_rule(rule, profile).condition_results[0]
+            profile_value, passes = compiled.test(profile)
+            assert compiled.to_result(profile_value, passes) == expected
+
+    def test_unknown_operator_deferred(self, thresholds):
+        compiled = RuleSetCompiler(thresholds).compile_condition(
+            _condition("regime", "like", "literal", "x")
+        )
+        with pytest.raises(ValueError, match="Unknown operator"):
+            compiled.test(_profile())
+
+    def test_plan_reused_across_profiles(self, thresholds, obligation):
+        rule = _rule(
+            obligation.id,
+            [_condition("ingresos_brutos_cop", "gte", "threshold_ref", "renta_pn_ingresos_tope")],
+        )
+        rule_set = RuleSetEntity(id=uuid.uuid4(), fiscal_year_id=uuid.uuid4(), rules=[rule])
+        engine = RulesEngine(thresholds=thresholds, fiscal_year=2025)
+        plan = engine.compile(rule_set)
+
+        high = engine.evaluate_compiled(_profile(), plan, [obligation])
+        low = engine.evaluate_compiled(
+            _profile(ingresos_brutos_cop=Decimal("1")), plan, [obligation]
+        )
+
+        assert high[0].result == "applies"
+        assert high[0].triggered_rule_id == rule.id
+        assert low[0].result == "does_not_apply"
+        assert low[0].triggered_rule_id is None
+
+    def test_field_dependencies_index_active_rules(self, thresholds, obligation):
+        iva_id = uuid.uuid4()
+        rule_set = RuleSetEntity(
+            id=uuid.uuid4(),
+            fiscal_year_id=uuid.uuid4(),
+            rules=[
+                _rule(obligation.id, [_condition("ingresos_brutos_cop", "gte", "literal", "1")]),
+                _rule(
+                    obligation.id, [_condition("city", "eq", "literal", "Cali")], is_active=False
+                ),
+                _rule(iva_id, [
+                    _condition("ingresos_brutos_cop", "gte", "literal", "1"),
+                    _condition("sector_especial", "is_true"),
+                ]),
+            ],
+        )
+
+        plan = compile_rule_set(rule_set, thresholds)
+
+        assert plan.field_dependencies == {
+            "ingresos_brutos_cop": frozenset({obligation.id, iva_id}),
+            "sector_especial": frozenset({iva_id}),
+        }
+        assert plan.obligations_reading(["sector_especial", "city"]) == {iva_id}
+        assert plan.obligations_reading([]) == set()
+
+
+def test_changed_fields_include_additional_data_keys():
+    before = _profile(additional_data={"sector": "a", "kept": 1})
+    after = TaxProfileEntity(**{
+        **before.__dict__,
+        "city": "Cali",
+        "ingresos_brutos_cop": Decimal("100000000.00"),
+        "additional_data": {"kept": 1, "nuevo": True},
+    })
+
+    assert before.changed_fields(after) == {"city", "additional_data", "sector", "nuevo"}
+    assert before.changed_fields(before) == set()
@@ -0,0 +1,155 @@
+"""Micro-benchmarks: operator calls and allocations per evaluation."""
+
+import tracemalloc
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.domain.engine.engine import RulesEngine
+from app.domain.engine.evaluator import RuleEvaluator
+from app.domain.engine.resolver import ThresholdResolver
+from app.domain.entities.obligation import ObligationTypeEntity
+from app.domain.entities.rule import RuleConditionEntity, RuleEntity, RuleSetEntity
+from app.domain.entities.tax_profile import TaxProfileEntity
+
+THRESHOLDS = {
+    "renta_pn_ingresos_tope": Decimal("69497400"),
+    "renta_pn_patrimonio_tope": Decimal("223384500"),
+}
+
+
+def _condition(field, operator, value_type="literal", value=None):
+    return RuleConditionEntity(
+        id=uuid.uuid4(), rule_id=uuid.uuid4(), field=field,
+        operator=operator, value_type=value_type, value=value,
+    )
+
+
+@pytest.fixture
+def obligation():
+    return ObligationTypeEntity(
+        id=uuid.uuid4(), code="renta", name="Renta", category="nacional",
+        description="Renta", responsible_entity="DIAN", legal_base="Art. 592 ET",
+    )
+
+
+@pytest.fixture
+def rule_set(obligation):
+    """Two rules that fall through and a third one that triggers."""
+    def rule(priority, logic, conditions):
+        return RuleEntity(
+            id=uuid.uuid4(), rule_set_id=uuid.uuid4(), obligation_type_id=obligation.id,
+            code=f"rule_{priority}", name=f"Rule {priority}", logic_operator=logic,
+            priority=priority, conditions=conditions,
+        )
+
+    return RuleSetEntity(
+        id=uuid.uuid4(),
+        fiscal_year_id=uuid.uuid4(),
+        rules=[
+            rule(1, "AND", [
+                _condition("regime", "eq", value="simple"),
+                _condition("has_rut", "is_true"),
+                _condition("ingresos_brutos_cop", "gte", "threshold_ref", "renta_pn_ingresos_tope"),
+            ]),
+            rule(2, "OR", [
+                _condition(
+                    "patrimonio_bruto_cop", "gte", "threshold_ref", "renta_pn_patrimonio_tope"
+                ),
+                _condition("city", "in", value="Cali, Pasto"),
+            ]),
+            rule(3, "OR", [
+                _condition("ingresos_brutos_cop", "gte", "threshold_ref", "renta_pn_ingresos_tope"),
+                _condition("has_employees", "is_true"),
+            ]),
+        ],
+    )
+
+
+def _profile(**overrides):
+    data = dict(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), tenant_id=uuid.uuid4(),
+        fiscal_year_id=uuid.uuid4(), persona_type="natural", regime="ordinario",
+        is_iva_responsable=False, ingresos_brutos_cop=Decimal("100000000"),
+        patrimonio_bruto_cop=Decimal("1000"), city="Bogotá",
+    )
+    data.update(overrides)
+    return TaxProfileEntity(**data)
+
+
+def _legacy_evaluate(profile, rules):
+    """The pre-compilation engine loop: eager dict log, triggered rule evaluated twice."""
+    evaluator = RuleEvaluator(ThresholdResolver(THRESHOLDS))
+    conditions_log = []
+    triggered_rule = None
+    for rule in sorted(rules, key=lambda r: r.priority):
+        evaluation = evaluator.evaluate_rule(rule, profile)
+        for cr in evaluation.condition_results:
+            conditions_log.append({
+                "field": cr.field, "operator": cr.operator, "profile_value": cr.profile_value,
+                "threshold_code": cr.threshold_code, "threshold_value": cr.threshold_value,
+                "passes": cr.passes, "description": cr.description,
+            })
+        if evaluation.passes:
+            triggered_rule = rule
+            break
+    if triggered_rule:
+        evaluator.evaluate_rule(triggered_rule, profile)
+    return conditions_log
+
+
+class TestOperatorCalls:
+    def test_each_condition_checked_once(self, monkeypatch, rule_set, obligation):
+        calls = []
+        original = TaxProfileEntity.get_field_value
+        monkeypatch.setattr(
+            TaxProfileEntity, "get_field_value",
+            lambda self, name: calls.append(name) or original(self, name),
+        )
+        profile = _profile()
+        checked = sum(len(r.conditions) for r in rule_set.rules)
+
+        _legacy_evaluate(profile, rule_set.rules)
+        legacy_calls = len(calls)
+
+        calls.clear()
+        engine = RulesEngine(thresholds=THRESHOLDS, fiscal_year=2025)
+        engine.evaluate_compiled(profile, engine.compile(rule_set), [obligation])
+
+        assert legacy_calls == checked + len(rule_set.rules[2].conditions)
+        assert len(calls) == checked
+
+
+class TestConditionLogAllocations:
+    def test_trace_matches_legacy_log(self, rule_set, obligation):
+        profile = _profile()
+        engine = RulesEngine(thresholds=THRESHOLDS, fiscal_year=2025)
+        result = engine.evaluate_compiled(profile, engine.compile(rule_set), [obligation])[0]
+
+        assert list(result.conditions_evaluated) == _legacy_evaluate(profile, rule_set.rules)
+
+    def test_lazy_trace_allocates_less(self, rule_set, obligation):
+        engine = RulesEngine(thresholds=THRESHOLDS, fiscal_year=2025)
+        plan = engine.compile(rule_set)
+        profiles = [_profile(ingresos_brutos_cop=Decimal(i * 1000)) for i in range(300)]
+
+        def peak(evaluate) -> int:
+            tracemalloc.start()
+            try:
+                kept = [evaluate(p) for p in profiles]
+                assert len(kept) == len(profiles)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        def compiled(profile):
+            return engine.evaluate_compiled(profile, plan, [obligation])
+
+        def legacy(profile):
+            return _legacy_evaluate(profile, rule_set.rules)
+
+        # Warm caches, then compare both paths over the same profiles
+        peak(compiled)
+        peak(legacy)
+        assert peak(compiled) < peak(legacy)
@@ -0,0 +1,299 @@
+"""Parity tests: the vectorized engine must match RulesEngine profile by profile."""
+
+import random
+import uuid
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.domain.engine.engine import RulesEngine  # noqa: E402
+from app.domain.engine.vectorized import ProfileColumns, VectorizedRulesEngine  # noqa: E402
+from app.domain.entities.obligation import ObligationTypeEntity  # noqa: E402
+from app.domain.entities.rule import (  # noqa: E402
+    RuleConditionEntity,
+    RuleEntity,
+    RuleSetEntity,
+)
+from app.domain.entities.tax_profile import TaxProfileEntity  # noqa: E402
+from app.seeds.obligation_types import OBLIGATION_TYPES  # noqa: E402
+from app.seeds.rules_2025 import RULES_2025  # noqa: E402
+from app.seeds.thresholds_2025 import THRESHOLDS_2025, UVT_2025  # noqa: E402
+
+THRESHOLDS = {t["code"]: t["value_cop"] for t in THRESHOLDS_2025}
+THRESHOLDS["uvt_value"] = UVT_2025
+
+
+def _obligations():
+    return [
+        ObligationTypeEntity(
+            id=uuid.uuid4(), **{k: v for k, v in o.items() if k != "display_order"}
+        )
+        for o in OBLIGATION_TYPES
+    ]
+
+
+def _rule_set(obligations, rules_data):
+    by_code = {o.code: o.id for o in obligations}
+    rule_set_id = uuid.uuid4()
+    rules = []
+    for data in rules_data:
+        rule_id = uuid.uuid4()
+        rules.append(
+            RuleEntity(
+                id=rule_id,
+                rule_set_id=rule_set_id,
+                obligation_type_id=by_code[data["obligation_code"]],
+                code=data["code"],
+                name=data["name"],
+                logic_operator=data.get("logic_operator", "AND"),
+                priority=data.get("priority", 0),
+                result_if_true=data.get("result_if_true", "applies"),
+                is_active=data.get("is_active", True),
+                conditions=[
+                    RuleConditionEntity(id=uuid.uuid4(), rule_id=rule_id, **c)
+                    for c in data["conditions"]
+                ],
+            )
+        )
+    return RuleSetEntity(id=rule_set_id, fiscal_year_id=uuid.uuid4(), rules=rules)
+
+
+def _random_amount(rng):
+    return rng.choice([
+        None,
+        Decimal(0),
+        THRESHOLDS["renta_pn_ingresos_tope"],
+        THRESHOLDS["renta_pn_ingresos_tope"] - Decimal("0.01"),
+        THRESHOLDS["iva_responsable_tope"] + Decimal("0.01"),
+        Decimal(rng.randrange(0, 2_000_000_000)),
+        Decimal(rng.randrange(0, 10**12)) / 100,
+        Decimal("69497399.999"),
+    ])
+
+
+def _random_profiles(count, seed=7):
+    rng = random.Random(seed)
+    profiles = []
+    for _ in range(count):
+        profiles.append(
+            TaxProfileEntity(
+                id=uuid.uuid4(),
+                user_id=uuid.uuid4(),
+                tenant_id=uuid.uuid4(),
+                fiscal_year_id=uuid.uuid4(),
+                persona_type=rng.choice(["natural", "natural_comerciante", "juridica"]),
+                regime=rng.choice(["ordinario", "simple", "Ordinario ", "no_responsable"]),
+                is_iva_responsable=rng.random() < 0.3,
+                ingresos_brutos_cop=_random_amount(rng) or Decimal(0),
+                patrimonio_bruto_cop=_random_amount(rng),
+                consignaciones_cop=_random_amount(rng),
+                compras_consumos_cop=_random_amount(rng),
+                has_employees=rng.random() < 0.4,
+                employee_count=rng.choice([0, 1, 5, 30]),
+                city=rng.choice([None, "Bogotá", "Medellín", "Cali", "bogotá"]),
+                has_rut=rng.random() < 0.7,
+                has_comercio_registration=rng.random() < 0.5,
+                additional_data=rng.choice([
+                    {},
+                    {"sector": "Comercio", "score": 0.5},
+                    {"sector": "servicios", "score": "12"},
+                    {"sector": ["x"], "score": True},
+                    {"score": 1},
+                ]),
+            )
+        )
+    return profiles
+
+
+# Exercises every operator, value type, priority fallthrough and the
+# non-numeric/inexact paths of the vectorized engine.
+SYNTHETIC_RULES = [
+    {
+        "obligation_code": "renta",
+        "code": "renta_high",
+        "name": "Renta alta",
+        "logic_operator": "AND",
+        "priority": 1,
+        "result_if_true": "applies",
+        "conditions": [
+            {"field": "ingresos_brutos_cop", "operator": "between", "value_type": "uvt_expr",
+             "value": "1400", "value_secondary": "3500.005"},
+            {"field": "regime", "operator": "neq", "value_type": "literal", "value": "simple"},
+        ],
+    },
+    {
+        "obligation_code": "renta",
+        "code": "renta_fallback",
+        "name": "Renta fallback",
+        "logic_operator": "OR",
+        "priority": 2,
+        "result_if_true": "conditional",
+        "conditions": [
+            {"field": "patrimonio_bruto_cop", "operator": "gt", "value_type": "literal",
+             "value": "100000000.005"},
+            {"field": "consignaciones_cop", "operator": "lte", "value_type": "literal",
+             "value": "0"},
+            {"field": "score", "operator": "gte", "value_type": "literal", "value": "1"},
+        ],
+    },
+    {
+        "obligation_code": "iva",
+        "code": "iva_city",
+        "name": "IVA ciudad",
+        "logic_operator": "AND",
+        "priority": 1,
+        "result_if_true": "needs_more_info",
+        "conditions": [
+            {"field": "city", "operator": "in", "value_type": "literal",
+             "value": '["Bogotá", "Cali"]'},
+            {"field": "has_rut", "operator": "is_false", "value_type": "literal"},
+        ],
+    },
+    {
+        "obligation_code": "iva",
+        "code": "iva_sector",
+        "name": "IVA sector",
+        "logic_operator": "OR",
+        "priority": 2,
+        "result_if_true": "applies",
+        "conditions": [
+            {"field": "sector", "operator": "eq", "value_type": "literal", "value": "comercio"},
+            {"field": "city", "operator": "not_in", "value_type": "literal",
+             "value": "Bogotá, Medellín"},
+            {"field": "employee_count", "operator": "lt", "value_type": "literal", "value": "0.5"},
+        ],
+    },
+    {
+        "obligation_code": "ica",
+        "code": "ica_employees",
+        "name": "ICA empleados",
+        "logic_operator": "AND",
+        "priority": 1,
+        "result_if_true": "applies",
+        "conditions": [
+            {"field": "employee_count", "operator": "eq", "value_type": "literal", "value": "5"},
+            {"field": "has_employees", "operator": "is_true", "value_type": "literal"},
+        ],
+    },
+    {
+        "obligation_code": "ica",
+        "code": "ica_inactive",
+        "name": "ICA inactiva",
+        "priority": 0,
+        "is_active": False,
+        "conditions": [],
+    },
+    {
+        "obligation_code": "retefuente",
+        "code": "retefuente_always",
+        "name": "Sin condiciones",
+        "logic_operator": "AND",
+        "priority": 1,
+        "result_if_true": "conditional",
+        "conditions": [],
+    },
+]
+
+
+def _scalar_results(thresholds, rule_set, obligations, profiles):
+    engine = RulesEngine(thresholds=thresholds, fiscal_year=2025)
+    plan = engine.compile(rule_set)
+    return [engine.evaluate_compiled(p, plan, obligations) for p in profiles]
+
+
+def _vector_results(thresholds, rule_set, obligations, profiles):
+    engine = VectorizedRulesEngine(thresholds=thresholds, fiscal_year=2025)
+    return engine.evaluate_compiled(profiles, engine.compile(rule_set), obligations)
+
+
+class TestVectorizedParity:
+    @pytest.mark.parametrize("rules_data", [RULES_2025, SYNTHETIC_RULES], ids=["seed", "synthetic"])
+    def test_results_identical_to_rules_engine(self, rules_data):
+        obligations = _obligations()
+        rule_set = _rule_set(obligations, rules_data)
+        profiles = _random_profiles(400)
+
+        expected = _scalar_results(THRESHOLDS, rule_set, obligations, profiles)
+        actual = _vector_results(THRESHOLDS, rule_set, obligations, profiles)
+
+        assert actual == expected
+
+    def test_decisions_match_result_values(self):
+        obligations = _obligations()
+        rule_set = _rule_set(obligations, SYNTHETIC_RULES)
+        profiles = _random_profiles(200, seed=11)
+        engine = VectorizedRulesEngine(thresholds=THRESHOLDS, fiscal_year=2025)
+
+        decisions = engine.decide(profiles, engine.compile(rule_set), obligations)
+        expected = _scalar_results(THRESHOLDS, rule_set, obligations, profiles)
+
+        for j, decision in enumerate(decisions):
+            values = [row[j].result for row in expected]
+            assert decision.results().tolist() == values
+            assert sum(decision.counts().values()) == len(profiles)
+
+    def test_empty_profile_list(self):
+        obligations = _obligations()
+        rule_set = _rule_set(obligations, RULES_2025)
+        assert _vector_results(THRESHOLDS, rule_set, obligations, []) == []
+
+    def test_missing_threshold_raises_only_when_reached(self):
+        obligations = _obligations()
+        rules = [
+            {
+                "obligation_code": "renta",
+                "code": "first",
+                "name": "First",
+                "priority": 1,
+                "conditions": [
+                    {"field": "has_rut", "operator": "is_false", "value_type": "literal"}
+                ],
+            },
+            {
+                "obligation_code": "renta",
+                "code": "broken",
+                "name": "Broken",
+                "priority": 2,
+                "conditions": [{"field": "ingresos_brutos_cop", "operator": "gte",
+                                "value_type": "threshold_ref", "value": "missing_tope"}],
+            },
+        ]
+        rule_set = _rule_set(obligations, rules)
+        without_rut = [p for p in _random_profiles(50) if not p.has_rut]
+        with_rut = [p for p in _random_profiles(50) if p.has_rut]
+
+        results = _vector_results(THRESHOLDS, rule_set, obligations, without_rut)
+        assert all(r[0].result == "applies" for r in results)
+
+        with pytest.raises(ValueError, match="Threshold not found: missing_tope"):
+            _vector_results(THRESHOLDS, rule_set, obligations, without_rut + with_rut)
+
+
+class TestProfileColumns:
+    def test_numeric_column_scaled_to_cents(self):
+        profiles = _random_profiles(3)
+        profiles[0].patrimonio_bruto_cop = Decimal("12.34")
+        profiles[1].patrimonio_bruto_cop = None
+        profiles[2].patrimonio_bruto_cop = Decimal("5")
+
+        values, valid = ProfileColumns(profiles).numeric("patrimonio_bruto_cop")
+
+        assert values.tolist() == [1234, 0, 500]
+        assert valid.tolist() == [True, False, True]
+
+    def test_inexact_column_not_numeric(self):
+        profiles = _random_profiles(2)
+        profiles[0].patrimonio_bruto_cop = Decimal("0.001")
+        assert ProfileColumns(profiles).numeric("patrimonio_bruto_cop") is None
+
+    def test_categorical_distinguishes_types(self):
+        profiles = _random_profiles(4)
+        for profile, score in zip(profiles, [1, "1", True, 1]):
+            profile.additional_data = {"score": score}
+
+        codes, uniques = ProfileColumns(profiles).categorical("score")
+
+        assert codes.tolist() == [0, 1, 2, 0]
+        assert uniques == [1, "1", True]
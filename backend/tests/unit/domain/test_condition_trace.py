@@ -0,0 +1,93 @@
+"""Tests for the packed storage form of condition traces."""
+
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.domain.engine.engine import RulesEngine
+from app.domain.entities.obligation import ObligationTypeEntity
+from app.domain.entities.rule import RuleConditionEntity, RuleEntity, RuleSetEntity
+from app.domain.entities.tax_profile import TaxProfileEntity
+from app.domain.value_objects.condition_trace import PackedConditionTrace
+
+THRESHOLDS = {"renta_tope": Decimal("69497400"), "uvt_value": Decimal("49799")}
+
+
+@pytest.fixture
+def setup():
+    obligation = ObligationTypeEntity(
+        id=uuid.uuid4(), code="renta", name="Renta", category="nacional",
+        description="Renta", responsible_entity="DIAN",
+    )
+    rule_id = uuid.uuid4()
+
+    def condition(field, operator, value_type="literal", value=None, description=None):
+        return RuleConditionEntity(
+            id=uuid.uuid4(), rule_id=rule_id, field=field, operator=operator,
+            value_type=value_type, value=value, description=description,
+        )
+
+    conditions = [
+        condition("ingresos_brutos_cop", "gte", "threshold_ref", "renta_tope", "Ingresos"),
+        condition("patrimonio_bruto_cop", "gt", "uvt_expr", "4500"),
+        condition("city", "in", value="Bogotá, Cali"),
+        condition("has_rut", "is_true"),
+        *(condition("employee_count", "gte", value=str(i)) for i in range(9)),
+    ]
+    rule = RuleEntity(
+        id=rule_id, rule_set_id=uuid.uuid4(), obligation_type_id=obligation.id,
+        code="renta", name="Renta", logic_operator="AND", conditions=conditions,
+    )
+    rule_set = RuleSetEntity(id=uuid.uuid4(), fiscal_year_id=uuid.uuid4(), rules=[rule])
+    return obligation, rule_set, {c.id: c for c in conditions}
+
+
+def _trace(obligation, rule_set, **profile):
+    engine = RulesEngine(thresholds=THRESHOLDS, fiscal_year=2025)
+    profile = TaxProfileEntity(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), tenant_id=uuid.uuid4(),
+        fiscal_year_id=uuid.uuid4(), persona_type="natural", regime="ordinario",
+        is_iva_responsable=False, **profile,
+    )
+    return engine.evaluate_compiled(profile, engine.compile(rule_set), [obligation])[0]
+
+
+class TestPackedConditionTrace:
+    def test_round_trip_expands_to_the_trace_dicts(self, setup):
+        obligation, rule_set, conditions = setup
+        result = _trace(
+            obligation, rule_set, ingresos_brutos_cop=Decimal("80000000.50"),
+            patrimonio_bruto_cop=None, city="Cali", has_rut=True, employee_count=4,
+        )
+
+        packed = PackedConditionTrace.from_bytes(result.conditions_evaluated.pack())
+
+        assert packed.expand(conditions) == list(result.conditions_evaluated)
+        assert packed.passes.count(False) > 0
+
+    def test_missing_conditions_are_left_out(self, setup):
+        obligation, rule_set, conditions = setup
+        result = _trace(obligation, rule_set, ingresos_brutos_cop=Decimal("1"), city="Cali")
+        packed = PackedConditionTrace.from_bytes(result.conditions_evaluated.pack())
+        removed = packed.condition_ids[0]
+
+        expanded = packed.expand({k: v for k, v in conditions.items() if k != removed})
+
+        assert expanded == list(result.conditions_evaluated)[1:]
+
+    def test_packed_form_is_smaller(self, setup):
+        obligation, rule_set, _ = setup
+        result = _trace(obligation, rule_set, ingresos_brutos_cop=Decimal("1"))
+
+        expanded = json.dumps(list(result.conditions_evaluated)).encode()
+        assert len(result.conditions_evaluated.pack()) * 2 < len(expanded)
+
+    def test_unknown_format_rejected(self, setup):
+        obligation, rule_set, _ = setup
+        result = _trace(obligation, rule_set, ingresos_brutos_cop=Decimal("1"))
+        data = bytearray(result.conditions_evaluated.pack())
+        data[0] = 99
+        with pytest.raises(ValueError, match="Unsupported condition trace format"):
+            PackedConditionTrace.from_bytes(bytes(data))
@@ -0,0 +1,58 @@
+"""Tests for the deadline table built from NIT schedules."""
+
+import uuid
+from datetime import date
+
+from app.domain.calendar.deadlines import DeadlineSchedule, DeadlineTable
+
+RENTA = uuid.uuid4()
+ICA = uuid.uuid4()
+IVA = uuid.uuid4()
+
+SCHEDULES = [
+    DeadlineSchedule(RENTA, "renta", "anual", {"periods": [
+        {"label": "AG 2025", "due": {"1": "2026-08-12", "2": "2026-08-13", "0": "2026-08-25"}},
+    ]}),
+    DeadlineSchedule(ICA, "ica", "bimestral", {"periods": [
+        {"label": "Mar-Abr", "due": {"default": "2025-05-19"}},
+        {"label": "Ene-Feb", "due": {"default": "2025-03-19"}},
+    ]}),
+    DeadlineSchedule(IVA, "iva", "bimestral"),
+]
+
+
+def test_due_date_follows_nit_last_digit():
+    table = DeadlineTable.build(uuid.uuid4(), SCHEDULES)
+
+    [deadline] = table.for_obligation(RENTA, 2)
+    assert (deadline.period, deadline.due_date, deadline.frequency) == (
+        "AG 2025", date(2026, 8, 13), "anual"
+    )
+    assert table.for_obligation(RENTA, 0)[0].due_date == date(2026, 8, 25)
+    # Digits without a date and no default have no deadline
+    assert table.for_obligation(RENTA, 5) == []
+
+
+def test_unknown_nit_gets_earliest_date():
+    table = DeadlineTable.build(uuid.uuid4(), SCHEDULES)
+    assert table.for_obligation(RENTA, None)[0].due_date == date(2026, 8, 12)
+
+
+def test_default_dates_are_sorted_per_obligation():
+    table = DeadlineTable.build(uuid.uuid4(), SCHEDULES)
+    assert [d.period for d in table.for_obligation(ICA, 4)] == ["Ene-Feb", "Mar-Abr"]
+
+
+def test_obligation_without_schedule_has_no_deadlines():
+    table = DeadlineTable.build(uuid.uuid4(), SCHEDULES)
+    assert table.for_obligation(IVA, 1) == []
+    assert table.for_obligation(uuid.uuid4(), 1) == []
+
+
+def test_deadlines_of_a_digit_span_all_obligations_by_date():
+    table = DeadlineTable.build(uuid.uuid4(), SCHEDULES)
+    assert [(d.obligation_code, d.period) for d in table.for_nit_digit(1)] == [
+        ("ica", "Ene-Feb"), ("ica", "Mar-Abr"), ("renta", "AG 2025"),
+    ]
+    # Renta has no date for digit 5
+    assert [d.obligation_code for d in table.for_nit_digit(5)] == ["ica", "ica"]
@@ -0,0 +1,54 @@
+"""Tests for the in-process LRU/TTL cache."""
+
+from app.infrastructure.cache.memory_cache import MemoryCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMemoryCache:
+    def test_get_returns_stored_value(self):
+        cache = MemoryCache(max_entries=4, ttl_seconds=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = MemoryCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = MemoryCache(max_entries=4, ttl_seconds=10, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 9.9
+        assert cache.get("a") == 1
+        clock.now = 10.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_delete_where(self):
+        cache = MemoryCache(max_entries=4, ttl_seconds=60)
+        cache.set(("fy1", 1), "x")
+        cache.set(("fy1", 2), "y")
+        cache.set(("fy2", 1), "z")
+
+        removed = cache.delete_where(lambda key, value: key[0] == "fy1")
+
+        assert removed == 2
+        assert cache.get(("fy2", 1)) == "z"
+        assert len(cache) == 1
@@ -0,0 +1,71 @@
+"""Tests for RedisCache bulk operations and namespace generations."""
+
+from decimal import Decimal
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.infrastructure.cache.redis_cache import RedisCache  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def cache(client):
+    return RedisCache(client=client)
+
+
+class TestBulkOperations:
+    async def test_get_many_preserves_order_and_misses(self, cache):
+        await cache.set_many({"a": 1, "b": {"x": Decimal("1.5")}})
+
+        assert await cache.get_many(["b", "missing", "a"]) == [{"x": "1.5"}, None, 1]
+        assert await cache.get_many([]) == []
+
+    async def test_set_many_applies_ttl(self, cache, client):
+        await cache.set_many({"a": 1}, ttl_seconds=30)
+        assert 0 < await client.ttl("a") <= 30
+
+    async def test_delete_pattern_unlinks_in_chunks(self, cache, client, monkeypatch):
+        monkeypatch.setattr(RedisCache, "DELETE_CHUNK_SIZE", 7)
+        await cache.set_many({f"tenant:1:{i}": i for i in range(30)})
+        await cache.set("tenant:2:0", 0)
+
+        calls = []
+        unlink = client.unlink
+
+        async def counting_unlink(*keys):
+            calls.append(len(keys))
+            return await unlink(*keys)
+
+        monkeypatch.setattr(client, "unlink", counting_unlink)
+
+        assert await cache.delete_pattern("tenant:1:*") == 30
+        assert max(calls) <= 7 and len(calls) < 30
+        assert await client.exists("tenant:2:0") == 1
+
+    async def test_disconnected_cache_is_a_no_op(self):
+        cache = RedisCache()
+        await cache.set_many({"a": 1})
+        assert await cache.get_many(["a"]) == [None]
+        assert await cache.delete_pattern("*") == 0
+        assert await cache.invalidate_namespace("ns") is None
+
+
+class TestNamespaceGenerations:
+    async def test_invalidate_namespace_hides_old_keys(self, cache):
+        key = await cache.namespaced_key("tenant:1", "evaluations")
+        await cache.set(key, [1, 2])
+        other = await cache.namespaced_key("tenant:2", "evaluations")
+        await cache.set(other, [3])
+
+        assert await cache.invalidate_namespace("tenant:1") == 1
+
+        new_key = await cache.namespaced_key("tenant:1", "evaluations")
+        assert new_key != key
+        assert await cache.get(new_key) is None
+        assert await cache.get(await cache.namespaced_key("tenant:2", "evaluations")) == [3]
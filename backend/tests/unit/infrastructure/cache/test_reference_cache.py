@@ -0,0 +1,178 @@
+"""Tests for the shared reference-data cache."""
+
+import asyncio
+import uuid
+from decimal import Decimal
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.application.evaluation_context import EvaluationContext  # noqa: E402
+from app.domain.entities.fiscal_year import FiscalYearEntity  # noqa: E402
+from app.domain.entities.obligation import ObligationTypeEntity  # noqa: E402
+from app.domain.entities.rule import (  # noqa: E402
+    RuleConditionEntity,
+    RuleEntity,
+    RuleSetEntity,
+)
+from app.infrastructure.cache.memory_cache import context_cache  # noqa: E402
+from app.infrastructure.cache.redis_cache import RedisCache  # noqa: E402
+from app.infrastructure.cache.reference_cache import ReferenceDataCache  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    return RedisCache(client=fakeredis.aioredis.FakeRedis(decode_responses=True))
+
+
+@pytest.fixture
+def reference(backend):
+    return ReferenceDataCache(backend, ttl_seconds=60, channel="refdata:test")
+
+
+def _context():
+    obligation = ObligationTypeEntity(
+        id=uuid.uuid4(), code="renta", name="Renta", category="nacional",
+        description="Renta", responsible_entity="DIAN",
+    )
+    rule_id = uuid.uuid4()
+    rule_set = RuleSetEntity(
+        id=uuid.uuid4(),
+        fiscal_year_id=uuid.uuid4(),
+        version=3,
+        status="active",
+        rules=[
+            RuleEntity(
+                id=rule_id, rule_set_id=uuid.uuid4(), obligation_type_id=obligation.id,
+                code="renta_ingresos", name="Ingresos", logic_operator="OR", priority=1,
+                conditions=[
+                    RuleConditionEntity(
+                        id=uuid.uuid4(), rule_id=rule_id, field="ingresos_brutos_cop",
+                        operator="gte", value_type="threshold_ref", value="renta_tope",
+                    ),
+                ],
+            ),
+        ],
+    )
+    return EvaluationContext.build(
+        fiscal_year=FiscalYearEntity(
+            id=rule_set.fiscal_year_id, year=2025, status="active", uvt_value=Decimal("49799.00"),
+        ),
+        rule_set=rule_set,
+        thresholds={"renta_tope": Decimal("69497400.50")},
+        obligations=[obligation],
+        periodicities={obligation.id: "annual"},
+    )
+
+
+class TestEvaluationContextReference:
+    def test_round_trip(self):
+        context = _context()
+        restored = EvaluationContext.from_reference(context.to_reference())
+
+        assert restored.fiscal_year == context.fiscal_year
+        assert restored.rule_set == context.rule_set
+        assert restored.thresholds == context.thresholds
+        assert restored.obligations == context.obligations
+        assert restored.periodicities == context.periodicities
+        assert restored.reference_version == context.reference_version
+
+
+class TestReferenceDataCache:
+    async def test_invalidate_moves_to_new_version(self, reference):
+        fy = uuid.uuid4()
+        version = await reference.version(fy)
+        await reference.set(fy, version, {"a": 1})
+        assert await reference.get(fy, version) == {"a": 1}
+
+        await reference.invalidate(fy)
+
+        new_version = await reference.version(fy)
+        assert new_version == version + 1
+        assert await reference.get(fy, new_version) is None
+
+    async def test_pending_invalidation_bypasses_shared_entry(self, reference):
+        fy = uuid.uuid4()
+        await reference.set(fy, 0, {"a": 1})
+        reference.mark_pending(fy)
+
+        assert await reference.get(fy, 0) is None
+        await reference.invalidate(fy)
+        assert await reference.get(fy, 0) == {"a": 1}
+
+    async def test_without_redis_everything_misses(self):
+        reference = ReferenceDataCache(RedisCache(), ttl_seconds=60, channel="refdata:test")
+        fy = uuid.uuid4()
+        await reference.set(fy, 0, {"a": 1})
+        await reference.invalidate(fy)
+
+        assert await reference.version(fy) == 0
+        assert await reference.get(fy, 0) is None
+        await reference.listen()
+
+    async def test_published_invalidation_drops_local_context(self, reference):
+        fy = uuid.uuid4()
+        context_cache.set(fy, "context")
+        listener = asyncio.create_task(reference.listen())
+        try:
+            await asyncio.sleep(0.05)
+            await reference.invalidate(fy)
+            for _ in range(50):
+                if context_cache.get(fy) is None:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            listener.cancel()
+
+        assert context_cache.get(fy) is None
+
+    async def test_drop_during_load_is_not_cached_locally(self):
+        from app.application.evaluation_service import EvaluationService
+        from app.infrastructure.cache.reference_cache import reference_cache
+
+        context = _context()
+        fy = context.fiscal_year.id
+
+        class RacingLoader:
+            async def load(self, fiscal_year_id):
+                # The invalidation of a concurrent commit lands mid-load
+                reference_cache.drop_local(fiscal_year_id)
+                return context
+
+        service = EvaluationService(
+            db=None, profile_repo=None, evaluation_repo=None, context_loader=RacingLoader()
+        )
+        assert await service._load_context(fy) is context
+        assert context_cache.get(fy) is None
+
+    async def test_listener_survives_errors_and_closed_connections(self):
+        fy = uuid.uuid4()
+        calls = []
+        listening = asyncio.Event()
+
+        class FlakyBackend:
+            connected = True
+
+            async def subscribe(self, channel, handler):
+                calls.append(channel)
+                if len(calls) == 1:
+                    raise RuntimeError("handler blew up")
+                if len(calls) == 2:
+                    return  # connection closed cleanly
+                listening.set()
+                await asyncio.Event().wait()
+
+        reference = ReferenceDataCache(FlakyBackend(), ttl_seconds=60, channel="refdata:test")
+        context_cache.set(fy, "context")
+        generation = reference.local_generation(fy)
+
+        listener = asyncio.create_task(reference.listen(retry_seconds=0))
+        await asyncio.wait_for(listening.wait(), timeout=1)
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+
+        assert calls == ["refdata:test"] * 3
+        assert context_cache.get(fy) is None
+        assert reference.local_generation(fy) != generation